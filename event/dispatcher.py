@@ -16,9 +16,12 @@
 # along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
 
 import os
+import select
 import logging
 import pygame
-from pygame.time import Clock
+
+from queue import Queue, Empty
+from threading import Thread
 from util.config import BUTTON_TYPE, USAGE, USE_LIRC, USE_ROTARY_ENCODERS, SCREEN_INFO, \
     FRAME_RATE, SHOW_MOUSE_EVENTS, FLIP_TOUCH_XY, WIDTH, HEIGHT, MULTI_TOUCH, GPIO, ROTARY_VOLUME_UP, ROTARY_VOLUME_DOWN, ROTARY_VOLUME_MUTE, \
     ROTARY_NAVIGATION_LEFT, ROTARY_NAVIGATION_RIGHT, ROTARY_NAVIGATION_SELECT, ROTARY_JITTER_FILTER, USE_BUTTONS, \
@@ -70,6 +73,9 @@ class EventDispatcher(object):
     This class runs two separate event loops:
     - Main event loop which handles mouse, keyboard and user events
     - LIRC event loop which handles LIRC events
+
+    The main loop is driven by the scheduler. It's blocked while the screen is static
+    and runs with the animation frame rate only while something is animated.
     """
 
     def __init__(self, screensaver_dispatcher, util, volume_control):
@@ -82,6 +88,8 @@ class EventDispatcher(object):
         self.screensaver_dispatcher = screensaver_dispatcher
         self.config = util.config
         self.volume_control = volume_control
+        self.compositor = util.compositor
+        self.scheduler = util.scheduler
         self.frame_rate = self.config[SCREEN_INFO][FRAME_RATE]
         self.screen_width = self.config[SCREEN_INFO][WIDTH]
         self.screen_height = self.config[SCREEN_INFO][HEIGHT]
@@ -91,12 +99,13 @@ class EventDispatcher(object):
         self.screensaver_dispatcher.frame_rate = self.frame_rate
         self.lirc = None
         self.lirc_thread = None
+        self.lirc_codes = Queue()
+        self.run_dispatcher = True
         self.init_lirc()
         self.init_buttons()
         self.init_rotary_encoders()
         self.volume_initialized = False
         self.screensaver_was_running = False
-        self.run_dispatcher = True
         self.mouse_events = [pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION]
         self.user_events = [USER_EVENT_TYPE, VOICE_EVENT_TYPE, REST_EVENT_TYPE]
         self.multi_touch_screen = None
@@ -127,10 +136,49 @@ class EventDispatcher(object):
         try:
             import pylirc
             self.lirc = pylirc
-            self.lirc.init("radio")
+            fd = self.lirc.init("radio")
             self.lirc.blocking(0)
         except ImportError:
             logging.error("PYLIRC library not found")
+            return
+
+        if fd:
+            self.lirc_thread = Thread(target=self.read_lirc, args=[fd], daemon=True)
+            self.lirc_thread.start()
+
+    def read_lirc(self, fd):
+        """ LIRC event loop. Waits for the data on LIRC socket and puts received codes 
+        into the queue handled by the main loop.
+
+        :param fd: LIRC socket file descriptor
+        """
+        while self.run_dispatcher:
+            try:
+                select.select([fd], [], [])
+                code = self.lirc.nextcode()
+            except Exception as e:
+                logging.debug(e)
+                break
+
+            if code != None:
+                self.lirc_codes.put(code)
+                self.scheduler.wakeup(True)
+
+    def handle_lirc_codes(self):
+        """ Handle IR codes received by LIRC thread or poll LIRC if the thread is not running """
+
+        if self.lirc_thread == None:
+            code = self.lirc.nextcode()
+            if code != None:
+                self.handle_lirc_event(code)
+            return
+
+        while True:
+            try:
+                code = self.lirc_codes.get_nowait()
+            except Empty:
+                break
+            self.handle_lirc_event(code)
 
     def init_rotary_encoders(self):
         """ Rotary encoders (RE) initializer.  
@@ -293,6 +341,11 @@ class EventDispatcher(object):
         :return: True - event was handled, False - event was not handled
         """
         mouse_pressed = pygame.mouse.get_pressed()
+        if mouse_pressed and mouse_pressed[0] == True:
+            self.scheduler.start_animation(self)
+        else:
+            self.scheduler.stop_animation(self)
+
         if (events == None or len(events) == 0) and mouse_pressed and mouse_pressed[0] == True:
             self.pressed_mouse_button += 1
             if self.pressed_mouse_button > 5:
@@ -323,14 +376,16 @@ class EventDispatcher(object):
 
         return False
 
-    def handle_single_touch(self):
-        """ Handle single touch events """
+    def handle_single_touch(self, events):
+        """ Handle single touch events 
         
-        events = pygame.event.get()
-
+        :param events: events received by the main loop
+        """
         if self.current_screen and hasattr(self.current_screen, "name") and self.current_screen.name in HOLD_BUTTON_SCREENS:
             if self.hold_button(events):
                 return
+        else:
+            self.scheduler.stop_animation(self)
 
         for event in events:
             source = getattr(event, "source", None)
@@ -368,23 +423,15 @@ class EventDispatcher(object):
         event.button = 1
         return event
 
-    def handle_multi_touch(self):
-        """ Handle multi-touch events """
-
-        for touch in self.multi_touch_screen.poll():
-            if self.mts_state[touch.slot] != touch.valid:
-                if touch.valid: # pressed
-                    self.handle_event(self.get_event(pygame.MOUSEBUTTONDOWN, touch.x, touch.y))
-                    self.move_enabled = True
-                else: # released
-                    self.handle_event(self.get_event(pygame.MOUSEBUTTONUP, touch.x, touch.y))
-                    self.move_enabled = False
-                self.mts_state[touch.slot] = touch.valid
-            else:
-                if self.move_enabled and touch.valid: # move
-                    self.handle_event(self.get_event(pygame.MOUSEMOTION, touch.x, touch.y))
+    def handle_multi_touch(self, events):
+        """ Handle multi-touch events 
+        
+        :param events: events received by the main loop
+        """
+        for event in self.get_touch_events(self.multi_touch_screen.get_frames()):
+            self.handle_event(event)
 
-        for event in pygame.event.get():
+        for event in events:
             s = str(event)
             source = getattr(event, "source", None)
 
@@ -403,6 +450,37 @@ class EventDispatcher(object):
                 self.poweroff_flag = 0
                 self.handle_event(event)
 
+    def get_touch_events(self, frames):
+        """ Convert touch frames received since the previous loop iteration into mouse events.
+        Motion between press and release events is merged, only the last position is used.
+
+        :param frames: list of touch frames
+        :return: list of mouse events
+        """
+        events = []
+        motion = None
+
+        for frame in frames:
+            for touch in frame.touches:
+                if self.mts_state[touch.slot] != touch.valid:
+                    if motion != None:
+                        events.append(motion)
+                        motion = None
+                    if touch.valid: # pressed
+                        events.append(self.get_event(pygame.MOUSEBUTTONDOWN, touch.x, touch.y))
+                        self.move_enabled = True
+                    else: # released
+                        events.append(self.get_event(pygame.MOUSEBUTTONUP, touch.x, touch.y))
+                        self.move_enabled = False
+                    self.mts_state[touch.slot] = touch.valid
+                elif self.move_enabled and touch.valid: # move
+                    motion = self.get_event(pygame.MOUSEMOTION, touch.x, touch.y)
+
+        if motion != None:
+            events.append(motion)
+
+        return events
+
     def handle_poweroff(self, event):
         """ Handle poweroff hardware button
 
@@ -444,6 +522,11 @@ class EventDispatcher(object):
             elif k == kbd_keys[KEY_PAGE_UP] or k == kbd_keys[KEY_PAGE_DOWN]:
                 self.volume_control.previous_next(event)
 
+    def wakeup(self):
+        """ Wake up the main loop when the touch frame was received """
+
+        self.scheduler.wakeup(True)
+
     def get_handler(self):
         """ Get either single or multi touch handler
 
@@ -454,6 +537,8 @@ class EventDispatcher(object):
             try:
                 from event.ft5406peppy import Touchscreen
                 self.multi_touch_screen = Touchscreen()
+                self.multi_touch_screen.on_frame = self.wakeup
+                self.multi_touch_screen.run()
                 handler = self.handle_multi_touch
             except Exception as e:
                 logging.debug("%s", str(e))
@@ -482,14 +567,14 @@ class EventDispatcher(object):
         self.shutdown = shutdown
         handler = self.get_handler()
         pygame.event.clear()
-        clock = Clock()
 
         while self.run_dispatcher:
-            handler()
+            events = self.scheduler.wait()
+            self.scheduler.run_tasks()
+            handler(events)
             if self.lirc != None:
-                code = self.lirc.nextcode()
-                if code != None:
-                    self.handle_lirc_event(code)
-            self.current_screen.refresh()
+                self.handle_lirc_codes()
+            if self.scheduler.is_frame():
+                self.current_screen.refresh()
             self.screensaver_dispatcher.refresh()
-            clock.tick(self.frame_rate)
+            self.compositor.flush()
@@ -0,0 +1,177 @@
+# Copyright 2026 Peppy Player peppy.player@gmail.com
+#
+# This file is part of Peppy Player.
+#
+# Peppy Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Peppy Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import sys
+import time
+import struct
+import tempfile
+import threading
+
+from event.ft5406peppy import Touchscreen, EV_SYN, EV_ABS, ABS_MT_SLOT, ABS_MT_TRACKING_ID, \
+    ABS_MT_POSITION_X, ABS_MT_POSITION_Y
+
+REPORT_RATE = 60
+STROKE_FRAMES = 30
+IDLE_TIME = 2
+
+class TouchBenchmark(object):
+    """ Compares the polling FT5406 reader with the blocking one. The touch device is emulated by FIFO.
+    The writer sends the strokes (press, moves, release) with the rate of the real touch controller.
+    For each reader the benchmark measures the latency between the event timestamp and the moment
+    when the touch was delivered, and CPU time used while the screen is not touched and during the strokes.
+
+    Usage: python3 -m event.ft5406benchmark [number of strokes]
+    """
+
+    def __init__(self, strokes=10):
+        """ Initializer
+
+        :param strokes: the number of strokes
+        """
+        self.strokes = strokes
+        self.latencies = []
+        self.tracking_id = 0
+
+    def run(self):
+        """ Run benchmark for both readers and print results """
+
+        for name, method in [("polling", self.run_polling_reader), ("blocking", self.run_blocking_reader)]:
+            result = self.measure(method)
+            print(f"""{name} reader:""")
+            for k, v in result.items():
+                print(f"""    {k}: {v}""")
+
+    def measure(self, method):
+        """ Measure one reader
+
+        :param method: method which starts the reader and returns function which stops it
+
+        :return: dictionary with results
+        """
+        folder = tempfile.mkdtemp()
+        path = os.path.join(folder, "touch")
+        os.mkfifo(path)
+        writer = os.open(path, os.O_RDWR)
+        self.latencies = []
+
+        try:
+            ts = Touchscreen(path=path)
+            stop = method(ts)
+
+            start = time.process_time()
+            time.sleep(IDLE_TIME)
+            idle_cpu = (time.process_time() - start) / IDLE_TIME
+
+            start = time.process_time()
+            start_time = time.time()
+            for _ in range(self.strokes):
+                self.write_stroke(writer)
+            time.sleep(0.1)
+            stroke_cpu = (time.process_time() - start) / (time.time() - start_time)
+
+            stop()
+            ts.close()
+        finally:
+            os.close(writer)
+            os.remove(path)
+            os.rmdir(folder)
+
+        latencies = sorted(self.latencies) or [0]
+        return {
+            "frames": len(self.latencies),
+            "average latency, ms": round(sum(latencies) / len(latencies) * 1000, 3),
+            "95th percentile latency, ms": round(latencies[int(len(latencies) * 0.95)] * 1000, 3),
+            "max latency, ms": round(latencies[-1] * 1000, 3),
+            "idle CPU, %": round(idle_cpu * 100, 1),
+            "touch CPU, %": round(stroke_cpu * 100, 1)
+        }
+
+    def run_polling_reader(self, ts):
+        """ Start the polling reader, the same way as the old main loop thread
+
+        :param ts: touchscreen
+
+        :return: stop function
+        """
+        running = [True]
+
+        def loop():
+            while running[0]:
+                touches = ts.poll()
+                if touches:
+                    self.latencies.append(time.time() - self.event_time)
+
+        thread = threading.Thread(target=loop, daemon=True)
+        thread.start()
+
+        def stop():
+            running[0] = False
+            thread.join()
+
+        return stop
+
+    def run_blocking_reader(self, ts):
+        """ Start the blocking reader
+
+        :param ts: touchscreen
+
+        :return: stop function
+        """
+        def on_frame():
+            for frame in ts.get_frames():
+                self.latencies.append(time.time() - frame.timestamp)
+
+        ts.on_frame = on_frame
+        ts.run()
+        return ts.stop
+
+    def write_stroke(self, writer):
+        """ Write one stroke: press, moves and release
+
+        :param writer: FIFO file descriptor
+        """
+        self.tracking_id += 1
+        for i in range(STROKE_FRAMES):
+            events = [(EV_ABS, ABS_MT_SLOT, 0)]
+            if i == 0:
+                events.append((EV_ABS, ABS_MT_TRACKING_ID, self.tracking_id))
+            if i == STROKE_FRAMES - 1:
+                events.append((EV_ABS, ABS_MT_TRACKING_ID, -1))
+            else:
+                events.append((EV_ABS, ABS_MT_POSITION_X, 100 + i))
+                events.append((EV_ABS, ABS_MT_POSITION_Y, 100 + i))
+            events.append((EV_SYN, 0, 0))
+            self.write_events(writer, events)
+            time.sleep(1 / REPORT_RATE)
+
+    def write_events(self, writer, events):
+        """ Write events in the evdev format
+
+        :param writer: FIFO file descriptor
+        :param events: list of tuples (type, code, value)
+        """
+        now = time.time()
+        self.event_time = now
+        sec = int(now)
+        usec = int((now - sec) * 1000000)
+        data = b"".join(struct.pack(Touchscreen.EVENT_FORMAT, sec, usec, t, c, v) for t, c, v in events)
+        os.write(writer, data)
+
+if __name__ == "__main__":
+    strokes = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    TouchBenchmark(strokes).run()
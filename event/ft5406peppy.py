@@ -35,11 +35,17 @@ import threading
 import time
 import select
 import queue
+from collections import deque
 
 TOUCH_X = 0
 TOUCH_Y = 1
 
 TouchEvent = namedtuple('TouchEvent', ('timestamp', 'type', 'code', 'value'))
+TouchPoint = namedtuple('TouchPoint', ('slot', 'valid', 'x', 'y'))
+TouchFrame = namedtuple('TouchFrame', ('timestamp', 'touches'))
+
+MAX_FRAMES = 256
+READ_EVENTS = 64
 
 EV_SYN = 0
 EV_ABS = 3
@@ -143,29 +149,82 @@ class Touchscreen(object):
     EVENT_FORMAT = str('llHHi')
     EVENT_SIZE = struct.calcsize(EVENT_FORMAT)
 
-    def __init__(self, device=None):
+    def __init__(self, device=None, path=None):
         self._device = self.TOUCHSCREEN_EVDEV_NAME if device is None else device
         self._running = False
         self._thread = None
         self._f_poll = select.poll()
-        self._f_device = io.open(self._touch_device(), 'rb', self.EVENT_SIZE)
+        self._f_device = io.open(self._touch_device() if path is None else path, 'rb', self.EVENT_SIZE)
         self._f_poll.register(self._f_device, select.POLLIN)
+        self._stop_read, self._stop_write = os.pipe()
         self.position = Touch(0, 0, 0)
         self.touches = Touches([Touch(x, 0, 0) for x in range(10)])
         self._event_queue = queue.Queue()
         self._touch_slot = 0
+        self.frames = deque(maxlen=MAX_FRAMES)
+        self.on_frame = None
 
     def _run(self):
+        """Read touch events in the background thread.
+
+        The thread is blocked in poll() until the device has data, so it doesn't use CPU
+        while the screen is not touched. The touches changed by one SYN_REPORT are put
+        into the frame queue as one frame and on_frame callback is called.
+        """
         self._running = True
+        fd = self._f_device.fileno()
+        size = self.EVENT_SIZE
+        data = b''
+        f_poll = select.poll()
+        f_poll.register(fd, select.POLLIN)
+        f_poll.register(self._stop_read, select.POLLIN)
+
         while self._running:
-            self.poll()
-            #time.sleep(0.0001)
+            ready = [f for f, _ in f_poll.poll()]
+            if self._stop_read in ready:
+                os.read(self._stop_read, 1)
+                break
+
+            chunk = os.read(fd, size * READ_EVENTS)
+            if not chunk:
+                break
+
+            data += chunk
+            n = len(data) - len(data) % size
+            for offset in range(0, n, size):
+                (tv_sec, tv_usec, type, code, value) = struct.unpack_from(self.EVENT_FORMAT, data, offset)
+                if self._process_event(TouchEvent(tv_sec + (tv_usec / 1000000), type, code, value)):
+                    self._add_frame(tv_sec + (tv_usec / 1000000))
+            data = data[n:]
+
+        self._running = False
+
+    def _add_frame(self, timestamp):
+        touches = tuple(TouchPoint(t.slot, t.valid, t.x, t.y) for t in self.touches if t.events)
+        for touch in self.touches:
+            touch.handle_events()
+
+        if not touches:
+            return
+
+        self.frames.append(TouchFrame(timestamp, touches))
+        if callable(self.on_frame):
+            self.on_frame()
+
+    def get_frames(self):
+        """Get all frames received since the previous call"""
+        frames = []
+        while True:
+            try:
+                frames.append(self.frames.popleft())
+            except IndexError:
+                return frames
 
     def run(self):
         if self._thread is not None:
             return
 
-        self._thread = threading.Thread(target=self._run)
+        self._thread = threading.Thread(target=self._run, daemon=True)
         self._thread.start()
 
     def stop(self):
@@ -173,6 +232,7 @@ class Touchscreen(object):
             return
  
         self._running = False
+        os.write(self._stop_write, b'x')
         self._thread.join()
         self._thread = None
 
@@ -182,6 +242,8 @@ class Touchscreen(object):
 
     def close(self):
         self._f_device.close()
+        os.close(self._stop_read)
+        os.close(self._stop_write)
 
     def __enter__(self):
         return self
@@ -214,32 +276,39 @@ class Touchscreen(object):
             event = self._event_queue.get()
             self._event_queue.task_done()
 
-            if event.type == EV_SYN: # Sync
+            if self._process_event(event):
                 for touch in self.touches:
                     touch.handle_events()
                 return self.touches
-                
-            if event.type == EV_ABS: # Absolute cursor position
-                if event.code == ABS_MT_SLOT:
-                    self._touch_slot = event.value
-            
-                if event.code == ABS_MT_TRACKING_ID: 
-                    self._current_touch.id = event.value
-            
-                if event.code == ABS_MT_POSITION_X:
-                    self._current_touch.x = event.value
-            
-                if event.code == ABS_MT_POSITION_Y:
-                    self._current_touch.y = event.value
-            
-                if event.code == ABS_X:
-                    self.position.x = event.value
-            
-                if event.code == ABS_Y:
-                    self.position.y = event.value
 
         return []
 
+    def _process_event(self, event):
+        """Update touches, return True if the event is the end of the frame"""
+        if event.type == EV_SYN: # Sync
+            return True
+            
+        if event.type == EV_ABS: # Absolute cursor position
+            if event.code == ABS_MT_SLOT:
+                self._touch_slot = event.value
+        
+            if event.code == ABS_MT_TRACKING_ID: 
+                self._current_touch.id = event.value
+        
+            if event.code == ABS_MT_POSITION_X:
+                self._current_touch.x = event.value
+        
+            if event.code == ABS_MT_POSITION_Y:
+                self._current_touch.y = event.value
+        
+            if event.code == ABS_X:
+                self.position.x = event.value
+        
+            if event.code == ABS_Y:
+                self.position.y = event.value
+
+        return False
+
     def _touch_device(self):
         for evdev in glob.glob("/sys/class/input/event*"):
             try:
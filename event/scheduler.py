@@ -0,0 +1,273 @@
+# Copyright 2026 Peppy Player peppy.player@gmail.com
+#
+# This file is part of Peppy Player.
+#
+# Peppy Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Peppy Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
+
+import math
+import time
+import logging
+import pygame
+
+from threading import RLock, get_ident
+from weakref import WeakKeyDictionary
+from collections import deque
+from pygame.time import Clock
+from util.keys import WAKEUP_EVENT_TYPE
+
+IDLE_TIMEOUT = 1.0
+
+WAKEUP_INPUT = "input"
+WAKEUP_THREAD = "thread"
+WAKEUP_FRAME = "frame"
+WAKEUP_TIMER = "timer"
+WAKEUP_IDLE = "idle"
+
+class Scheduler(object):
+    """ Main loop scheduler. When nothing is animated the loop is blocked until an input event,
+    a timer deadline or a wakeup from another thread. The frames are ticked only while some
+    component has registered an active animation, with the highest rate requested by the animations.
+    In non-adaptive mode the loop runs with the constant frame rate.
+    Other threads can post functions which should be called by the loop thread e.g. UI updates.
+    """
+
+    lock = RLock()
+
+    def __init__(self, frame_rate, adaptive=True):
+        """ Initializer
+
+        :param frame_rate: the maximum frame rate
+        :param adaptive: True - adaptive frame rate, False - constant frame rate
+        """
+        self.frame_rate = frame_rate
+        self.adaptive = adaptive
+        self.animations = WeakKeyDictionary()
+        self.timers = {}
+        self.tasks = deque()
+        self.idle_timeout = IDLE_TIMEOUT
+        self.loop_thread = None
+        self.wakeup_pending = False
+        self.next_frame = 0
+        self.frame = False
+        self.clock = Clock()
+        self.start_time = time.monotonic()
+        self.iteration_start = None
+        self.busy_time = 0.0
+        self.wakeups = {WAKEUP_INPUT: 0, WAKEUP_THREAD: 0, WAKEUP_FRAME: 0, WAKEUP_TIMER: 0, WAKEUP_IDLE: 0}
+
+    def start_animation(self, owner, rate=None):
+        """ Register active animation
+
+        :param owner: animated component. The animation is ignored while the component is invisible
+        :param rate: animation frame rate, None - the maximum frame rate
+        """
+        if rate == None or rate > self.frame_rate:
+            rate = self.frame_rate
+
+        with self.lock:
+            if self.animations.get(owner) == rate:
+                return
+            self.animations[owner] = rate
+        self.wakeup(True)
+
+    def stop_animation(self, owner):
+        """ Unregister animation
+
+        :param owner: animated component
+        """
+        with self.lock:
+            self.animations.pop(owner, None)
+
+    def get_animation_rate(self):
+        """ Get the frame rate required by the visible animations
+
+        :return: frame rate, 0 - nothing is animated
+        """
+        rate = 0
+        with self.lock:
+            for owner, r in list(self.animations.items()):
+                if getattr(owner, "visible", True):
+                    rate = max(rate, r)
+        return rate
+
+    def set_timer(self, name, delay):
+        """ Wake up the loop after delay. Setting the timer again replaces the previous deadline.
+
+        :param name: timer name
+        :param delay: delay in seconds
+        """
+        with self.lock:
+            self.timers[name] = time.monotonic() + delay
+        self.wakeup(True)
+
+    def cancel_timer(self, name):
+        """ Cancel timer
+
+        :param name: timer name
+        """
+        with self.lock:
+            self.timers.pop(name, None)
+
+    def wakeup(self, force=False):
+        """ Wake up the loop blocked in another thread. Called when a component was drawn outside of the loop.
+
+        :param force: True - always wake up, False - don't wake up if the loop is ticking frames anyway
+        """
+        if get_ident() == self.loop_thread:
+            return
+
+        with self.lock:
+            if self.wakeup_pending or (not force and self.animations and self.get_animation_rate()):
+                return
+            self.wakeup_pending = True
+
+        try:
+            pygame.event.post(pygame.event.Event(WAKEUP_EVENT_TYPE))
+        except Exception:
+            with self.lock:
+                self.wakeup_pending = False
+
+    def post(self, function, *args):
+        """ Call function in the loop thread. Used to update UI from the worker threads.
+
+        :param function: function to call
+        :param args: function arguments
+        """
+        self.tasks.append((function, args))
+        self.wakeup(True)
+
+    def run_tasks(self):
+        """ Call all posted functions. Called by the loop thread. """
+
+        while self.tasks:
+            function, args = self.tasks.popleft()
+            try:
+                function(*args)
+            except Exception as e:
+                logging.debug(e)
+
+    def wait(self):
+        """ Wait for the next loop iteration
+
+        :return: list of input events
+        """
+        now = time.monotonic()
+        with self.lock:
+            if self.loop_thread == None:
+                self.loop_thread = get_ident()
+            if self.iteration_start != None:
+                self.busy_time += now - self.iteration_start
+
+        if not self.adaptive:
+            self.clock.tick(self.frame_rate)
+            events = self.get_events(pygame.event.get())
+            with self.lock:
+                self.iteration_start = time.monotonic()
+                self.wakeup_pending = False
+            self.frame = True
+            self.count_wakeup(WAKEUP_INPUT if events else WAKEUP_FRAME)
+            return events
+
+        rate = self.get_animation_rate()
+        with self.lock:
+            deadline = now + self.idle_timeout
+            if self.timers:
+                deadline = min(deadline, min(self.timers.values()))
+        if rate:
+            deadline = min(deadline, self.next_frame)
+        if self.tasks:
+            deadline = now
+
+        timeout = math.ceil((deadline - now) * 1000)
+        if timeout > 0:
+            event = pygame.event.wait(timeout)
+            events = [] if event.type == pygame.NOEVENT else [event]
+            events.extend(pygame.event.get())
+        else:
+            events = pygame.event.get()
+
+        now = time.monotonic()
+        with self.lock:
+            self.iteration_start = now
+            woken = self.wakeup_pending
+            self.wakeup_pending = False
+            expired = [name for name, t in self.timers.items() if t <= now]
+            for name in expired:
+                del self.timers[name]
+
+        self.frame = bool(rate) and now >= self.next_frame
+        if self.frame:
+            interval = 1 / rate
+            self.next_frame += interval
+            if self.next_frame < now:
+                self.next_frame = now + interval
+
+        events = self.get_events(events)
+        if events:
+            self.count_wakeup(WAKEUP_INPUT)
+        elif self.frame:
+            self.count_wakeup(WAKEUP_FRAME)
+        elif expired:
+            self.count_wakeup(WAKEUP_TIMER)
+        elif woken:
+            self.count_wakeup(WAKEUP_THREAD)
+        else:
+            self.count_wakeup(WAKEUP_IDLE)
+        return events
+
+    def get_events(self, events):
+        """ Remove wakeup events
+
+        :param events: list of events
+
+        :return: list of input events
+        """
+        return [e for e in events if e.type != WAKEUP_EVENT_TYPE]
+
+    def count_wakeup(self, reason):
+        """ Count loop wakeup
+
+        :param reason: wakeup reason
+        """
+        with self.lock:
+            self.wakeups[reason] += 1
+
+    def is_frame(self):
+        """ Check if the current iteration is the animation frame
+
+        :return: True - animation frame, False - the loop was woken up by event or timer
+        """
+        return self.frame
+
+    def get_statistics(self):
+        """ Get loop statistics
+
+        :return: dictionary with the loop utilisation, current frame rate, number of animations and wakeups
+        """
+        with self.lock:
+            elapsed = time.monotonic() - self.start_time
+            wakeups = dict(self.wakeups)
+            animations = len(self.animations)
+            busy_time = self.busy_time
+
+        rate = self.get_animation_rate() if self.adaptive else self.frame_rate
+        return {
+            "adaptive": self.adaptive,
+            "frame.rate": rate,
+            "animations": animations,
+            "utilisation": busy_time / elapsed if elapsed > 0 else 0.0,
+            "wakeups": sum(wakeups.values()),
+            "wakeups.per.second": sum(wakeups.values()) / elapsed if elapsed > 0 else 0.0,
+            "wakeup.reasons": wakeups
+        }
@@ -2479,6 +2479,7 @@ class Peppy(object):
                         self.current_audio_file = f
                         cs.set_current_screen(state)
             cs.clean_draw_update()
+            self.util.image_util.pin_screen_images(cs)
             self.event_dispatcher.set_current_screen(cs)
             self.set_volume()
 
@@ -2632,8 +2633,10 @@ class Peppy(object):
         self.stop_player_timer_thread(title_screen_name)
 
         pygame.quit()
+        self.util.lookup_cache.close()
         
         if self.config[LINUX_PLATFORM]:
+            self.util.mixer_service.stop()
             if self.disk_manager.observer:
                 self.disk_manager.observer.stop()
             if not self.config[USAGE][USE_DESKTOP]:
@@ -0,0 +1,402 @@
+# Copyright 2026 Peppy Player peppy.player@gmail.com
+#
+# This file is part of Peppy Player.
+#
+# Peppy Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Peppy Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
+
+import socket
+import time
+import logging
+
+from threading import Condition, Thread
+from player.client.mpdcommands import COMMAND_LIST_OK_BEGIN, COMMAND_LIST_END, LIST_OK, OK, ACK, PING, EOL, \
+    IDLE, NOIDLE, CHANGED
+
+POOL_SIZE = 2
+COMMAND_TIMEOUT = 5.0
+KEEPALIVE_INTERVAL = 20.0
+RETRIES = 2
+
+class MpdClient(object):
+    """ Persistent MPD client. Keeps the pool of open connections to MPD server.
+    Idle connections are kept alive by 'ping' command which is sent more often than
+    MPD closes idle clients (connection_timeout in mpd.conf, default 60 seconds).
+    Several commands can be sent in one command list. Broken connections are reopened
+    automatically. The commands are sent again only if they couldn't be sent over the pooled
+    connection, so the command is never executed twice. The latency of each command is counted.
+    """
+
+    def __init__(self, host, port, pool_size=POOL_SIZE, encoding="utf-8"):
+        """ Initializer
+
+        :param host: host where MPD process is running
+        :param port: port at which MPD process is listening
+        :param pool_size: maximum number of open connections
+        :param encoding: encoding used to encode/decode messages
+        """
+        self.host = host
+        self.port = port
+        self.pool_size = pool_size
+        self.character_encoding = encoding
+        self.condition = Condition()
+        self.idle_connections = []
+        self.open_connections = 0
+        self.running = False
+        self.statistics = {}
+
+    def connect(self):
+        """ Open the first connection and start keep-alive thread """
+
+        with self.condition:
+            if self.running:
+                return
+            self.running = True
+
+        c = self.acquire()
+        if c:
+            self.release(c)
+
+        thread = Thread(target=self.keep_alive, daemon=True)
+        thread.start()
+
+    def disconnect(self):
+        """ Stop keep-alive thread and close all idle connections """
+
+        with self.condition:
+            self.running = False
+            for c in self.idle_connections:
+                c.close()
+            self.open_connections -= len(self.idle_connections)
+            self.idle_connections = []
+            self.condition.notify_all()
+
+    def acquire(self):
+        """ Get idle connection from the pool or open the new one.
+        Wait if all connections are in use.
+
+        :return: connection or None if MPD is not available
+        """
+        with self.condition:
+            while True:
+                if self.idle_connections:
+                    return self.idle_connections.pop()
+                if self.open_connections < self.pool_size:
+                    self.open_connections += 1
+                    break
+                self.condition.wait()
+
+        c = MpdSocketConnection(self.host, self.port, self.character_encoding)
+        if c.open():
+            return c
+
+        logging.error("Cannot connect to MPD server. Host: " + self.host + " Port: " + str(self.port))
+        with self.condition:
+            self.open_connections -= 1
+            self.condition.notify()
+        return None
+
+    def release(self, c, broken=False):
+        """ Return connection to the pool
+
+        :param c: connection
+        :param broken: True - close connection, False - keep it open
+        """
+        with self.condition:
+            if broken:
+                c.close()
+                self.open_connections -= 1
+            else:
+                self.idle_connections.append(c)
+            self.condition.notify()
+
+    def keep_alive(self):
+        """ Keep-alive thread loop. Sends 'ping' using connections which were idle for too long. """
+
+        while True:
+            time.sleep(KEEPALIVE_INTERVAL / 2)
+            with self.condition:
+                if not self.running:
+                    return
+                now = time.time()
+                old = [c for c in self.idle_connections if now - c.last_used >= KEEPALIVE_INTERVAL]
+                self.idle_connections = [c for c in self.idle_connections if c not in old]
+
+            for c in old:
+                try:
+                    c.execute([PING])
+                    self.release(c)
+                except Exception as e:
+                    logging.debug(e)
+                    self.release(c, broken=True)
+
+    def execute(self, commands):
+        """ Send commands and read results. Several commands are sent in one command list.
+        If the pooled connection was closed by MPD before the commands were sent it's reopened
+        and commands are sent again. If the connection was broken after sending MPD could already
+        execute the commands, so they are not repeated.
+
+        :param commands: list of commands
+        :return: list of results, one list of lines per command. None if MPD is not available
+        """
+        for _ in range(RETRIES):
+            c = self.acquire()
+            if c == None:
+                return None
+
+            start = time.time()
+            try:
+                r = c.execute(commands)
+            except Exception as e:
+                logging.debug(e)
+                self.release(c, broken=True)
+                if c.is_stale(e):
+                    continue
+                return None
+
+            self.release(c)
+            self.add_latency(commands, time.time() - start)
+            return r
+        return None
+
+    def add_latency(self, commands, latency):
+        """ Update latency counters
+
+        :param commands: list of commands
+        :param latency: latency in seconds
+        """
+        name = "+".join([cmd.split(" ", 1)[0] for cmd in commands])
+        with self.condition:
+            try:
+                s = self.statistics[name]
+            except KeyError:
+                s = self.statistics[name] = {"count": 0, "total": 0.0, "max": 0.0}
+            s["count"] += 1
+            s["total"] += latency
+            s["max"] = max(s["max"], latency)
+
+    def get_statistics(self):
+        """ Return latency counters
+
+        :return: dictionary where key - command name, value - dictionary with count, average and maximum latency in seconds
+        """
+        with self.condition:
+            return {k: {"count": v["count"], "average": v["total"] / v["count"], "max": v["max"]} for k, v in self.statistics.items()}
+
+    def command(self, name):
+        """ Send command to MPD
+
+        :param name: command name
+        :return: empty string
+        """
+        logging.debug("command: " + name)
+        self.execute([name])
+        return ""
+
+    def command_list(self, names):
+        """ Send several commands in one command list
+
+        :param names: list of commands
+        """
+        logging.debug("commands: " + str(names))
+        self.execute(names)
+
+    def get_multiline_result(self, cmd):
+        """ Send command to MPD and read the output messages until it's terminated by OK
+
+        :param cmd: command for MPD
+        :return: list of lines returned after command
+        """
+        r = self.execute([cmd])
+        if r == None:
+            return []
+        return r[0]
+
+    def read_dictionary(self, cmd):
+        """ Send command and parse the list of returned lines
+
+        :param cmd: command for MPD
+        :return: dictionary representing MPD process output for the specified input command
+        """
+        return self.read_dictionaries([cmd])[0]
+
+    def read_dictionaries(self, cmds):
+        """ Send commands in one command list and parse the results
+
+        :param cmds: list of commands
+        :return: list of dictionaries, one per command
+        """
+        r = self.execute(cmds)
+        if r == None:
+            return [{} for _ in cmds]
+        return [parse_dictionary(lines) for lines in r]
+
+class MpdSocketConnection(object):
+    """ One connection to MPD server """
+
+    def __init__(self, host, port, encoding="utf-8", timeout=COMMAND_TIMEOUT):
+        """ Initializer
+
+        :param host: host where MPD process is running
+        :param port: port at which MPD process is listening
+        :param encoding: encoding used to encode/decode messages
+        :param timeout: socket timeout in seconds, None - no timeout
+        """
+        self.host = host
+        self.port = port
+        self.character_encoding = encoding
+        self.timeout = timeout
+        self.socket = None
+        self.reader = None
+        self.used = False
+        self.sent = False
+        self.last_used = time.time()
+
+    def open(self):
+        """ Connect to MPD and read the greeting
+
+        :return: True - connected, False - connection failed
+        """
+        try:
+            self.socket = socket.create_connection((self.host, self.port), COMMAND_TIMEOUT)
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.socket.settimeout(self.timeout)
+            self.reader = self.socket.makefile("rb")
+            line = self.read_line()
+            if not line.startswith(OK):
+                raise ConnectionError("Wrong MPD greeting: " + line)
+        except Exception as e:
+            logging.debug(e)
+            self.close()
+            return False
+        return True
+
+    def close(self):
+        """ Close connection """
+
+        try:
+            if self.reader: self.reader.close()
+            if self.socket: self.socket.close()
+        except:
+            pass
+        self.reader = self.socket = None
+
+    def read_line(self):
+        """ Read one line
+
+        :return: line without line end
+        """
+        line = self.reader.readline()
+        if not line:
+            raise ConnectionError("MPD connection closed")
+        return line.decode(self.character_encoding, errors="replace").rstrip("\n")
+
+    def execute(self, commands):
+        """ Send commands and read results
+
+        :param commands: list of commands
+        :return: list of results, one list of lines per command
+        """
+        if len(commands) == 1:
+            message = commands[0] + EOL
+        else:
+            message = COMMAND_LIST_OK_BEGIN + EOL + EOL.join(commands) + EOL + COMMAND_LIST_END + EOL
+        self.sent = False
+        if self.used and self.is_closed():
+            raise ConnectionError("MPD connection closed")
+        self.socket.sendall(message.encode(self.character_encoding))
+        self.sent = True
+
+        results = []
+        lines = []
+        while True:
+            line = self.read_line()
+            if line == OK:
+                break
+            elif line == LIST_OK:
+                results.append(lines)
+                lines = []
+            elif line.startswith(ACK):
+                logging.debug("MPD error: " + line)
+                break
+            else:
+                lines.append(line)
+
+        if lines or len(results) < len(commands):
+            results.append(lines)
+        while len(results) < len(commands):
+            results.append([])
+
+        self.used = True
+        self.last_used = time.time()
+        return results
+
+    def is_closed(self):
+        """ Check if MPD closed the connection while it was idle
+
+        :return: True - connection closed, False - connection is open
+        """
+        try:
+            self.socket.setblocking(False)
+            try:
+                return self.socket.recv(1, socket.MSG_PEEK) == b""
+            finally:
+                self.socket.settimeout(self.timeout)
+        except BlockingIOError:
+            return False
+        except OSError:
+            return True
+
+    def is_stale(self, e):
+        """ Check if the command failed because MPD closed the pooled connection.
+        In this case the command wasn't sent and it can be sent again.
+
+        :param e: exception raised by execute
+        :return: True - command wasn't sent, False - MPD could execute the command
+        """
+        return self.used and not self.sent and isinstance(e, OSError)
+
+    def idle(self, subsystems):
+        """ Wait for changes in MPD subsystems. The call blocks until something is changed
+        or 'noidle' is sent by another thread.
+
+        :param subsystems: list of subsystem names
+        :return: list of changed subsystems
+        """
+        lines = self.execute([IDLE + " " + " ".join(subsystems)])[0]
+        return [line[len(CHANGED):].strip() for line in lines if line.startswith(CHANGED)]
+
+    def noidle(self):
+        """ Interrupt the 'idle' command """
+
+        try:
+            self.socket.sendall((NOIDLE + EOL).encode(self.character_encoding))
+        except Exception as e:
+            logging.debug(e)
+
+def parse_dictionary(lines):
+    """ Parse the list of lines returned by MPD
+
+    :param lines: list of lines
+    :return: dictionary where key - property name, value - property value
+    """
+    d = {}
+    for line in lines:
+        index = line.find(": ")
+        key = line[0:index]
+        if key.endswith(":file"):
+            key = key[0 : key.strip().find(":file")]
+        value = line[index + 1:]
+        d[key.rstrip()] = value.rstrip().strip()
+    return d
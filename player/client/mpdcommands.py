@@ -38,4 +38,11 @@ RADIO_PLAYLIST = "playlist"
 PLAYLIST_INFO = "playlistinfo"
 EOL = "\n"
 COMMAND_LIST_BEGIN = "command_list_begin"
-COMMAND_LIST_END = "command_list_end"
\ No newline at end of file
+COMMAND_LIST_END = "command_list_end"
+COMMAND_LIST_OK_BEGIN = "command_list_ok_begin"
+LIST_OK = "list_OK"
+OK = "OK"
+ACK = "ACK"
+PING = "ping"
+NOIDLE = "noidle"
+CHANGED = "changed:"
\ No newline at end of file
@@ -20,16 +20,22 @@ import threading
 import logging
 import time
 import urllib
+import queue
 
 from player.client.baseplayer import BasePlayer
-from player.client.mpdconnection import MpdConnection
+from player.client.mpdclient import MpdClient, MpdSocketConnection
 from player.client.mpdcommands import CLEAR, ADD, PLAY, STOP, PAUSE, RESUME, \
-    SET_VOLUME, GET_VOLUME, MUTE_2, STATUS, CURRENT_SONG, IDLE, SEEKCUR, LOAD_PLAYLIST, \
-    RADIO_PLAYLIST, PLAYLIST_INFO, EOL, COMMAND_LIST_BEGIN, COMMAND_LIST_END
+    SET_VOLUME, GET_VOLUME, MUTE_2, STATUS, CURRENT_SONG, SEEKCUR, LOAD_PLAYLIST, \
+    RADIO_PLAYLIST, PLAYLIST_INFO, CHANGED
 from player.client.player import Player
 from util.fileutil import FILE_PLAYLIST, FILE_AUDIO
 from util.config import RADIO, AUDIO_FILES, AUDIOBOOKS, CD_PLAYER, STREAM
 
+IDLE_SUBSYSTEMS = ["player", "mixer", "playlist", "options"]
+MIXER = "mixer"
+EVENT_QUEUE_SIZE = 32
+RECONNECT_DELAY = 1.0
+
 class Mpdsocket(BasePlayer):
     """ This class extends base player and provides communication with MPD process using TCP/IP socket """
         
@@ -42,6 +48,8 @@ class Mpdsocket(BasePlayer):
         self.muted = False
         self.playing = True
         self.conn = None
+        self.idle_connection = None
+        self.events = queue.Queue(EVENT_QUEUE_SIZE)
         self.dont_parse_track_name = False
         self.current_volume_level = "-1"
     
@@ -53,49 +61,94 @@ class Mpdsocket(BasePlayer):
     def start_client(self):
         """ Start client thread """
         
-        self.conn = MpdConnection(self.host, self.port)
+        self.conn = MpdClient(self.host, self.port)
         self.conn.connect()
         thread = threading.Thread(target=self.mpd_event_listener)
         thread.start()
+        thread = threading.Thread(target=self.mpd_event_dispatcher)
+        thread.start()
 
     def stop_client(self):
         """ Stop thread """
 
         with self.lock:
             self.playing = False
+        self.stop_event_listener()
+
+    def stop_event_listener(self):
+        """ Interrupt the idle command and stop event dispatcher """
+
+        c = self.idle_connection
+        if c:
+            c.noidle()
+        try:
+            self.events.put_nowait(None)
+        except queue.Full:
+            pass
        
     def mpd_event_listener(self):
-        """ Starts the loop for listening MPD events """
-        
+        """ Starts the loop for listening MPD events. One connection is kept open
+        for all idle commands. Changed subsystems are put in the event queue.
+        """
         while self.playing:
-            c = MpdConnection(self.host, self.port, reader_flags='r', encoding=None)
-            c.connect()
+            if self.idle_connection == None:
+                c = MpdSocketConnection(self.host, self.port, timeout=None)
+                if not c.open():
+                    time.sleep(RECONNECT_DELAY)
+                    continue
+                self.idle_connection = c
 
-            if not c.writer:
-                continue
-            
-            c.writer.write(IDLE + "\n")
-            c.writer.flush()
-            
-            line = None
-            try:        
-                line = c.reader.readline()  # blocking line
-                logging.debug("line from idle: " + line) 
+            try:
+                changed = self.idle_connection.idle(IDLE_SUBSYSTEMS)
+                logging.debug("changed from idle: " + str(changed))
             except Exception as e:
                 logging.debug(e)
-            
-            if line and "mixer" in line:
-                volume = self.get_volume()
-                self.notify_volume_listeners(volume)
+                self.idle_connection.close()
+                self.idle_connection = None
                 continue
-            
-            self.dispatch_callback(line)
-            c.disconnect()
+
+            if changed:
+                self.events.put(changed)
+
+        if self.idle_connection:
+            self.idle_connection.close()
+            self.idle_connection = None
+
+    def mpd_event_dispatcher(self):
+        """ Take events from the queue and call the handlers. All events waiting in the queue
+        are merged, so the burst of events results in one notification with all changed subsystems.
+        """
+        while self.playing:
+            changed = self.events.get()
+            if changed == None:
+                break
+
+            subsystems = list(changed)
+            try:
+                while True:
+                    changed = self.events.get_nowait()
+                    if changed == None:
+                        return
+                    subsystems.extend(changed)
+            except queue.Empty:
+                pass
+
+            subsystems = list(dict.fromkeys(subsystems))
+            try:
+                if MIXER in subsystems:
+                    subsystems.remove(MIXER)
+                    volume = self.get_volume()
+                    self.notify_volume_listeners(volume)
+
+                if subsystems:
+                    self.dispatch_callback(CHANGED + " " + " ".join(subsystems))
+            except Exception as e:
+                logging.debug(e)
                 
     def dispatch_callback(self, line):
         """ Callback dispatcher
         
-        :line: line from idle command
+        :line: line with all changed subsystems e.g. 'changed: playlist player'
         """
         if self.player_mode == RADIO:
             self.handle_radio_callback()
@@ -125,8 +178,7 @@ class Mpdsocket(BasePlayer):
     def handle_audiofiles_callback(self):
         """ Audiofiles callback handler """
         
-        current = self.current()
-        status = self.status()
+        current, status = self.current_and_status()
         current_file = self.util.get_dictionary_value(current, "file")
         current_title = self.util.get_dictionary_value(current, "Title")
         current["current_track_id"] = self.util.get_dictionary_value(current, "Track")
@@ -157,10 +209,9 @@ class Mpdsocket(BasePlayer):
     def handle_audiobooks_callback(self, line):
         """ Audiobooks callback handler
         
-        :line: line from idle command
+        :line: line with all changed subsystems
         """
-        current = self.current()
-        status = self.status()
+        current, status = self.current_and_status()
         current_title = self.util.get_dictionary_value(current, "Title")
         current_file = self.util.get_dictionary_value(current, "file")
  
@@ -190,10 +241,9 @@ class Mpdsocket(BasePlayer):
     def handle_cdplayer_callback(self, line):
         """ CD player callback handler
         
-        :line: line from idle command
+        :line: line with all changed subsystems
         """
-        current = self.current()
-        status = self.status()
+        current, status = self.current_and_status()
         current_file = current_title = current_track_id = None
         
         current_title = self.util.get_dictionary_value(current, "Title")
@@ -204,7 +254,7 @@ class Mpdsocket(BasePlayer):
         current["state"] = status["state"]
         current["source"] = "player"
         
-        if "playlist" in line and current_title == None:
+        if "playlist" in line and "player" not in line and current_title == None:
             return
             
         if current_title == None and current_file == None:
@@ -271,12 +321,7 @@ class Mpdsocket(BasePlayer):
             
         self.current_url = url
         
-        batch = COMMAND_LIST_BEGIN + EOL
-        batch += CLEAR + EOL
-        batch += ADD + url + EOL
-        batch += PLAY + '0' + EOL 
-        batch += COMMAND_LIST_END + EOL
-        self.conn.command(batch)
+        self.conn.command_list([CLEAR, ADD + url, PLAY + '0'])
         
         attempts = 100
         attempt = 0
@@ -404,11 +449,22 @@ class Mpdsocket(BasePlayer):
         with self.lock:
             return self.conn.read_dictionary(CURRENT_SONG)
 
+    def current_and_status(self):
+        """ Return the current song and the result of the STATUS command.
+        Both commands are sent in one command list.
+
+        :return: tuple (current song, status)
+        """
+        with self.lock:
+            current, status = self.conn.read_dictionaries([CURRENT_SONG, STATUS])
+            return (current, status)
+
     def shutdown(self):
         """ Shutdown the player """
         
         with self.lock:
             self.playing = False
+        self.stop_event_listener()
         
     def get_current_track_time(self):
         """  Return current track time
@@ -430,9 +486,11 @@ class Mpdsocket(BasePlayer):
         """
         with self.lock:
             d = self.conn.read_dictionary(RADIO_PLAYLIST)
+            if not d:
+                return []
+            commands = [PLAYLIST_INFO + " " + str(n) for n in range(len(d))]
             playlist = []
-            for n in range(len(d)):
-                i = self.conn.read_dictionary(PLAYLIST_INFO + " " + str(n))
+            for i in self.conn.read_dictionaries(commands):
                 playlist.append(i["Title"])
             return playlist
         
@@ -442,8 +500,7 @@ class Mpdsocket(BasePlayer):
         :param state: state object defining playlist location
         :return: new playlist
         """
-        self.conn.command(CLEAR)
-        self.conn.command(LOAD_PLAYLIST + self.get_url(state))
+        self.conn.command_list([CLEAR, LOAD_PLAYLIST + self.get_url(state)])
         return self.get_current_playlist()
     
     def notify_end_of_track_listeners(self):
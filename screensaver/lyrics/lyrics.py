@@ -50,7 +50,8 @@ class Lyrics(Container, Screensaver):
         self.lines = 12
         line_length = 52
         font_vertical_percent = 5
-        self.lyrics_util = LyricsUtil(util.k2, self.lines, line_length)
+        self.lyrics_util = LyricsUtil(util.k2, self.lines, line_length, util.lookup_cache)
+        util.lookup_cache.add_prefetcher(self.lyrics_util.get_lyrics)
         self.lyrics_not_found_label = self.config[LABELS][LYRICS_NOT_FOUND]
         self.bounding_box = util.screen_rect
         font_size = int((font_vertical_percent * self.bounding_box.h)/100)    
@@ -25,7 +25,7 @@ from monitorutil import MonitorUtil, BLACK, COLOR_THEMES, CPU, MEMORY, DISKS, PE
     DISKS_ICON_NAME, COLOR_THEME, VALUE, UNIT, DETAILS
 from ui.card.dashboard import Dashboard
 from screensaver.screensaver import Screensaver
-from util.config import BACKGROUND, SCREEN_BGR_COLOR, MONITOR
+from util.config import BACKGROUND, SCREEN_BGR_COLOR, MONITOR, SCREENSAVER_BLUR_RADIUS
 from itertools import cycle
 
 TIME_FORMAT = "%H:%M:%S"
@@ -85,7 +85,7 @@ class Monitor(Container, Screensaver):
         images = []
         r = random.sample(range(0, bgr_img_num), bgr_img_num)
         bgr = self.util.config[BACKGROUND][SCREEN_BGR_COLOR]
-        br = 4
+        br = SCREENSAVER_BLUR_RADIUS
         for n in r:
             img = self.util.get_background(self.name + "." + str(n), bgr, index=n, blur_radius=br)
             images.append((img[3], img[2]))
@@ -59,6 +59,7 @@ GPIO_PIN_RIGHT = "gpio.pin.right"
 SMOOTH_BUFFER_SIZE = "smooth.buffer.size"
 USE_LOGGING = "use.logging"
 USE_CACHE = "use.cache"
+NEEDLE_ATLAS_FOLDER = "needle.atlas.folder"
 USAGE = "usage"
 USE_VU_METER = "vu.meter"
 METER = "meter"
@@ -66,6 +67,7 @@ DATA_SOURCE = "data.source"
 TYPE = "type"
 POLLING_INTERVAL = "polling.interval"
 PIPE_NAME = "pipe.name"
+PIPE_VALUE = "pipe.value"
 VOLUME_CONSTANT = "volume.constant"
 VOLUME_MIN = "volume.min"
 VOLUME_MAX = "volume.max"
@@ -162,6 +164,13 @@ class ConfigFileParser(object):
         self.meter_config[OUTPUT_WEBSOCKET] = c.getboolean(CURRENT, OUTPUT_WEBSOCKET)
         self.meter_config[USE_LOGGING] = c.getboolean(CURRENT, USE_LOGGING)
         self.meter_config[USE_CACHE] = c.getboolean(CURRENT, USE_CACHE)
+        try:
+            folder = c.get(CURRENT, NEEDLE_ATLAS_FOLDER)
+            if folder and not os.path.isabs(folder):
+                folder = os.path.join(base_path, folder)
+            self.meter_config[NEEDLE_ATLAS_FOLDER] = folder
+        except:
+            self.meter_config[NEEDLE_ATLAS_FOLDER] = None
         self.meter_config[FRAME_RATE] = c.getint(CURRENT, FRAME_RATE)
         
         self.meter_config[SERIAL_INTERFACE] = {}
@@ -245,6 +254,10 @@ class ConfigFileParser(object):
         d[TYPE] = config_file.get(section, TYPE)
         d[POLLING_INTERVAL] = config_file.getfloat(section, POLLING_INTERVAL)
         d[PIPE_NAME] = config_file.get(section, PIPE_NAME)
+        try:
+            d[PIPE_VALUE] = config_file.get(section, PIPE_VALUE)
+        except:
+            d[PIPE_VALUE] = "latest"
         d[VOLUME_CONSTANT] = config_file.getfloat(section, VOLUME_CONSTANT)
         d[VOLUME_MIN] = config_file.getfloat(section, VOLUME_MIN)
         d[VOLUME_MAX] = config_file.getfloat(section, VOLUME_MAX)
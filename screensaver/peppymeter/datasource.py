@@ -15,7 +15,6 @@
 # You should have received a copy of the GNU General Public License
 # along with PeppyMeter. If not, see <http://www.gnu.org/licenses/>.
 
-import os
 import math
 import time
 import statistics
@@ -26,6 +25,7 @@ from threading import Thread, RLock
 from configfileparser import *
 from util.config import VOLUME, PLAYER_SETTINGS
 from collections import deque
+from pipereader import PipeReader
 
 SOURCE_CONSTANT = "constant"
 SOURCE_NOISE = "noise"
@@ -42,6 +42,10 @@ STEREO_ALGORITHM_NEW = "new"
 STEREO_ALGORITHM_LOGARITHM = "logarithm"
 STEREO_ALGORITHM_AVERAGE = "average"
 
+PIPE_VALUE_LATEST = "latest"
+PIPE_VALUE_RMS = "rms"
+PIPE_VALUE_PEAK = "peak"
+
 class DataSource(object):
     """ Provides methods to generate different types of audio signal. """
     
@@ -63,22 +67,19 @@ class DataSource(object):
         self.min = self.config[VOLUME_MIN]
         self.max_in_ui = self.config[VOLUME_MAX]
         self.max_in_pipe = self.config[VOLUME_MAX_IN_PIPE]
+        self.pipe_value = self.config[PIPE_VALUE]
         
         self.v = 0
         self.step = self.config[STEP]
-        self.pipe_size = 4
-        self.PIPE_BUFFER_SIZE = 1048576 # as defined for Raspberry OS in /proc/sys/fs/pipe-max-size
         self.rng = list(range(int(self.min), int(self.max_in_ui)))
         self.double_rng = self.rng
         self.double_rng.extend(range(int(self.max_in_ui) - 1, int(self.min), -1))
-        self.pipe = None
+        self.pipe_reader = None
         if self.ds_type == SOURCE_PIPE:
-            thread = Thread(target=self.open_pipe)
-            thread.start()
+            self.pipe_reader = PipeReader(self.pipe_name)
         self.previous_left = self.previous_right = self.previous_mono = 0.0
         self.run_flag = True
         self.polling_interval = self.config[POLLING_INTERVAL]
-        self.pipe_polling_inerval = self.polling_interval / 10
         self.prev_time = None
         self.data = ()
         self.http_data = ()
@@ -97,32 +98,11 @@ class DataSource(object):
             SOURCE_HTTP: self.get_http_value
         }
     
-    def open_pipe(self):
-        """ Open named pipe """
-
-        try:            
-            logging.debug("opening pipe...")
-            self.pipe = os.open(self.pipe_name, os.O_RDONLY | os.O_NONBLOCK)
-            logging.debug("pipe opened")
-        except:
-            logging.debug("Cannot open named pipe: " + self.pipe_name)
-
-    def flush_pipe_buffer(self):
-        """ Flush data from the pipe """
-
-        if not self.pipe:
-            return
-
-        try:
-            os.read(self.pipe, self.PIPE_BUFFER_SIZE)
-        except Exception as e:
-            logging.debug(e)
-
     def start_data_source(self):
-        """ Start data source thread. """ 
+        """ Start data source thread. The pipe reader is shared by the meters and all interfaces. """ 
 
-        if self.ds_type == SOURCE_PIPE:
-            self.flush_pipe_buffer()
+        if self.pipe_reader:
+            self.pipe_reader.start()
 
         self.run_flag = True
         thread = Thread(target=self.get_data)
@@ -132,6 +112,8 @@ class DataSource(object):
         """ Stop data source thread. """ 
                
         self.run_flag = False
+        if self.pipe_reader:
+            self.pipe_reader.stop()
     
     def get_current_data(self):
         """ Return current data """
@@ -243,21 +225,16 @@ class DataSource(object):
         return s
     
     def get_latest_pipe_data(self):
-        """ Read from the named pipe until it's empty """
-
-        latest_data = [0, 0, 0, 0]
-        data = None
+        """ Get the latest values published by the pipe reader
 
-        while True:
-            try:
-                data = os.read(self.pipe, self.pipe_size)
-                if len(data) != 0:
-                    latest_data = [data[0], data[1], data[2], data[3]]
-                time.sleep(self.pipe_polling_inerval)
-            except:
-                break
-
-        return latest_data
+        :return: tuple (left, right)
+        """
+        if self.pipe_value == PIPE_VALUE_RMS:
+            return self.pipe_reader.get_rms()
+        elif self.pipe_value == PIPE_VALUE_PEAK:
+            return self.pipe_reader.get_peak()
+        else:
+            return self.pipe_reader.get_latest()
 
     def get_http_value(self):
         """ Fetch HTTP value """
@@ -274,17 +251,13 @@ class DataSource(object):
         if volume_level == 0:
             volume_level = 1
         
-        if self.pipe == None:
+        if self.pipe_reader == None:
             return (left, right, mono)
         
         try:
             data = self.get_latest_pipe_data()
-            length = len(data) 
-            if length == 0:
-                return (0, 0, 0)
-            
-            new_left = int(self.max_in_ui * ((data[length - 4] + (data[length - 3] << 8)) / self.max_in_pipe))
-            new_right = int(self.max_in_ui * ((data[length - 2] + (data[length - 1] << 8)) / self.max_in_pipe))
+            new_left = int(self.max_in_ui * (data[0] / self.max_in_pipe))
+            new_right = int(self.max_in_ui * (data[1] / self.max_in_pipe))
             new_mono = self.get_mono(new_left, new_right)
             
             left = self.get_channel(self.previous_left, new_left)
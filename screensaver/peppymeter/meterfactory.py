@@ -15,6 +15,7 @@
 # You should have received a copy of the GNU General Public License
 # along with PeppyMeter. If not, see <http://www.gnu.org/licenses/>.
 
+import os
 import logging
 
 from meter import Meter
@@ -25,7 +26,8 @@ from configfileparser import *
 class MeterFactory(object):
     """ Meter creation factory """
     
-    def __init__(self, util, meter_config, data_source, mono_needle_cache, mono_rect_cache, left_needle_cache, left_rect_cache, right_needle_cache, right_rect_cache):
+    def __init__(self, util, meter_config, data_source, mono_needle_cache, mono_rect_cache, left_needle_cache, left_rect_cache, right_needle_cache, right_rect_cache,
+        needle_atlas=None):
         """ Initializer
         
         :param util: utility class
@@ -35,6 +37,7 @@ class MeterFactory(object):
         :param mono_rect_cache: dictionary where key - meter name, value - list of mono needle sprite rectangles
         :param left_rect_cache: dictionary where key - meter name, value - list of left needle sprite rectangles
         :param right_rect_cache: dictionary where key - meter name, value - list of right needle sprite rectangles
+        :param needle_atlas: persistent atlas of needle sprites, None - don't use atlas
         """
         self.util = util
         self.meter_config = meter_config
@@ -45,6 +48,7 @@ class MeterFactory(object):
         self.left_rect_cache = left_rect_cache
         self.right_needle_cache = right_needle_cache
         self.right_rect_cache = right_rect_cache
+        self.needle_atlas = needle_atlas
         
     def create_meter(self):
         """ Dispatcher method """ 
@@ -139,7 +143,9 @@ class MeterFactory(object):
         config[NEEDLE_WIDTH] = w
         config[NEEDLE_HEIGHT] = h
         
-        factory = NeedleFactory(name, needle, config, self.mono_needle_cache, self.mono_rect_cache, self.left_needle_cache, self.left_rect_cache, self.right_needle_cache, self.right_rect_cache)
+        needle_path = os.path.join(self.meter_config[BASE_PATH], self.meter_config[SCREEN_INFO][METER_SIZE], config[INDICATOR_FILENAME])
+        factory = NeedleFactory(name, needle, config, self.mono_needle_cache, self.mono_rect_cache, self.left_needle_cache, self.left_rect_cache,
+            self.right_needle_cache, self.right_rect_cache, self.needle_atlas, needle_path)
         
         if config[CHANNELS] == 2:
             meter.left_needle_sprites = factory.left_needle_sprites
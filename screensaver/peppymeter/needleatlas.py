@@ -0,0 +1,163 @@
+# Copyright 2026 Peppy Player peppy.player@gmail.com
+#
+# This file is part of Peppy Player.
+#
+# Peppy Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Peppy Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import math
+import json
+import hashlib
+import logging
+import pygame
+
+ATLAS_EXTENSION = ".png"
+RECTS_EXTENSION = ".json"
+PADDING = 1
+
+class NeedleAtlas(object):
+    """ Persistent atlas of the rotated needle sprites. All sprites of one needle are packed
+    into one sprite sheet, the table keeps the position of each sprite in the sheet and its
+    rectangle. The key is the hash of the needle image path, its modification time and
+    the rotation parameters. The sprites are the subsurfaces of the sheet.
+    """
+
+    def __init__(self, folder):
+        """ Initializer
+
+        :param folder: atlas folder
+        """
+        self.folder = folder
+
+    def get_key(self, path, parameters):
+        """ Get atlas key
+
+        :param path: needle image path
+        :param parameters: list of rotation parameters
+
+        :return: key or None if the image file doesn't exist
+        """
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except Exception:
+            return None
+        s = json.dumps([os.path.abspath(path), mtime] + list(parameters))
+        return hashlib.sha1(s.encode("utf-8")).hexdigest()
+
+    def get_sprites(self, path, parameters, create_sprites):
+        """ Get needle sprites from the atlas. Create and save the atlas if it doesn't exist.
+
+        :param path: needle image path
+        :param parameters: list of rotation parameters
+        :param create_sprites: function which creates tuple (list of sprites, list of rectangles)
+
+        :return: tuple (list of sprites, list of rectangles)
+        """
+        key = self.get_key(path, parameters)
+        if key == None:
+            return create_sprites()
+
+        sheet_path = os.path.join(self.folder, key + ATLAS_EXTENSION)
+        table_path = os.path.join(self.folder, key + RECTS_EXTENSION)
+
+        sprites = self.load(sheet_path, table_path)
+        if sprites:
+            return sprites
+
+        images, rects = create_sprites()
+        self.save(images, rects, sheet_path, table_path)
+        return self.load(sheet_path, table_path) or (images, rects)
+
+    def load(self, sheet_path, table_path):
+        """ Load atlas
+
+        :param sheet_path: sprite sheet path
+        :param table_path: rectangle table path
+
+        :return: tuple (list of sprites, list of rectangles) or None if atlas doesn't exist
+        """
+        if not os.path.isfile(sheet_path) or not os.path.isfile(table_path):
+            return None
+
+        try:
+            with open(table_path, "r") as f:
+                table = json.load(f)
+            sheet = pygame.image.load(sheet_path)
+            try:
+                sheet = sheet.convert_alpha()
+            except Exception:
+                pass
+            images = []
+            rects = []
+            for t in table:
+                images.append(sheet.subsurface(pygame.Rect(t[0], t[1], t[2], t[3])))
+                rects.append(pygame.Rect(t[4], t[5], t[2], t[3]))
+        except Exception as e:
+            logging.debug(e)
+            return None
+
+        return (images, rects)
+
+    def pack(self, images):
+        """ Place images on the sheet using rows of images
+
+        :param images: list of images
+
+        :return: tuple (sheet size, list of positions)
+        """
+        area = sum((i.get_width() + PADDING) * (i.get_height() + PADDING) for i in images)
+        max_width = max(i.get_width() + PADDING for i in images)
+        width = max(max_width, int(math.sqrt(area)))
+
+        positions = []
+        x = y = row_height = 0
+        for i in images:
+            w, h = i.get_width() + PADDING, i.get_height() + PADDING
+            if x + w > width:
+                x = 0
+                y += row_height
+                row_height = 0
+            positions.append((x, y))
+            x += w
+            row_height = max(row_height, h)
+
+        return ((width, y + row_height), positions)
+
+    def save(self, images, rects, sheet_path, table_path):
+        """ Save atlas
+
+        :param images: list of sprites
+        :param rects: list of sprite rectangles
+        :param sheet_path: sprite sheet path
+        :param table_path: rectangle table path
+        """
+        if not images:
+            return
+
+        size, positions = self.pack(images)
+        sheet = pygame.Surface(size, pygame.SRCALPHA, 32)
+        table = []
+        for i, r, p in zip(images, rects, positions):
+            sheet.blit(i, p, special_flags=pygame.BLEND_RGBA_MAX)
+            table.append([p[0], p[1], i.get_width(), i.get_height(), r.x, r.y])
+
+        tmp_path = sheet_path + ".tmp" + ATLAS_EXTENSION
+        try:
+            os.makedirs(self.folder, exist_ok=True)
+            pygame.image.save(sheet, tmp_path)
+            os.replace(tmp_path, sheet_path)
+            with open(table_path, "w") as f:
+                json.dump(table, f)
+        except Exception as e:
+            logging.debug(e)
@@ -21,7 +21,8 @@ from configfileparser import *
 class NeedleFactory(object):
     """ Factory to prepare needle sprites for circular animator """
     
-    def __init__(self, name, image, config, mono_needle_cache, mono_rect_cache, left_needle_cache, left_rect_cache, right_needle_cache, right_rect_cache):
+    def __init__(self, name, image, config, mono_needle_cache, mono_rect_cache, left_needle_cache, left_rect_cache, right_needle_cache, right_rect_cache,
+        needle_atlas=None, image_path=None):
         """ Initializer
         
         :param name: meter name
@@ -33,9 +34,13 @@ class NeedleFactory(object):
         :param left_rect_cache: dictionary where key - meter name, value - list of left channel needle sprite rectangles
         :param right_needle_cache: dictionary where key - meter name, value - list of right channel needle sprites
         :param right_rect_cache: dictionary where key - meter name, value - list of right channel needle sprite rectangles
+        :param needle_atlas: persistent atlas of needle sprites, None - don't use atlas
+        :param image_path: base needle image path
         """
         self.image = image
         self.config = config
+        self.needle_atlas = needle_atlas
+        self.image_path = image_path
         
         if config[CHANNELS] == 1:
             self.mono_needle_sprites = self.get_cached_object(name, mono_needle_cache)
@@ -111,7 +116,7 @@ class NeedleFactory(object):
         return (rotated_image, rotated_image_rect)
 
     def create_needle_sprites(self, needle_sprites, needle_rects, distance, start_angle, stop_angle, flip):
-        """ Create sprites for all angles
+        """ Get sprites for all angles from the atlas or create them
 
         :param needle_sprites: list of sprite images
         :param needle_rects: list of sprite rectangles
@@ -120,6 +125,27 @@ class NeedleFactory(object):
         :param stop_angle: stop angle
         :param flip: True - flip indicator image across X axis
         """
+        create = lambda: self.rotate_needle(distance, start_angle, stop_angle, flip)
+
+        if self.needle_atlas and self.image_path:
+            parameters = [distance, start_angle, stop_angle, flip, self.config[STEPS_PER_DEGREE]]
+            sprites = self.needle_atlas.get_sprites(self.image_path, parameters, create)
+        else:
+            sprites = create()
+
+        needle_sprites.extend(sprites[0])
+        needle_rects.extend(sprites[1])
+
+    def rotate_needle(self, distance, start_angle, stop_angle, flip):
+        """ Create sprites for all angles
+
+        :param distance: distance between rotation origin and image center
+        :param start_angle: start angle
+        :param stop_angle: stop angle
+        :param flip: True - flip indicator image across X axis
+
+        :return: tuple (list of sprite images, list of sprite rectangles)
+        """
         images = []
         rects = []
         s = 1 / self.config[STEPS_PER_DEGREE]
@@ -136,6 +162,4 @@ class NeedleFactory(object):
             images.append(i)
             rects.append(r)
 
-        sprites = (images, rects)
-        needle_sprites.extend(sprites[0])
-        needle_rects.extend(sprites[1])
+        return (images, rects)
@@ -0,0 +1,192 @@
+# Copyright 2026 Peppy Player peppy.player@gmail.com
+#
+# This file is part of Peppy Player.
+#
+# Peppy Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Peppy Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import math
+import struct
+import logging
+import selectors
+
+from threading import Thread, RLock
+from collections import deque
+
+FRAME = struct.Struct("<HH")
+READ_BUFFER_SIZE = 65536
+WINDOW_SIZE = 64
+SELECT_TIMEOUT = 0.1
+
+class PipeReader(object):
+    """ Named pipe reader. The thread sleeps in the selector until the data is available
+    and then drains the pipe in bulk reads. Each frame keeps left and right values
+    as two little-endian 16-bit numbers. The last frames are kept in the ring buffer,
+    the latest frame and RMS/peak values over the buffer are available for all consumers.
+    If nothing was written during the select timeout (playback paused or stopped)
+    the frames are cleared, so the consumers get zero values.
+    """
+
+    lock = RLock()
+
+    def __init__(self, pipe_name, window_size=WINDOW_SIZE):
+        """ Initializer
+
+        :param pipe_name: named pipe path
+        :param window_size: number of frames in the ring buffer
+        """
+        self.pipe_name = pipe_name
+        self.frames = deque(maxlen=window_size)
+        self.latest = (0, 0)
+        self.buffer = bytearray(READ_BUFFER_SIZE)
+        self.remainder = b""
+        self.run_flag = False
+        self.thread = None
+
+    def start(self):
+        """ Start reader thread """
+
+        with self.lock:
+            self.run_flag = True
+            self.clear()
+            if self.thread != None:
+                return
+            self.thread = Thread(target=self.read_pipe, daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        """ Stop reader thread """
+
+        with self.lock:
+            self.run_flag = False
+
+    def clear(self):
+        """ Forget all frames """
+
+        with self.lock:
+            self.frames.clear()
+            self.latest = (0, 0)
+            self.remainder = b""
+
+    def open_pipe(self):
+        """ Open named pipe. The pipe is also opened for writing to prevent the end of file
+        state when the audio player closes its end, otherwise the selector would wake up all the time.
+
+        :return: tuple (reader, writer) or None
+        """
+        try:
+            logging.debug("opening pipe...")
+            reader = os.open(self.pipe_name, os.O_RDONLY | os.O_NONBLOCK)
+            writer = os.open(self.pipe_name, os.O_WRONLY | os.O_NONBLOCK)
+            logging.debug("pipe opened")
+            return (reader, writer)
+        except Exception as e:
+            logging.debug("Cannot open named pipe: " + self.pipe_name)
+            logging.debug(e)
+            return None
+
+    def read_pipe(self):
+        """ Thread method """
+
+        pipe = self.open_pipe()
+        if pipe == None:
+            with self.lock:
+                self.run_flag = False
+                self.thread = None
+            return
+
+        reader, writer = pipe
+        selector = selectors.DefaultSelector()
+        selector.register(reader, selectors.EVENT_READ)
+        try:
+            while True:
+                with self.lock:
+                    if not self.run_flag:
+                        self.thread = None
+                        break
+                if selector.select(SELECT_TIMEOUT):
+                    self.drain(reader)
+                else:
+                    self.clear()
+        finally:
+            selector.close()
+            os.close(reader)
+            os.close(writer)
+
+    def drain(self, reader):
+        """ Read all available data from the pipe
+
+        :param reader: pipe file descriptor
+        """
+        while True:
+            try:
+                n = os.readv(reader, [self.buffer])
+            except BlockingIOError:
+                return
+            except Exception as e:
+                logging.debug(e)
+                return
+            if n == 0:
+                return
+            self.add_data(self.buffer[:n])
+            if n < len(self.buffer):
+                return
+
+    def add_data(self, data):
+        """ Split data into frames and add them to the ring buffer
+
+        :param data: bytes read from the pipe
+        """
+        with self.lock:
+            if self.remainder:
+                data = self.remainder + data
+            end = len(data) - len(data) % FRAME.size
+            self.remainder = bytes(data[end:])
+            if end == 0:
+                return
+            self.frames.extend(FRAME.iter_unpack(data[max(0, end - FRAME.size * self.frames.maxlen):end]))
+            self.latest = self.frames[-1]
+
+    def get_latest(self):
+        """ Get the latest frame
+
+        :return: tuple (left, right)
+        """
+        with self.lock:
+            return self.latest
+
+    def get_rms(self):
+        """ Get RMS values over the ring buffer
+
+        :return: tuple (left, right)
+        """
+        with self.lock:
+            frames = list(self.frames)
+        if not frames:
+            return (0, 0)
+        n = len(frames)
+        left = math.sqrt(sum(f[0] * f[0] for f in frames) / n)
+        right = math.sqrt(sum(f[1] * f[1] for f in frames) / n)
+        return (left, right)
+
+    def get_peak(self):
+        """ Get peak values over the ring buffer
+
+        :return: tuple (left, right)
+        """
+        with self.lock:
+            frames = list(self.frames)
+        if not frames:
+            return (0, 0)
+        return (max(f[0] for f in frames), max(f[1] for f in frames))
@@ -20,8 +20,9 @@ import copy
 
 from random import randrange
 from meterfactory import MeterFactory
+from needleatlas import NeedleAtlas
 from screensavermeter import ScreensaverMeter
-from configfileparser import METER, METER_NAMES, RANDOM_METER_INTERVAL, USE_CACHE
+from configfileparser import METER, METER_NAMES, RANDOM_METER_INTERVAL, USE_CACHE, NEEDLE_ATLAS_FOLDER
 
 class Vumeter(ScreensaverMeter):
     """ VU Meter plug-in. """
@@ -59,6 +60,10 @@ class Vumeter(ScreensaverMeter):
         self.right_needle_cache = {}
         self.right_rect_cache = {}
 
+        self.needle_atlas = None
+        if self.util.meter_config.get(NEEDLE_ATLAS_FOLDER):
+            self.needle_atlas = NeedleAtlas(self.util.meter_config[NEEDLE_ATLAS_FOLDER])
+
     def get_meter(self):
         """ Creates meter using meter factory. """  
               
@@ -77,7 +82,8 @@ class Vumeter(ScreensaverMeter):
             self.util.meter_config[METER] = self.meter_names[self.list_meter_index]
             self.list_meter_index += 1
 
-        factory = MeterFactory(self.util, self.util.meter_config, self.data_source, self.mono_needle_cache, self.mono_rect_cache, self.left_needle_cache, self.left_rect_cache, self.right_needle_cache, self.right_rect_cache)
+        factory = MeterFactory(self.util, self.util.meter_config, self.data_source, self.mono_needle_cache, self.mono_rect_cache, self.left_needle_cache, self.left_rect_cache,
+            self.right_needle_cache, self.right_rect_cache, self.needle_atlas)
         m = factory.create_meter()
 
         return m
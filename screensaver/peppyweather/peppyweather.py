@@ -26,7 +26,7 @@ from today import Today
 from forecast import Forecast
 from screensaver.screensaver import Screensaver, PLUGIN_CONFIGURATION
 from itertools import cycle
-from util.config import BACKGROUND, SCREEN_BGR_COLOR, COLORS, COLOR_DARK_LIGHT, CURRENT, LANGUAGE
+from util.config import BACKGROUND, SCREEN_BGR_COLOR, COLORS, COLOR_DARK_LIGHT, CURRENT, LANGUAGE, SCREENSAVER_BLUR_RADIUS
 
 SCREENSAVER = "screensaver"
 WEATHER = "peppyweather"
@@ -86,7 +86,7 @@ class Peppyweather(Container, Screensaver):
 
         r = random.sample(range(0, bgr_count), count)
 
-        br = 4
+        br = SCREENSAVER_BLUR_RADIUS
         for n in r:
             img = util.get_background(self.name + "." + str(n), bgr, index=n, blur_radius=br)
             self.images.append((img[3], img[2]))
@@ -103,7 +103,10 @@ class Peppyweather(Container, Screensaver):
         util.weather_config[LANGUAGE] = util.get_weather_language_code(util.config[CURRENT][LANGUAGE])
         path = os.path.join(os.getcwd(), SCREENSAVER, WEATHER)
 
-        self.util = WeatherUtil(self.api_key, util.weather_config, self.config["labels"], self.unit, path)
+        image_cache = None
+        if getattr(util, "memory_cache", None):
+            image_cache = util.memory_cache.get_namespace("weather")
+        self.util = WeatherUtil(self.api_key, util.weather_config, self.config["labels"], self.unit, path, image_cache)
 
         if not self.latitude and not self.longitude and not self.unit:
             self.ready = False
@@ -61,7 +61,7 @@ GENERATED_IMAGE = "generated.img."
 class WeatherUtil(object):
     """ Utility class """
     
-    def __init__(self, app_key, weather_config, labels, unit, path):
+    def __init__(self, app_key, weather_config, labels, unit, path, image_cache=None):
         """ Initializer 
         
         :param app_key: OpenWeather API key
@@ -69,6 +69,7 @@ class WeatherUtil(object):
         :param labels: labels
         :param unit: unit
         :param path: base path
+        :param image_cache: external image cache, None - use own cache
         """
         self.app_key = app_key
         self.weather_config = weather_config
@@ -86,7 +87,10 @@ class WeatherUtil(object):
         else:
             self.unit = "metric"
 
-        self.image_cache = {}
+        if image_cache == None:
+            self.image_cache = {}
+        else:
+            self.image_cache = image_cache
         self.code_image_map = {}
         self.code_image_map["01d"] = "01d.svg"
         self.code_image_map["01n"] = "01n.svg"
@@ -15,6 +15,7 @@
 # You should have received a copy of the GNU General Public License
 # along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
 
+import time
 import pygame
 import logging
 
@@ -25,13 +26,16 @@ from util.keys import USER_EVENT_TYPE
 from util.config import SCREEN_INFO, FRAME_RATE, SCREENSAVER, NAME, SCREENSAVER_DELAY, CLOCK, LOGO, LYRICS, VUMETER, \
     WEATHER, SLIDESHOW, KEY_SCREENSAVER_DELAY_1, KEY_SCREENSAVER_DELAY_3, USAGE, USE_VU_METER, SCRIPTS, SCRIPT_SCREENSAVER_START, \
     DSI_DISPLAY_BACKLIGHT, USE_DSI_DISPLAY, BACKLIGHTER, SCREEN_BRIGHTNESS, SCREENSAVER_BRIGHTNESS, SCRIPT_SCREENSAVER_STOP, \
-    SCREENSAVER_DISPLAY_POWER_OFF, DELAY, SCREENSAVER_MENU, RANDOM, ACTIVE_SAVERS, DISABLED_SAVERS, PEXELS, MONITOR, STOCK, HOROSCOPE
+    SCREENSAVER_DISPLAY_POWER_OFF, DELAY, SCREENSAVER_MENU, RANDOM, ACTIVE_SAVERS, DISABLED_SAVERS, PEXELS, MONITOR, STOCK, HOROSCOPE, \
+    SPECTRUM
 
 DELAY_1 = 60
 DELAY_3 = 180
 DELAY_OFF = 0
 
 WEB_SAVERS = [CLOCK, LOGO, LYRICS, WEATHER, SLIDESHOW, PEXELS, MONITOR, STOCK, HOROSCOPE]
+ANIMATED_SAVERS = [VUMETER, SPECTRUM]
+SCREENSAVER_TIMER = "screensaver"
 
 class ScreensaverDispatcher(Component):
     """ Starts and stops screensavers. Handles switching between plug-ins. """
@@ -58,10 +62,10 @@ class ScreensaverDispatcher(Component):
         self.current_delay = self.get_delay()
         self.current_screen = None
         self.saver_running = False
-        self.one_cycle_period = 1000 / self.config[SCREEN_INFO][FRAME_RATE]
-        self.counter = 0
-        self.delay_counter = 0
+        self.update_time = None
+        self.delay_time = None
         self.previous_saver = None
+        self.reset_delay()
 
     def get_active_savers(self):
         """ Get all configured savers
@@ -154,9 +158,11 @@ class ScreensaverDispatcher(Component):
             return
 
         self.current_screensaver.refresh()
-        self.counter = 0
-        self.delay_counter = 0    
+        self.delay_time = None
+        self.set_update_time()
         self.saver_running = True
+        if self.config[SCREENSAVER][NAME] in ANIMATED_SAVERS:
+            self.scheduler.start_animation(self.current_screensaver)
 
         self.notify_start_listeners(s)
             
@@ -182,10 +188,13 @@ class ScreensaverDispatcher(Component):
             return
 
         self.current_screensaver.stop()
+        self.scheduler.stop_animation(self.current_screensaver)
         self.current_screensaver.set_visible(False)
         self.current_screen.set_visible(True)
         self.current_screen.clean_draw_update()
         self.saver_running = False
+        self.update_time = None
+        self.reset_delay()
         self.notify_stop_listeners(None)
 
         if self.previous_saver != None and self.config[SCREENSAVER][NAME] != self.previous_saver:
@@ -214,6 +223,8 @@ class ScreensaverDispatcher(Component):
         :param state: button state which contains new delay
         """
         self.current_delay = self.get_delay()
+        if not self.saver_running:
+            self.reset_delay()
         
     def get_screensaver(self):
         """ Return current screensaver """
@@ -242,14 +253,36 @@ class ScreensaverDispatcher(Component):
             delay = DELAY_3
         return delay
     
+    def reset_delay(self):
+        """ Start counting the delay before the screensaver starts """
+
+        if self.current_delay == DELAY_OFF:
+            self.delay_time = None
+            self.scheduler.cancel_timer(SCREENSAVER_TIMER)
+        else:
+            self.delay_time = time.monotonic() + self.current_delay
+            self.scheduler.set_timer(SCREENSAVER_TIMER, self.current_delay)
+
+    def set_update_time(self):
+        """ Set the time of the next screensaver update """
+
+        if not self.update_period or self.update_period <= 0:
+            self.update_time = None
+            self.scheduler.cancel_timer(SCREENSAVER_TIMER)
+            return
+
+        self.update_time = time.monotonic() + self.update_period
+        self.scheduler.set_timer(SCREENSAVER_TIMER, self.update_period)
+
     def refresh(self):
-        """ Refresh screensaver """
-        
+        """ Refresh screensaver. The screensaver is started after delay and updated 
+        with its update period. The main loop is woken up by the scheduler timer.
+        """
+        now = time.monotonic()
         if self.saver_running:
-            self.counter = self.counter + 1
-            if int(self.counter * self.one_cycle_period) == self.update_period * 1000:
+            if self.update_time != None and now >= self.update_time:
+                self.set_update_time()
                 self.current_screensaver.refresh()
-                self.counter = 0
                 if self.config[SCREENSAVER][NAME] in WEB_SAVERS:
                     s = State()
                     if isinstance(self.current_screensaver, Component):
@@ -263,17 +296,17 @@ class ScreensaverDispatcher(Component):
                         s.screen = self.current_screensaver                
                     self.notify_start_listeners(s)
         else:
-            if self.current_delay == 0:
-                return
-            self.delay_counter = self.delay_counter + 1
-            if int(self.delay_counter * self.one_cycle_period) == self.current_delay * 1000:
-                self.start_screensaver()                
+            if self.delay_time != None and now >= self.delay_time:
+                self.delay_time = None
+                self.start_screensaver()
         
     def change_image(self, state):
         """ Set new image on screensaver
         
         :param state: button state which contains new image
         """
+        self.util.lookup_cache.prefetch(getattr(state, "album", None))
+
         if not self.current_screensaver:
             return
 
@@ -327,7 +360,7 @@ class ScreensaverDispatcher(Component):
             if self.saver_running:               
                 self.cancel_screensaver(event)
             else:
-                self.delay_counter = 0                
+                self.reset_delay()
                 
     def add_start_listener(self, listener):
         """ Add start screensaver event listener
@@ -20,6 +20,7 @@ import time
 import logging
 import sys
 import os
+import struct
 
 from component import Component
 from container import Container
@@ -30,6 +31,11 @@ from screensaverspectrum import ScreensaverSpectrum
 from spectrumutil import SpectrumUtil
 from spectrumconfigparser import *
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 class Spectrum(Container, ScreensaverSpectrum):
     """ Spectrum Analyzer screensaver plug-in. """
         
@@ -66,6 +72,7 @@ class Spectrum(Container, ScreensaverSpectrum):
             Container.__init__(self, util, bounding_box=util.screen_rect, background=self.bg[1], content=self.bg[2], image_filename=self.bg[3])
 
         self.pipe = None
+        self.pipe_buffer = None
         self.spectrum_configs = self.config_parser.spectrum_configs
         self.indexes = cycle(range(len(self.spectrum_configs)))
         self.seconds = 0 
@@ -290,6 +297,8 @@ class Spectrum(Container, ScreensaverSpectrum):
         
         try:            
             self.pipe = os.open(self.config[PIPE_NAME], os.O_RDONLY | os.O_NONBLOCK)
+            frame_size = self.config[PIPE_SIZE]
+            self.pipe_buffer = bytearray(self.config[PIPE_BUFFER_SIZE] - self.config[PIPE_BUFFER_SIZE] % frame_size)
         except Exception as e:
             logging.debug("Cannot open named pipe: " + self.config[PIPE_NAME])
             logging.debug(e)
@@ -412,19 +421,50 @@ class Spectrum(Container, ScreensaverSpectrum):
             time.sleep(self.config[UPDATE_UI_INTERVAL])
     
     def get_latest_pipe_data(self):
-        """ Read from the named pipe until it's empty """
+        """ Drain the named pipe by one non-blocking read into the preallocated buffer.
+        The buffer size is a multiple of the frame size, so the frames stay aligned.
 
-        data = [0] * self.config[PIPE_SIZE]
-        while True:
-            try:
-                tmp_data = os.read(self.pipe, self.config[PIPE_SIZE])
-                if len(tmp_data) == self.config[PIPE_SIZE]:
-                    data = tmp_data
-                time.sleep(self.config[PIPE_POLLING_INTERVAL])
-            except:
-                break
+        :return: the last complete frame or zeros if there is no complete frame
+        """
+        frame_size = self.config[PIPE_SIZE]
+        try:
+            n = os.readv(self.pipe, [self.pipe_buffer])
+        except BlockingIOError:
+            n = 0
+
+        if n < frame_size:
+            return bytes(frame_size)
+
+        end = n - n % frame_size
+        return bytes(self.pipe_buffer[end - frame_size : end])
 
-        return data
+    def get_bar_heights(self, data, words, unit, step):
+        """ Decode little-endian 32-bit values and round them up to the whole number of steps
+
+        :param data: frame bytes
+        :param words: number of values
+        :param unit: bar height of the value 1
+        :param step: step height
+
+        :return: list of bar heights
+        """
+        if numpy is not None:
+            v = numpy.frombuffer(data, dtype="<u4", count=words) * unit
+            h = numpy.ceil(v / step) * step
+            h[v <= 0] = 0
+            return h.astype(int).tolist()
+
+        heights = []
+        for v in struct.unpack_from("<%dI" % words, data):
+            v = v * unit
+            if v <= 0:
+                steps = 0
+            elif v % step == 0:
+                steps = int(v / step)
+            else:
+                steps = int(v / step) + 1
+            heights.append(steps * step)
+        return heights
 
     def set_values(self):
         """ Get signal from the named pipe and update spectrum bars. """ 
@@ -448,6 +488,7 @@ class Spectrum(Container, ScreensaverSpectrum):
                 data.append((v >> 8) & mask)
                 data.append((v >> 16) & mask)
                 data.append((v >> 24) & mask)
+            data = bytes(data)
         else:
             try:
                 if self.pipe == None:
@@ -474,31 +515,24 @@ class Spectrum(Container, ScreensaverSpectrum):
         except:
             pass
 
-        for m in range(words):
-            v = data[4 * m] + (data[4 * m + 1] << 8) + (data[4 * m + 2] << 16) + (data[4 * m + 3] << 24)
-            v = v * unit
+        heights = self.get_bar_heights(data, words, unit, step)
+        bar_y = int(spectrum_y + origin_y)
+        reflection_y = int(spectrum_y + origin_y + reflection_gap)
 
-            if v <= 0:
-                steps = 0
-            elif v % step == 0:
-                steps = int(v / step)
-            else:
-                steps = int(v / step) + 1
-            
-            h = steps * step
+        for m, h in enumerate(heights):
             i = m + 1
             
             comp = self.components[i]
             comp.bounding_box.h = h
             comp.bounding_box.y = height - h
-            comp.content_y = int(spectrum_y + origin_y - height + comp.bounding_box.y)
+            comp.content_y = bar_y - h
 
             comp = self.components[i + self.config[SIZE]]
             if comp.content == None:
                 continue
             comp.bounding_box.h = h
             comp.bounding_box.y = 0
-            comp.content_y = int(spectrum_y + origin_y + reflection_gap)
+            comp.content_y = reflection_y
 
     def update_ui(self):
         """ Update UI Thread method. """ 
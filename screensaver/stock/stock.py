@@ -25,7 +25,7 @@ from ui.card.card import CHANGE_PERCENT, CHANGE_VALUE, ICON_LABEL, LABEL, Card,
 from ui.container import Container
 from stockutil import StockUtil
 from screensaver.screensaver import Screensaver, PLUGIN_CONFIGURATION
-from util.config import BACKGROUND, SCREEN_BGR_COLOR, STOCK
+from util.config import BACKGROUND, SCREEN_BGR_COLOR, STOCK, SCREENSAVER_BLUR_RADIUS
 from itertools import cycle
 
 TIME_FORMAT = "%H:%M:%S"
@@ -82,7 +82,7 @@ class Stock(Container, Screensaver):
         images = []
         r = random.sample(range(0, bgr_img_num), bgr_img_num)
         bgr = self.util.config[BACKGROUND][SCREEN_BGR_COLOR]
-        br = 4
+        br = SCREENSAVER_BLUR_RADIUS
         for n in r:
             img = self.util.get_background(self.name + "." + str(n), bgr, index=n, blur_radius=br)
             images.append((img[3], img[2]))
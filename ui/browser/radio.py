@@ -115,7 +115,7 @@ class RadioBrowserScreen(MenuScreen):
         s.wrap_labels = self.config[WRAP_LABELS]
         s.fixed_height = font_size
         s.scaled = True
-        self.util.add_icon(s, self.get_scale_factor(s))
+        self.util.add_icon(s, self.get_scale_factor(s), thumbnail=True)
 
         scale = True
         if hasattr(s, "show_label"):
@@ -172,14 +172,14 @@ class Button(Container):
 
     def create_one_line_label(self, state, bb, font, font_size, text, padding):
         state.l_name = text
-        size = font.size(text)
+        size = self.util.get_text_size(font, text)
 
         if getattr(self, "selected", False):
             color = state.text_color_selected
         else:
             color = state.text_color_normal
 
-        label = font.render(text, 1, color)
+        label = self.util.render_text(font, text, color)
         c = Component(self.util, label)
         c.name = state.name + ".label"
         c.text = text
@@ -205,8 +205,8 @@ class Button(Container):
         if second_line:
             second_line = second_line.strip()
 
-        size = font.size(first_line)
-        label = font.render(first_line, 1, state.text_color_normal)
+        size = self.util.get_text_size(font, first_line)
+        label = self.util.render_text(font, first_line, state.text_color_normal)
         c = Component(self.util, label)
         c.name = first_line + ".label"
         c.text = first_line
@@ -226,8 +226,8 @@ class Button(Container):
 
         f_size = font_size - int((font_size / 100) * 20)
         f = self.util.get_font(f_size)
-        s = font.size(second_line)
-        label = f.render(second_line, 1, state.text_color_disabled)
+        s = self.util.get_text_size(font, second_line)
+        label = self.util.render_text(f, second_line, state.text_color_disabled)
         c = Component(self.util, label)
         c.name = second_line + ".label"
         c.text = second_line
@@ -428,12 +428,12 @@ class Button(Container):
         # Selected
         if num == 4:
             font = self.util.get_font(self.components[2].text_size)
-            self.components[2].content = font.render(self.components[2].text, 1, self.components[2].text_color_current)
+            self.components[2].content = self.util.render_text(font, self.components[2].text, self.components[2].text_color_current)
             font = self.util.get_font(self.components[num - 2].text_size)
-            self.components[2].content = font.render(self.components[2].text, 1, self.components[2].text_color_current)
+            self.components[2].content = self.util.render_text(font, self.components[2].text, self.components[2].text_color_current)
         else:
             font = self.util.get_font(self.components[2].text_size)
-            self.components[2].content = font.render(self.state.l_name, 1, self.components[2].text_color_current)
+            self.components[2].content = self.util.render_text(font, self.state.l_name, self.components[2].text_color_current)
                     
     def handle_event(self, event):
         """ Handle button event
@@ -676,8 +676,8 @@ class Button(Container):
         if len(text) < 5:
             return text
         
-        size = font.size(text)
-        ellipses_size = font.size(ELLIPSES)
+        size = self.util.get_text_size(font, text)
+        ellipses_size = self.util.get_text_size(font, ELLIPSES)
         text_width = size[0]
         
         if text_width >= bb.w:
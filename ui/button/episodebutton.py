@@ -57,8 +57,8 @@ class EpisodeButton(Button):
         r = Rect(bb.x, bb.y, bb.w - ((bb.w / 100) * 5), bb.h)
         text = self.truncate_long_labels(state.l_name, r, font)
         state.l_name = text
-        size = font.size(text)
-        label = font.render(text, 1, state.text_color_normal)
+        size = self.util.get_text_size(font, text)
+        label = self.util.render_text(font, text, state.text_color_normal)
         c = Component(self.util, label)
         c.name = state.name + ".label"
         c.text = text
@@ -117,7 +117,7 @@ class EpisodeButton(Button):
         
         for n, line in enumerate(lines[0:3]):
             try:
-                label = font.render(line, 1, state.text_color_normal)
+                label = self.util.render_text(font, line, state.text_color_normal)
             except:
                 continue
             c = Component(self.util, label)
@@ -114,8 +114,8 @@ class MultiLineButton(Button):
         label = state.l_name
         
         text = self.truncate_long_labels(label, bb, font)
-        size = font.size(text)
-        rendered_label = font.render(text, 1, self.text_color_normal)
+        size = self.util.get_text_size(font, text)
+        rendered_label = self.util.render_text(font, text, self.text_color_normal)
         c = Component(self.util, rendered_label)
         c.name = label + ".label"
         c.text = text
@@ -197,5 +197,5 @@ class MultiLineButton(Button):
             else:
                 comp.text_color_current = comp.text_color_normal                          
             font = self.util.get_font(comp.text_size)
-            comp.content = font.render(comp.text, 1, comp.text_color_current)
+            comp.content = self.util.render_text(font, comp.text, comp.text_color_current)
         
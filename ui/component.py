@@ -36,6 +36,8 @@ class Component(object):
         """
         self.screen = None
         self.screen = util.pygame_screen
+        self.compositor = getattr(util, "compositor", None)
+        self.scheduler = getattr(util, "scheduler", None)
         self.content = c
         self.content_x = x
         self.content_y = y
@@ -144,16 +146,22 @@ class Component(object):
                     self.screen.blit(comp, (x, y))
  
     def update(self):
-        """ Update Pygame Screen """
+        """ Update Pygame Screen. If compositor is available the bounding box
+        is marked as dirty and the screen is updated at the end of the frame.
+        """
         
         if not self.visible: return
-        pygame.display.update(self.bounding_box)
+        self.update_rectangle(self.bounding_box)
         
     def update_rectangle(self, r):
         """ Update Pygame Screen """
         
         if not self.visible: return
-        pygame.display.update(r)      
+        compositor = getattr(self, "compositor", None)
+        if compositor != None:
+            compositor.add_rect(r)
+        else:
+            pygame.display.update(r)
         
     def set_visible(self, flag):
         """ Set component visibility 
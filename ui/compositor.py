@@ -0,0 +1,128 @@
+# Copyright 2026 Peppy Player peppy.player@gmail.com
+#
+# This file is part of Peppy Player.
+#
+# Peppy Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Peppy Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
+
+import time
+import pygame
+
+from threading import RLock
+
+class Compositor(object):
+    """ Frame compositor. Components don't update the display themselves, they only mark
+    the dirty rectangles. The main loop flushes all rectangles once per frame.
+    Overlapping rectangles are merged before the update. In full-frame mode the whole
+    display is updated if anything was changed.
+    """
+
+    lock = RLock()
+
+    def __init__(self, full_frame=False):
+        """ Initializer
+
+        :param full_frame: True - update the whole display, False - update dirty rectangles only
+        """
+        self.full_frame = full_frame
+        self.dirty_rects = []
+        self.wakeup = None
+        self.frames = 0
+        self.total_rects = 0
+        self.max_rects = 0
+        self.total_flush_time = 0.0
+        self.max_flush_time = 0.0
+
+    def add_rect(self, r):
+        """ Mark rectangle as dirty
+
+        :param r: rectangle
+        """
+        if r == None:
+            return
+
+        r = pygame.Rect(r)
+        if r.w <= 0 or r.h <= 0:
+            return
+
+        with self.lock:
+            first = not self.dirty_rects
+            self.dirty_rects.append(r)
+
+        if first and self.wakeup != None:
+            self.wakeup()
+
+    def set_wakeup(self, wakeup):
+        """ Set the function which wakes up the main loop when the first dirty rectangle was added
+
+        :param wakeup: wakeup function
+        """
+        self.wakeup = wakeup
+
+    def merge_rects(self, rects):
+        """ Merge overlapping rectangles
+
+        :param rects: list of rectangles
+
+        :return: list of rectangles which don't overlap
+        """
+        merged = []
+        for r in rects:
+            while True:
+                i = r.collidelist(merged)
+                if i == -1:
+                    break
+                r = r.union(merged.pop(i))
+            merged.append(r)
+        return merged
+
+    def flush(self):
+        """ Update display using all dirty rectangles """
+
+        with self.lock:
+            if not self.dirty_rects:
+                return
+            rects = self.dirty_rects
+            self.dirty_rects = []
+
+        start = time.time()
+        if self.full_frame:
+            n = 1
+            pygame.display.update()
+        else:
+            rects = self.merge_rects(rects)
+            n = len(rects)
+            pygame.display.update(rects)
+        flush_time = time.time() - start
+
+        with self.lock:
+            self.frames += 1
+            self.total_rects += n
+            self.max_rects = max(self.max_rects, n)
+            self.total_flush_time += flush_time
+            self.max_flush_time = max(self.max_flush_time, flush_time)
+
+    def get_statistics(self):
+        """ Get compositor statistics
+
+        :return: dictionary with number of flushed frames, average/maximum rectangles per frame and flush time in seconds
+        """
+        with self.lock:
+            frames = self.frames or 1
+            return {
+                "frames": self.frames,
+                "average.rects": self.total_rects / frames,
+                "max.rects": self.max_rects,
+                "average.flush.time": self.total_flush_time / frames,
+                "max.flush.time": self.max_flush_time
+            }
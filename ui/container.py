@@ -15,7 +15,13 @@
 # You should have received a copy of the GNU General Public License
 # along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
 
+import pygame
+
 from ui.component import Component
+from ui.hitindex import HitIndex
+
+MIN_INDEXED_COMPONENTS = 8
+POINTER_EVENTS = [pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION]
 
 class Container(Component):
     """ This container class keeps the list of components and executes group methods on them """
@@ -35,6 +41,8 @@ class Container(Component):
             
         Component.__init__(self, util, c=cnt, bb=bounding_box, bgr=background, v=visible)
         self.components = list()
+        self.hit_index = None
+        self.pointer_targets = []
         if image_filename:
             self.image_filename = image_filename
 
@@ -46,6 +54,7 @@ class Container(Component):
         :param component: component to add
         """
         self.components.append(component)
+        self.hit_index = None
 
     def set_parent_screen(self, scr):
         """ Add parent screen
@@ -65,6 +74,7 @@ class Container(Component):
         if not self.visible: return
 
         Component.draw(self)
+        self.hit_index = None
 
         if self.is_empty(): return
 
@@ -96,7 +106,12 @@ class Container(Component):
         """
         if not self.visible or len(self.components) == 0: return
 
-        for i in range(len(self.components) - 1, -1, -1):
+        if event.type in POINTER_EVENTS and hasattr(event, "pos"):
+            indexes = self.get_pointer_targets(event)
+        else:
+            indexes = range(len(self.components) - 1, -1, -1)
+
+        for i in indexes:
             try:
                 comp = self.components[i]
 
@@ -112,6 +127,57 @@ class Container(Component):
             except:
                 pass
     
+    def get_pointer_targets(self, event):
+        """ Get components which should receive the pointer event. These are the components 
+        under the pointer and the components which received the last MOUSEBUTTONDOWN event, 
+        they get all events until MOUSEBUTTONUP to handle dragging and release outside.
+        
+        :param event: mouse event
+        :return: component indexes in reverse order
+        """
+        n = len(self.components)
+        if n < MIN_INDEXED_COMPONENTS:
+            return range(n - 1, -1, -1)
+
+        indexes = self.get_hit_index().get_indexes(event.pos)
+        targets = getattr(self, "pointer_targets", [])
+
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            self.pointer_targets = [self.components[i] for i in indexes]
+        elif targets:
+            indexes = set(indexes)
+            for i, comp in enumerate(self.components):
+                if comp in targets:
+                    indexes.add(i)
+            indexes = sorted(indexes)
+            if event.type == pygame.MOUSEBUTTONUP:
+                self.pointer_targets = []
+
+        indexes.reverse()
+        return indexes
+
+    def get_hit_index(self):
+        """ Get spatial index of the components. The index is rebuilt if the container was 
+        redrawn, the list of components was changed or any component was moved or resized.
+
+        :return: hit index
+        """
+        index = getattr(self, "hit_index", None)
+        if index == None or not index.is_valid(self.components):
+            index = HitIndex(self.components)
+            self.hit_index = index
+        return index
+
+    def get_components_at(self, pos):
+        """ Get components under the pointer
+
+        :param pos: pointer position
+        :return: list of components
+        """
+        if len(self.components) < MIN_INDEXED_COMPONENTS:
+            return list(self.components)
+        return [self.components[i] for i in self.get_hit_index().get_indexes(pos)]
+
     def set_current(self, state=None):
         """ Set container as current. Used by screens 
         
@@ -125,6 +191,7 @@ class Container(Component):
         :param flag: True - visible, False - invisible
         """
         Component.set_visible(self, flag)
+        self.hit_index = None
         if self.is_empty(): return
 
         for comp in self.components:
@@ -0,0 +1,100 @@
+# Copyright 2026 Peppy Player peppy.player@gmail.com
+#
+# This file is part of Peppy Player.
+#
+# Peppy Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Peppy Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
+
+CELL_SIZE = 64
+
+class HitIndex(object):
+    """ Uniform grid over the bounding boxes of the container components. Used to find
+    the components under the pointer without calling every component. The components
+    without bounding box and the popups are returned for any position. The index keeps
+    the position and size of each bounding box, so it becomes invalid when any component
+    is moved or resized, even if its rectangle was changed in place.
+    """
+
+    def __init__(self, components, cell_size=CELL_SIZE):
+        """ Initializer
+
+        :param components: the list of container components
+        :param cell_size: grid cell size in pixels
+        """
+        self.components = components
+        self.size = len(components)
+        self.cell_size = cell_size
+        self.cells = {}
+        self.rects = {}
+        self.unbounded = []
+        self.boxes = []
+
+        for i, comp in enumerate(components):
+            r = getattr(comp, "bounding_box", None)
+            self.boxes.append((comp, r, tuple(r) if hasattr(r, "collidepoint") else None))
+
+            if not comp or not hasattr(comp, "handle_event"):
+                continue
+
+            if getattr(comp, "popup", None) == True or r == None or not hasattr(r, "collidepoint"):
+                self.unbounded.append(i)
+                continue
+
+            self.rects[i] = r
+            for cell in self.get_cells(r):
+                self.cells.setdefault(cell, []).append(i)
+
+    def get_cells(self, r):
+        """ Get grid cells covered by rectangle
+
+        :param r: rectangle
+
+        :return: list of cell coordinates
+        """
+        x1 = int(r.x // self.cell_size)
+        y1 = int(r.y // self.cell_size)
+        x2 = int((r.x + max(r.w, 1) - 1) // self.cell_size)
+        y2 = int((r.y + max(r.h, 1) - 1) // self.cell_size)
+        return [(x, y) for x in range(x1, x2 + 1) for y in range(y1, y2 + 1)]
+
+    def is_valid(self, components):
+        """ Check that the index was built for the current list of components
+        and their bounding boxes were not moved or resized
+
+        :param components: the list of container components
+
+        :return: True - valid, False - the index should be rebuilt
+        """
+        if components is not self.components or len(components) != self.size:
+            return False
+
+        for comp, (c, r, t) in zip(components, self.boxes):
+            if comp is not c:
+                return False
+            bb = getattr(comp, "bounding_box", None)
+            if bb is not r or (t != None and bb != t):
+                return False
+        return True
+
+    def get_indexes(self, pos):
+        """ Get indexes of the components which can handle the event at the position
+
+        :param pos: pointer position
+
+        :return: sorted list of component indexes
+        """
+        cell = (int(pos[0] // self.cell_size), int(pos[1] // self.cell_size))
+        indexes = [i for i in self.cells.get(cell, []) if self.rects[i].collidepoint(pos)]
+        indexes.extend(self.unbounded)
+        indexes.sort()
+        return indexes
@@ -418,7 +418,30 @@ class FileMenu(Menu):
 
         :param page: page items
         """
-        self.util.image_util.add_file_icon(page, self.icon_box, self.icon_box_without_label)
+        self.util.image_util.add_file_icon(page, self.icon_box, self.icon_box_without_label, self.update_file_icon)
+
+    def update_file_icon(self, state):
+        """ Update the icon of the file button. Called by the main loop when the embedded image
+        was loaded in the background.
+
+        :param state: file state with the new icon
+        """
+        b = self.get_button_by_filename(state.file_name)
+        if b == None or b.state is not state or b.components[1] == None:
+            return
+
+        b.set_icon()
+        c = b.components[1]
+        if isinstance(c.content, tuple):
+            size = c.content[1].get_size()
+        else:
+            size = c.content.get_size()
+        bb = b.layout.get_image_rectangle()
+        c.content_x = bb.x + (bb.width - size[0]) / 2
+        c.content_y = bb.y + (bb.height - size[1]) / 2
+
+        if self.visible:
+            b.clean_draw_update()
 
     def switch_to_next_page(self, state):
         """ Switch to the next page
@@ -245,7 +245,7 @@ class Menu(Container):
                     icon_max_width = max(w, icon_max_width)
             
         font = self.util.get_font(font_size)
-        label_size = font.size(longest_string)
+        label_size = self.util.get_text_size(font, longest_string)
 
         if label_size[0] >= b.bounding_box.w:
             final_size = (b.bounding_box.w, label_size[1])
@@ -638,9 +638,10 @@ class Menu(Container):
             self.select_by_index(clicked_button.state.index)
 
     def get_clicked_menu_button(self, x, y):
-        for button in self.buttons.values():
-            if button.bounding_box.collidepoint((x, y)):
-                return button
+        buttons = self.buttons.values()
+        for comp in self.get_components_at((x, y)):
+            if comp in buttons and comp.bounding_box.collidepoint((x, y)):
+                return comp
         return None
 
     def add_button_observers(self):
@@ -48,7 +48,7 @@ class BookPlayer(FilePlayerScreen):
 
         self.current_playlist = None        
         self.parser = site_parser
-        self.cache = Cache(self.util)
+        self.cache = Cache(self.util, "book.image")
         self.current_book_state = None
         self.current_track_index = 0        
         self.playlist = self.get_playlist()
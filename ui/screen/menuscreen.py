@@ -61,7 +61,7 @@ class MenuScreen(Screen):
         self.page_in_title = page_in_title
         self.show_loading = show_loading
         
-        self.cache = Cache(self.util)
+        self.cache = Cache(self.util, "menu.image")
         self.layout = BorderLayout(self.bounding_box)
         self.layout.set_percent_constraints(PERCENT_TOP_HEIGHT, PERCENT_BOTTOM_HEIGHT, 0, 0)              
         Screen.__init__(self, util, "", PERCENT_TOP_HEIGHT, voice_assistant, "menu_screen_screen_title", True, self.layout.TOP)
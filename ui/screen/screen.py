@@ -254,6 +254,7 @@ class Screen(Container):
             self.menu.buttons = {}
             self.menu.components = []
         self.clean_draw_update()
+        self.util.compositor.flush()
         self.notify_loading_listeners()
 
     def reset_loading(self):
@@ -288,7 +289,7 @@ class Screen(Container):
         if event.type in mouse_events and getattr(self, "menu", None) and getattr(self, "navigator", None):
             event_component = None
 
-            for comp in self.menu.components:
+            for comp in self.menu.get_components_at(event.pos):
                 if getattr(comp, "state", None):
                     bb = comp.state.bounding_box
                 else:
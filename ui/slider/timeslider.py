@@ -106,12 +106,16 @@ class TimeSlider(Container):
         self.timer_started = True
         self.thread = Thread(target = self.start_loop)
         self.thread.start()
+        if self.scheduler != None:
+            self.scheduler.start_animation(self, self.LOOP_CYCLES_PER_SECOND)
         
     def stop_timer(self):  
         """ Stop timer thread """
 
         logging.debug("stop timer")
         self.timer_started = False
+        if self.scheduler != None:
+            self.scheduler.stop_animation(self)
         
     def set_track_info(self, track_info):
         """ Set track time info
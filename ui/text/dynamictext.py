@@ -91,15 +91,17 @@ class DynamicText(OutputText):
             return
         
         self.animate = False
+        if self.scheduler != None:
+            self.scheduler.stop_animation(self)
         font = self.util.get_font(self.default_font_size)                    
-        size = font.size(text)        
+        size = self.util.get_text_size(font, text)        
         self.components = []
         self.add_bgr()                
          
         if (size[0] + MARGIN) > self.w:
             font_size = int(self.default_font_size * PERCENT_SMALL_FONT)
             font = self.util.get_font(font_size)        
-            size = font.size(text)
+            size = self.util.get_text_size(font, text)
   
             if (size[0] + MARGIN) > self.w:
                 font_size = font_size - 2
@@ -110,14 +112,14 @@ class DynamicText(OutputText):
                     self.start_animation(text)
                     return
                                   
-                size_0 = font.size(items[0])
-                size_1 = font.size(items[1])
+                size_0 = self.util.get_text_size(font, items[0])
+                size_1 = self.util.get_text_size(font, items[1])
                   
                 if ((size_0[0] + MARGIN) > self.w) or ((size_1[0] + MARGIN) > self.w):
                     self.start_animation(text)
                     return
                   
-                label = font.render(items[0], 1, self.fgr)
+                label = self.util.render_text(font, items[0], self.fgr)
                 x = self.bounding_box.x + self.get_x(size_0)
                 
                 gap = (self.bounding_box.h - (font_size * 2)) / 3
@@ -125,19 +127,19 @@ class DynamicText(OutputText):
                 if self.w > 480:
                     y -= 2
                 self.add_label(1, label, x, y, items[0], font_size, STATIC)
-                label = font.render(items[1], 1, self.fgr)
+                label = self.util.render_text(font, items[1], self.fgr)
                   
                 x = self.bounding_box.x + self.get_x(size_1)
                 
                 y = y + font_size + 3
                 self.add_label(2, label, x, y, items[1], font_size, STATIC)
             else:
-                label = font.render(text, 1, self.fgr)
+                label = self.util.render_text(font, text, self.fgr)
                 x = self.bounding_box.x + self.get_x(size)
                 y = self.bounding_box.y + self.get_y(size) + 2
                 self.add_label(1, label, x, y, text, font_size, STATIC)
         else:
-            label = font.render(text, 1, self.fgr)
+            label = self.util.render_text(font, text, self.fgr)
             x = self.bounding_box.x + self.get_x(size)
             y = self.bounding_box.y + self.get_y(size) + 1
             self.add_label(1, label, x, y, text, self.default_font_size, STATIC)
@@ -150,8 +152,8 @@ class DynamicText(OutputText):
         :param text: text to animate
         """
         font = self.util.get_font(self.default_font_size)
-        label = font.render(text, 1, self.fgr)
-        size = font.size(text)
+        label = self.util.render_text(font, text, self.fgr)
+        size = self.util.get_text_size(font, text)
         y = ((self.bounding_box.h - size[1]) / 2) + 2
         self.add_label(1, label, 0, y, text, self.default_font_size, ANIMATED, size[0])
         self.add_label(2, None, 0, y, text, self.default_font_size, ANIMATED, size[0])
@@ -160,6 +162,8 @@ class DynamicText(OutputText):
         self.clean_draw_update()
         self.comp1 = self.components[1]
         self.comp2 = self.components[2]
+        if self.scheduler != None:
+            self.scheduler.start_animation(self)
 
     def refresh(self):
         """ Animation method """
@@ -220,5 +224,7 @@ class DynamicText(OutputText):
         """ Stop animation (if any) """
         
         self.animate = False
+        if self.scheduler != None:
+            self.scheduler.stop_animation(self)
 
     
\ No newline at end of file
@@ -108,8 +108,8 @@ class OutputText(Container):
         if self.font == None:
             return
 
-        size = self.font.size(text)
-        label = self.font.render(text, 1, self.fgr)
+        size = self.util.get_text_size(self.font, text)
+        label = self.util.render_text(self.font, text, self.fgr)
         comp = Component(self.util, label)
         comp.name = self.name + ".text"
         comp.content_x = self.bounding_box.x + self.get_x(size)
@@ -15,7 +15,6 @@
 # You should have received a copy of the GNU General Public License
 # along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
 
-from subprocess import Popen
 from util.config import VOLUME_CONTROL, AMIXER_CONTROL, AMIXER_SCALE, LINUX_PLATFORM, \
     AMIXER_SCALE_LINEAR, AMIXER_SCALE_LOGARITHM
 
@@ -28,20 +27,15 @@ class AmixerUtil(object):
         :param util: utility object
         """
         self.config = util.config
+        self.mixer_service = util.mixer_service
         self.AMIXER_CONTROL = self.config[VOLUME_CONTROL][AMIXER_CONTROL]
         self.AMIXER_SCALE = self.config[VOLUME_CONTROL][AMIXER_SCALE]
 
     def set_volume(self, level):
-        """ Set volume level 
+        """ Set volume level. The command is sent by the mixer service, 
+        so the fast volume changes are coalesced.
         
         :param level: volume level 0-100
         """
-        if self.AMIXER_SCALE == AMIXER_SCALE_LINEAR:
-            command = "amixer sset {ctrl} {vol}% -M".format(ctrl=self.AMIXER_CONTROL, vol=level)
-        elif self.AMIXER_SCALE == AMIXER_SCALE_LOGARITHM:
-            command = "amixer sset {ctrl} {vol}%".format(ctrl=self.AMIXER_CONTROL, vol=level)
-        
-        try:
-            Popen(command.split(), shell=False)
-        except:
-            pass
+        mapped = self.AMIXER_SCALE == AMIXER_SCALE_LINEAR
+        self.mixer_service.set_volume(self.AMIXER_CONTROL, level, mapped)
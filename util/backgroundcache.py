@@ -0,0 +1,207 @@
+# Copyright 2026 Peppy Player peppy.player@gmail.com
+#
+# This file is part of Peppy Player.
+#
+# Peppy Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Peppy Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import sys
+import json
+import logging
+import pygame
+
+from threading import Thread
+from subprocess import Popen, PIPE
+from PIL import Image, ImageFilter
+from util.thumbnailcache import ThumbnailCache, THUMBNAIL_HEADER, MEGABYTE, EVICTION_RATIO
+
+BYTES_PER_PIXEL = 4
+
+class BackgroundCache(object):
+    """ Disk cache of the prepared screen backgrounds. Each variant of the background
+    (definition, blur radius, screen size) is scaled, blurred and painted once and saved
+    as raw pixels in the thumbnail format. All variants can be prepared in advance
+    by the separate low priority process, so the UI thread only loads ready surfaces.
+    """
+
+    def __init__(self, folder, max_size):
+        """ Initializer
+
+        :param folder: cache folder
+        :param max_size: cache size limit in megabytes
+        """
+        self.folder = folder
+        self.max_size = max_size
+        self.cache = ThumbnailCache(folder, max_size)
+
+    def get_image(self, path, size, blur_radius, overlay, overlay_opacity):
+        """ Get prepared background from the cache
+
+        :param path: background image path
+        :param size: screen size
+        :param blur_radius: blur radius
+        :param overlay: overlay color
+        :param overlay_opacity: overlay opacity
+
+        :return: background surface or None if not in cache
+        """
+        variant = get_variant(blur_radius, overlay, overlay_opacity)
+        image = self.cache.get_image(path, size, variant)
+        if image == None:
+            return None
+
+        try:
+            return image.convert()
+        except Exception:
+            return image
+
+    def cache_image(self, image, path, size, blur_radius, overlay, overlay_opacity):
+        """ Save prepared background in the cache
+
+        :param image: background surface
+        :param path: background image path
+        :param size: screen size
+        :param blur_radius: blur radius
+        :param overlay: overlay color
+        :param overlay_opacity: overlay opacity
+        """
+        variant = get_variant(blur_radius, overlay, overlay_opacity)
+        self.cache.cache_image(image, path, size, variant)
+
+    def start_prebuild(self, jobs):
+        """ Start the process which prepares all background variants missing in the cache.
+        Only the variants which fit into the cache are prepared, otherwise the process
+        would evict its own output and prepare it again on each start.
+
+        :param jobs: list of tuples (path, size, blur radius, overlay color, overlay opacity)
+        """
+        jobs = self.get_fitting_jobs(jobs)
+        if not jobs:
+            return
+
+        try:
+            p = Popen([sys.executable, "-m", "util.backgroundcache"], stdin=PIPE, shell=False)
+            data = {"folder": self.folder, "size": self.max_size, "jobs": jobs}
+            p.stdin.write(json.dumps(data).encode("utf-8"))
+            p.stdin.close()
+            Thread(target=p.wait, daemon=True).start()
+        except Exception as e:
+            logging.debug(e)
+
+    def get_fitting_jobs(self, jobs):
+        """ Get the jobs which fit into the cache size limit
+
+        :param jobs: list of tuples (path, size, blur radius, overlay color, overlay opacity)
+
+        :return: list of jobs
+        """
+        budget = self.max_size * MEGABYTE * EVICTION_RATIO
+        result = []
+        total = 0
+        for job in jobs:
+            w, h = job[1]
+            total += THUMBNAIL_HEADER.size + w * h * BYTES_PER_PIXEL
+            if total > budget:
+                logging.debug(f"""Background cache is too small, {len(jobs) - len(result)} variants are not prepared""")
+                break
+            result.append(job)
+        return result
+
+def get_variant(blur_radius, overlay, overlay_opacity):
+    """ Get variant key
+
+    :param blur_radius: blur radius
+    :param overlay: overlay color
+    :param overlay_opacity: overlay opacity
+
+    :return: variant string
+    """
+    if overlay:
+        overlay = tuple(overlay)
+    return f"""background|{blur_radius}|{overlay}|{overlay_opacity}"""
+
+def build_background(path, size, blur_radius, overlay, overlay_opacity):
+    """ Prepare background. The image is scaled to cover the screen, blurred and painted by overlay color.
+
+    :param path: background image path
+    :param size: screen size
+    :param blur_radius: blur radius
+    :param overlay: overlay color
+    :param overlay_opacity: overlay opacity
+
+    :return: background surface or None if image cannot be loaded
+    """
+    try:
+        img = Image.open(path).convert("RGBA")
+    except Exception as e:
+        logging.debug(e)
+        return None
+
+    w, h = size
+    width, height = img.size
+    if width != w or height != h:
+        ratio = min(width / w, height / h)
+        img = img.resize((int(width / ratio), int(height / ratio)))
+
+    if blur_radius and blur_radius > 0:
+        img = img.filter(ImageFilter.GaussianBlur(blur_radius))
+
+    image = pygame.image.fromstring(img.tobytes(), img.size, "RGBA")
+    return paint_background(image, overlay, overlay_opacity)
+
+def paint_background(image, overlay, overlay_opacity):
+    """ Paint surface by overlay color
+
+    :param image: surface to paint
+    :param overlay: overlay color
+    :param overlay_opacity: overlay opacity
+
+    :return: new painted surface
+    """
+    result = pygame.Surface(image.get_size())
+    result.fill((0, 0, 0), None, pygame.BLEND_RGB_ADD)
+
+    if overlay:
+        image.fill(overlay, None, pygame.BLEND_RGBA_ADD)
+        image.fill((255, 255, 255, overlay_opacity), None, pygame.BLEND_RGBA_MULT)
+
+    result.blit(image, (0, 0))
+    return result
+
+def prebuild(folder, max_size, jobs):
+    """ Prepare all background variants missing in the cache
+
+    :param folder: cache folder
+    :param max_size: cache size limit in megabytes
+    :param jobs: list of tuples (path, size, blur radius, overlay color, overlay opacity)
+    """
+    cache = ThumbnailCache(folder, max_size)
+    for path, size, blur_radius, overlay, overlay_opacity in jobs:
+        variant = get_variant(blur_radius, overlay, overlay_opacity)
+        key = cache.get_key(path, size, variant)
+        if not key or os.path.isfile(cache.get_thumbnail_path(key)):
+            continue
+        image = build_background(path, size, blur_radius, overlay, overlay_opacity)
+        cache.cache_image(image, path, size, variant)
+
+if __name__ == "__main__":
+    """ Worker process started by BackgroundCache.start_prebuild """
+
+    try:
+        os.nice(10)
+    except Exception:
+        pass
+
+    data = json.loads(sys.stdin.read())
+    prebuild(data["folder"], data["size"], data["jobs"])
@@ -22,14 +22,14 @@ class Cache(object):
     
     lock = RLock()
     
-    def __init__(self, util):
+    def __init__(self, util, namespace):
         """ Initializer 
         
         :param util: utility object 
+        :param namespace: memory cache namespace
         """
         self.util = util
-        self.cached_images_hashes = []
-        self.image_cache = {}
+        self.image_cache = util.memory_cache.get_namespace(namespace)
     
     def get_image(self, url):
         """ Get image from cache by specified url 
@@ -38,10 +38,7 @@ class Cache(object):
         :return: image if in cache, None if not in cache
         """
         with self.lock:
-            try:
-                return self.image_cache[url]
-            except:
-                return None
+            return self.image_cache.get(url)
         
     def cache_image(self, img, url):
         """ Save image in cache 
@@ -50,10 +47,7 @@ class Cache(object):
         :param url: image url 
         """
         with self.lock:
-            new_url = url.encode("utf-8")
-            h = self.util.get_hash(new_url)
-            if h in self.cached_images_hashes:
+            if url in self.image_cache:
                 return
             self.image_cache[url] = img
-            self.cached_images_hashes.append(h)
             
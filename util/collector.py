@@ -22,6 +22,7 @@ import sqlite3
 import time
 import operator
 
+from concurrent.futures import ProcessPoolExecutor
 from timeit import default_timer as timer
 from datetime import timedelta
 from mutagen import File
@@ -31,6 +32,7 @@ from mutagen.mp4 import MP4
 
 DEFAULT_TABLE_NAME = "metadata"
 DEFAULT_SUMMARY_TABLE_NAME = "summary"
+DEFAULT_FOLDERS_TABLE_NAME = "folders"
 FOLDER = "folder"
 FILENAME = "filename"
 TYPE = "type"
@@ -43,12 +45,20 @@ TITLE = "title"
 DATE = "date"
 BASEFOLDER = "basefolder"
 ORIGINOS = "originos"
+MTIME = "mtime"
+SIZE = "size"
 EXTENSIONS = (".aac", ".ac3", ".aiff", ".ape", ".flac", ".m4a", ".mp3", ".ogg", ".opus", ".wav", ".wma", ".wv")
 METADATA = [GENRE, ALBUM, COMPOSER, ARTIST, PERFORMER, TITLE, DATE]
 MP4_METADATA = ["\xa9gen", "\xa9alb", "\xa9wrt", "\xa9ART", "aART", "\xa9nam", "\xa9day"]
 INFO = ["sample_rate", "channels", "bits_per_sample", "length", "bitrate"]
+FILE_INFO = [MTIME, SIZE]
 ALL_METADATA = [FOLDER, FILENAME, TYPE]
-ALL_METADATA.extend(METADATA + INFO)
+ALL_METADATA.extend(METADATA + INFO + FILE_INFO)
+COLUMN_TYPES = {MTIME: "real", SIZE: "integer"}
+FOLDER_FILENAME_INDEX = "metadata_folder_filename"
+INDEXED_COLUMNS = [GENRE, ARTIST, COMPOSER, ALBUM, TITLE, DATE, TYPE, FILENAME]
+SEARCH_COLUMNS = [GENRE, ARTIST, ALBUM, COMPOSER, TITLE, FOLDER, FILENAME]
+FTS_SUFFIX = "_fts"
 SUMMARY = [BASEFOLDER, ORIGINOS, GENRE, ARTIST, COMPOSER, ALBUM, TITLE, DATE, TYPE, FOLDER, FILENAME]
 
 # Collector constants
@@ -80,7 +90,13 @@ FILE_BATCH_SIZE = 50
 FULL_BLOCK_CHARACTER = chr(9608)
 ADDED_PREFIX = "Added:"
 ADDED_SUFFIX = "file"
+UPDATED_PREFIX = "Updated:"
+DELETED_PREFIX = "Deleted:"
 UPDATE_TIME = "Update time (h:mm:ss):"
+UPDATED_FILES = "updated files"
+DELETED_FILES = "deleted files"
+SYNC_BATCH_SIZE = 10000
+PARSE_CHUNK_SIZE = 32
 
 class DbUtil(object):
     """ Database utility class. Keeps the connection to the database and provides utility SQL functions. """
@@ -93,24 +109,48 @@ class DbUtil(object):
         self.db_path = db_filename
         self.table_name = DEFAULT_TABLE_NAME
         self.summary_table_name = DEFAULT_SUMMARY_TABLE_NAME
+        self.folders_table_name = DEFAULT_FOLDERS_TABLE_NAME
         self.metadata_keys = METADATA
         self.info_keys = INFO
 
-        csv = ",".join([m + " text" for m in ALL_METADATA])
+        csv = ",".join([m + " " + COLUMN_TYPES.get(m, "text") for m in ALL_METADATA])
         self.CREATE_METADATA_TABLE = f"""CREATE TABLE IF NOT EXISTS {self.table_name} (id integer PRIMARY KEY,{csv});"""
 
         csv = ",".join([m + " text" for m in SUMMARY])
         self.CREATE_SUMMARY_TABLE = f"""CREATE TABLE IF NOT EXISTS {self.summary_table_name} ({csv});"""
 
+        self.CREATE_FOLDERS_TABLE = f"""CREATE TABLE IF NOT EXISTS {self.folders_table_name} ({FOLDER} text PRIMARY KEY,{MTIME} real);"""
+        self.CREATE_FOLDER_FILENAME_INDEX = f"""CREATE UNIQUE INDEX IF NOT EXISTS {FOLDER_FILENAME_INDEX} ON {self.table_name}({FOLDER},{FILENAME});"""
+
         csv = ",".join([m for m in ALL_METADATA])
         values = ",".join(["?" for _ in ALL_METADATA])
         self.INSERT_DATA = f"""INSERT INTO {self.table_name}({csv}) VALUES({values});"""
 
+        updates = ",".join([m + "=excluded." + m for m in ALL_METADATA[2:]])
+        self.UPSERT_DATA = f"""INSERT INTO {self.table_name}({csv}) VALUES({values}) ON CONFLICT({FOLDER},{FILENAME}) DO UPDATE SET {updates};"""
+        self.DELETE_DATA = f"""DELETE FROM {self.table_name} WHERE {FOLDER} = ? AND {FILENAME} = ?;"""
+
         csv = ",".join([m for m in SUMMARY])
         values = ",".join(["?" for _ in SUMMARY])
         self.INSERT_SUMMARY_DATA = f"""INSERT INTO {self.summary_table_name}({csv}) VALUES({values});"""
 
+        self.INSERT_FOLDER_DATA = f"""INSERT INTO {self.folders_table_name}({FOLDER},{MTIME}) VALUES(?,?);"""
+
+        self.fts_table_name = self.table_name + FTS_SUFFIX
+        csv = ",".join(SEARCH_COLUMNS)
+        self.CREATE_FTS_TABLE = f"""CREATE VIRTUAL TABLE IF NOT EXISTS {self.fts_table_name} USING fts5({csv}, content='{self.table_name}', content_rowid='id', tokenize='trigram');"""
+        new_values = ",".join(["new." + m for m in SEARCH_COLUMNS])
+        old_values = ",".join(["old." + m for m in SEARCH_COLUMNS])
+        insert = f"""INSERT INTO {self.fts_table_name}(rowid,{csv}) VALUES(new.id,{new_values});"""
+        delete = f"""INSERT INTO {self.fts_table_name}({self.fts_table_name},rowid,{csv}) VALUES('delete',old.id,{old_values});"""
+        self.CREATE_FTS_TRIGGERS = [
+            f"""CREATE TRIGGER IF NOT EXISTS {self.table_name}_ai AFTER INSERT ON {self.table_name} BEGIN {insert} END;""",
+            f"""CREATE TRIGGER IF NOT EXISTS {self.table_name}_ad AFTER DELETE ON {self.table_name} BEGIN {delete} END;""",
+            f"""CREATE TRIGGER IF NOT EXISTS {self.table_name}_au AFTER UPDATE ON {self.table_name} BEGIN {delete} {insert} END;"""
+        ]
+
         self.conn = None
+        self.write_version = 0
 
     def is_db_file_available(self):
         """ Check that the database file exists
@@ -146,9 +186,69 @@ class DbUtil(object):
                 self.run_command(self.CREATE_METADATA_TABLE)
                 self.run_command(self.CREATE_SUMMARY_TABLE)
                 logging.debug("Created collection tables")
+            self.upgrade_tables()
         except Exception as e:
             logging.debug(e)
 
+    def upgrade_tables(self):
+        """ Add the file info columns, the folders table and the unique (folder, filename) index
+        to the database created by the previous versions of the collector
+        """
+        columns = self.run_query(f"""PRAGMA table_info({self.table_name})""")
+        if columns == None:
+            return
+
+        names = [c[1] for c in columns]
+        for m in FILE_INFO:
+            if m not in names:
+                self.run_command(f"""ALTER TABLE {self.table_name} ADD COLUMN {m} {COLUMN_TYPES[m]}""")
+                logging.debug(f"""Added column {m}""")
+
+        self.run_command(self.CREATE_FOLDERS_TABLE)
+
+        query = f"""SELECT name FROM sqlite_master WHERE type='index' AND name='{FOLDER_FILENAME_INDEX}';"""
+        if not self.run_query(query):
+            self.run_command(f"""
+                DELETE FROM {self.table_name}
+                WHERE id NOT IN (SELECT MIN(id) FROM {self.table_name} GROUP BY {FOLDER}, {FILENAME})
+            """)
+            self.run_command(self.CREATE_FOLDER_FILENAME_INDEX)
+            logging.debug("Created folder/filename index")
+
+        self.create_search_tables()
+
+    def create_search_tables(self):
+        """ Create the indexes for the topic columns and the full-text search table.
+        The folder column is covered by the unique (folder, filename) index.
+        The full-text search table is kept in sync with the metadata table by the triggers.
+        """
+        for c in INDEXED_COLUMNS:
+            self.run_command(f"""CREATE INDEX IF NOT EXISTS {self.table_name}_{c} ON {self.table_name}({c});""")
+
+        if self.is_fts_available():
+            return
+
+        self.run_command(self.CREATE_FTS_TABLE)
+        if not self.is_fts_available():
+            logging.debug("Full-text search is not supported by SQLite library")
+            return
+
+        for t in self.CREATE_FTS_TRIGGERS:
+            self.run_command(t)
+        self.run_command(f"""INSERT INTO {self.fts_table_name}({self.fts_table_name}) VALUES('rebuild');""")
+        logging.debug("Created full-text search table")
+
+    def is_fts_available(self):
+        """ Check if full-text search table exists
+
+        :return: True - table exists, False - table doesn't exist
+        """
+        query = f"""SELECT name FROM sqlite_master WHERE type='table' AND name='{self.fts_table_name}';"""
+        if self.run_query(query):
+            return True
+        else:
+            return False
+
     def disconnect(self):
         """ Disconnect from the collection database """
 
@@ -168,6 +268,7 @@ class DbUtil(object):
             else:
                 self.conn.execute(command)
             self.conn.commit()
+            self.write_version += 1
         except Exception as e:
             self.conn.execute("rollback")
             logging.debug(e)
@@ -181,9 +282,67 @@ class DbUtil(object):
             self.conn.execute("begin")
             self.conn.executemany(self.INSERT_DATA, params)
             self.conn.commit()
+            self.write_version += 1
+        except Exception as e:
+            self.conn.execute("rollback")
+            logging.debug(e)
+
+    def run_batch_sync(self, upserts, deletes, folders=None):
+        """ Insert or update modified files, delete missing files and replace folders
+        modification times in one transaction. Rollback if exception.
+
+        :param upserts: list of values for inserts/updates
+        :param deletes: list of (folder, filename) tuples for deletes
+        :param folders: list of (folder, mtime) tuples, None - don't change folders table
+
+        :return: True - success, False - transaction was rolled back
+        """
+        try:
+            self.conn.execute("begin")
+            if upserts:
+                self.conn.executemany(self.UPSERT_DATA, upserts)
+            if deletes:
+                self.conn.executemany(self.DELETE_DATA, deletes)
+            if folders != None:
+                self.conn.execute(f"""DELETE FROM {self.folders_table_name}""")
+                self.conn.executemany(self.INSERT_FOLDER_DATA, folders)
+            self.conn.commit()
+            self.write_version += 1
+            return True
         except Exception as e:
             self.conn.execute("rollback")
             logging.debug(e)
+            return False
+
+    def get_files_info(self):
+        """ Get modification time and size of all files in the collection
+
+        :return: dictionary with (folder, filename) keys and (mtime, size) values
+        """
+        r = self.run_query(f"""SELECT {FOLDER}, {FILENAME}, {MTIME}, {SIZE} FROM {self.table_name}""")
+        if not r:
+            return {}
+        return {(n[0], n[1]): (n[2], n[3]) for n in r}
+
+    def get_folders_info(self):
+        """ Get modification time of all folders in the collection
+
+        :return: dictionary with folder keys and mtime values
+        """
+        r = self.run_query(f"""SELECT {FOLDER}, {MTIME} FROM {self.folders_table_name}""")
+        if not r:
+            return {}
+        return {n[0]: n[1] for n in r}
+
+    def get_data_version(self):
+        """ Get database version. The version changes after each commit of this or any other connection.
+
+        :return: tuple (SQLite data version, number of commits of this connection)
+        """
+        r = self.run_query("PRAGMA data_version")
+        if r:
+            return (r[0][0], self.write_version)
+        return (None, self.write_version)
 
     def run_query(self, query):
         """ Run SELECT query
@@ -267,8 +426,13 @@ class DbUtil(object):
         self.run_command(command)
         command = f"""DROP TABLE IF EXISTS {self.summary_table_name}"""
         self.run_command(command)
+        command = f"""DROP TABLE IF EXISTS {self.folders_table_name}"""
+        self.run_command(command)
+        command = f"""DROP TABLE IF EXISTS {self.fts_table_name}"""
+        self.run_command(command)
         self.run_command(self.CREATE_METADATA_TABLE)
         self.run_command(self.CREATE_SUMMARY_TABLE)
+        self.upgrade_tables()
         logging.debug("Collection deleted")
 
     def delete_summary_data(self):
@@ -365,13 +529,15 @@ class Collector(object):
 
         return collection_stats
 
-    def get_file_metadata(self, folder, filename, ext, meta):
+    def get_file_metadata(self, folder, filename, ext, meta, mtime=None, size=None):
         """ Prepare audio file metadata
 
         :param folder: file folder
         :param filename: file name
         :param ext: file extension
         :param meta: file metadata from mutagen
+        :param mtime: file modification time
+        :param size: file size in bytes
 
         :return: file metadata list of values for insert
         """
@@ -385,8 +551,9 @@ class Collector(object):
         metadata.append(ext)
 
         if meta == None:
-            for _ in range(len(ALL_METADATA) - len(metadata)):
+            for _ in range(len(ALL_METADATA) - len(metadata) - len(FILE_INFO)):
                 metadata.append(None)
+            metadata.extend([mtime, size])
             return metadata
 
         if filename.lower().endswith(".mp4") or filename.lower().endswith(".m4a"):
@@ -408,6 +575,8 @@ class Collector(object):
             for _ in INFO:
                 metadata.append(None)
 
+        metadata.extend([mtime, size])
+
         return metadata
 
     def collect_metadata(self, base_folder, total_folders, metadata_callback=None, progress_callback=None):
@@ -442,8 +611,12 @@ class Collector(object):
                 ext = file[file.rfind('.') + 1:]
                 ext = ext.lower()
                 meta = None
+                mtime = size = None
                 try:
                     p = os.path.join(current_folder, file)
+                    st = os.stat(p)
+                    mtime = st.st_mtime
+                    size = st.st_size
                     if ext == "mp4" or ext == "m4a":
                         meta = MP4(p)
                     else:
@@ -454,10 +627,10 @@ class Collector(object):
 
                 meta_folder = current_folder[len(base_folder):]
                 if meta:
-                    m = self.get_file_metadata(meta_folder, file, ext, meta)
+                    m = self.get_file_metadata(meta_folder, file, ext, meta, mtime, size)
                     metadata.append(m)
                 else:
-                    metadata.append(self.get_file_metadata(meta_folder, file, ext, None))
+                    metadata.append(self.get_file_metadata(meta_folder, file, ext, None, mtime, size))
 
                 num += 1
                 total_files += 1
@@ -575,15 +748,19 @@ class Collector(object):
                 ext = ext.lower()
                 meta = None
 
-                folder = current_folder[len(base_folder):]
+                folder = current_folder[len(base_folder):] or os.sep
                 filename = file
 
                 result = self.dbutil.run_parameterized_query(query, (folder, filename))
                 if result and int(result[0][0]) == 1:
                     continue
 
+                mtime = size = None
                 try:
                     p = os.path.join(current_folder, file)
+                    st = os.stat(p)
+                    mtime = st.st_mtime
+                    size = st.st_size
                     if ext == "mp4" or ext == "m4a":
                         meta = MP4(p)
                     else:
@@ -593,10 +770,10 @@ class Collector(object):
                     errors.append(msg)
 
                 if meta:
-                    m = self.get_file_metadata(folder, file, ext, meta)
+                    m = self.get_file_metadata(folder, file, ext, meta, mtime, size)
                     metadata.append(m)
                 else:
-                    metadata.append(self.get_file_metadata(folder, file, ext, None))
+                    metadata.append(self.get_file_metadata(folder, file, ext, None, mtime, size))
 
                 num += 1
 
@@ -628,6 +805,128 @@ class Collector(object):
 
         return stats
 
+    def sync_collection(self, base_folder, total_folders, progress_callback=None, workers=None, check_files=False):
+        """ Synchronize the database with the base folder. All folders are scanned, the modification
+        time and size of each file are compared with the database, so the files changed in place are found
+        even if their folder wasn't modified. Only new and changed files are parsed in the pool of processes.
+        New and modified files are inserted or updated, the files which don't exist anymore are deleted
+        from the database.
+
+        :param base_folder: collection base folder
+        :param total_folders: total number of the subfolders in the base folder
+        :param progress_callback: callback for reporting progress
+        :param workers: number of parsing processes, None - number of CPUs
+        :param check_files: True - parse all files even if their modification time and size were not changed
+
+        :return: dictionary with collection database statistics
+        """
+        if not base_folder:
+            base_folder = os.getcwd()
+        elif not os.path.isdir(base_folder):
+            logging.debug(f"""Folder {base_folder} not found""")
+            return None
+
+        errors = []
+        start = timer()
+
+        known_files = self.dbutil.get_files_info()
+        known_folders = self.dbutil.get_folders_info()
+        logging.debug(f"""Files in database: {len(known_files)}, folders: {len(known_folders)}""")
+
+        found_files = set()
+        unchanged_folders = set()
+        visited_folders = set()
+        folders = []
+        tasks = []
+        scanned_folders = 0
+        stack = [base_folder]
+
+        while stack:
+            current_folder = stack.pop()
+            folder = current_folder[len(base_folder):] or os.sep
+            try:
+                st = os.stat(current_folder)
+                if (st.st_dev, st.st_ino) in visited_folders:
+                    continue
+                visited_folders.add((st.st_dev, st.st_ino))
+                folder_mtime = st.st_mtime
+                entries = list(os.scandir(current_folder))
+            except Exception as e:
+                errors.append(f"""Folder scanning error {current_folder}: {e}""")
+                if folder in known_folders:
+                    unchanged_folders.add(folder)
+                continue
+            scanned_folders += 1
+
+            folders.append((folder, folder_mtime))
+
+            for entry in entries:
+                try:
+                    if entry.is_dir():
+                        stack.append(entry.path)
+                        continue
+                    if not entry.name.lower().endswith(EXTENSIONS):
+                        continue
+                    st = entry.stat()
+                except Exception as e:
+                    errors.append(f"""File scanning error {entry.path}: {e}""")
+                    continue
+
+                key = (folder, entry.name)
+                found_files.add(key)
+                if not check_files and known_files.get(key) == (st.st_mtime, st.st_size):
+                    continue
+
+                ext = entry.name[entry.name.rfind('.') + 1:].lower()
+                tasks.append((entry.path, folder, entry.name, ext, st.st_mtime, st.st_size))
+
+            if progress_callback and total_folders and scanned_folders < total_folders:
+                progress_callback(scanned_folders, total_folders)
+
+        if progress_callback and total_folders:
+            progress_callback(total_folders, total_folders)
+
+        deletes = [k for k in known_files if k not in found_files and k[0] not in unchanged_folders]
+        added = len([t for t in tasks if (t[1], t[2]) not in known_files])
+        logging.debug(f"""Files to parse: {len(tasks)}, files to delete: {len(deletes)}""")
+
+        failed_folders = set()
+        if tasks:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for n in range(0, len(tasks), SYNC_BATCH_SIZE):
+                    batch = tasks[n : n + SYNC_BATCH_SIZE]
+                    upserts = []
+                    for m, e in executor.map(parse_file, batch, chunksize=PARSE_CHUNK_SIZE):
+                        upserts.append(m)
+                        if e:
+                            errors.append(e)
+                    if not self.dbutil.run_batch_sync(upserts, None):
+                        failed_folders.update(t[1] for t in batch)
+                        errors.append(f"""Database update error, files: {len(batch)}""")
+                    if progress_callback:
+                        progress_callback(n + len(batch), len(tasks))
+
+        if failed_folders:
+            folders = [f for f in folders if f[0] not in failed_folders]
+        self.dbutil.run_batch_sync(None, deletes, folders)
+
+        end = timer()
+
+        if tasks or deletes:
+            self.dbutil.delete_summary_data()
+            self.create_summary(base_folder)
+
+        stats = {
+            SCANNED_FOLDERS: scanned_folders,
+            TOTAL_FILES: added,
+            UPDATED_FILES: len(tasks) - added,
+            DELETED_FILES: len(deletes),
+            PARSING_TIME: timedelta(seconds=(end - start)),
+            ERRORS: errors
+        }
+
+        return stats
+
     def print_files_statistics(self, stats):
         """ Prepare formatted string with folder statistics
 
@@ -691,24 +990,38 @@ class Collector(object):
         n = int((STARS - 2 - len(header)) / 2)
         s = "\n\n" + "*" * n + " " + header + " " + "*" * n
 
-        if not stats or int(stats[TOTAL_FILES]) == 0:
+        updated = stats.get(UPDATED_FILES, 0) if stats else 0
+        deleted = stats.get(DELETED_FILES, 0) if stats else 0
+
+        if not stats or int(stats[TOTAL_FILES]) + updated + deleted == 0:
             s += f"""\n\n{UP_TO_DATE}\n"""
             s += "\n" + "*" * STARS
             logging.debug(s)
             return
 
-        if stats[TOTAL_FILES] > 1:
-            suffix = ADDED_SUFFIX + "s"
-        else:
-            suffix = ADDED_SUFFIX
-
-        s += f"""\n\n{ADDED_PREFIX} {stats[TOTAL_FILES]} {suffix}"""
+        s += f"""\n\n{ADDED_PREFIX} {stats[TOTAL_FILES]} {self.get_files_suffix(stats[TOTAL_FILES])}"""
+        if UPDATED_FILES in stats:
+            s += f"""\n{UPDATED_PREFIX} {updated} {self.get_files_suffix(updated)}"""
+        if DELETED_FILES in stats:
+            s += f"""\n{DELETED_PREFIX} {deleted} {self.get_files_suffix(deleted)}"""
         s += f"""\n{UPDATE_TIME} {stats[PARSING_TIME]}"""
         s += f"""\n{ERRORS} {len(stats[ERRORS])}\n"""
         s += "\n" + "*" * STARS
         
         logging.debug(s)
 
+    def get_files_suffix(self, n):
+        """ Get singular or plural suffix
+
+        :param n: number of files
+
+        :return: suffix
+        """
+        if n == 1:
+            return ADDED_SUFFIX
+        else:
+            return ADDED_SUFFIX + "s"
+
     def print_statistics(self, stats, header):
         """ Prepare formatted string
 
@@ -776,6 +1089,26 @@ class Collector(object):
         
         return (count, elapsed_time)
 
+def parse_file(task):
+    """ Parse audio file metadata. Runs in the pool process.
+
+    :param task: tuple (path, folder, filename, extension, mtime, size)
+
+    :return: tuple (list of values for insert, error message or None)
+    """
+    path, folder, filename, ext, mtime, size = task
+    meta = None
+    error = None
+    try:
+        if ext == "mp4" or ext == "m4a":
+            meta = MP4(path)
+        else:
+            meta = File(path, easy=True)
+    except Exception as e:
+        error = f"""Metadata parsing error in file {filename}: {e}"""
+
+    return (Collector().get_file_metadata(folder, filename, ext, meta if meta else None, mtime, size), error)
+
 def main():
     import argparse
     log_handler = logging.StreamHandler(sys.stdout)
@@ -795,6 +1128,8 @@ def main():
         create collection database using specified folder and database filename
     python collector.py update -i c:\\music -o c:\peppy.db
         update collection database using specified folder and database filename
+    python collector.py sync -i c:\\music -o c:\peppy.db
+        add new, update modified and delete missing files in collection database
     """
     parser = argparse.ArgumentParser(
         usage=usage,
@@ -817,6 +1152,12 @@ def main():
     p.add_argument("-i", help="audio files root folder", required=True)
     p.add_argument("-o", help="collection database filename", required=True)
 
+    p = subparsers.add_parser("sync", help="synchronize collection database with folder")
+    p.add_argument("-i", help="audio files root folder", required=True)
+    p.add_argument("-o", help="collection database filename", required=True)
+    p.add_argument("-w", help="number of parsing processes", type=int, default=None)
+    p.add_argument("-f", help="parse all files including not modified", action="store_true")
+
     try:
         args = parser.parse_args()
     except Exception as e:
@@ -873,6 +1214,18 @@ def main():
         if n:
             stats = coll.update_collection(base_folder, n[0], coll.print_progress_bar)
             coll.print_update_statistics(stats, UPDATE_STATISTICS)
+    elif command == "sync":
+        base_folder = args.i
+        if base_folder.endswith(os.sep):
+            base_folder = base_folder[:-1]
+        db_filename = args.o
+
+        coll = Collector(db_filename)
+        coll.dbutil.connect()
+        n = coll.count_folders(base_folder)
+        if n:
+            stats = coll.sync_collection(base_folder, n[0], coll.print_progress_bar, args.w, args.f)
+            coll.print_update_statistics(stats, UPDATE_STATISTICS)
         
 if __name__ == '__main__':
     main()
@@ -61,6 +61,8 @@ HDMI = "hdmi"
 NO_FRAME = "no.frame"
 FLIP_TOUCH_XY = "flip.touch.xy"
 MULTI_TOUCH = "multi.touch"
+FULL_FRAME_UPDATE = "full.frame.update"
+ADAPTIVE_FRAME_RATE = "adaptive.frame.rate"
 
 USAGE = "usage"
 USE_TOUCHSCREEN = "touchscreen"
@@ -127,11 +129,18 @@ PLAYBACK_SINGLE_CYCLIC = "single"
 WEB_SERVER = "web.server"
 HTTPS = "https"
 HTTP_PORT = "http.port"
+WEBSOCKET_COMPRESSION = "websocket.compression"
+WEBSOCKET_QUEUE_SIZE = "websocket.queue.size"
+DEFAULT_WEBSOCKET_QUEUE_SIZE = 16
 
 STREAM_SERVER = "stream.server"
 STREAM_SERVER_PORT = "stream.server.port"
 
 PODCASTS_FOLDER = "podcasts.folder"
+DOWNLOAD_MAX_RATE = "download.max.rate"
+DOWNLOAD_STREAMING_RATE = "download.streaming.rate"
+DOWNLOAD_SEGMENTS = "download.segments"
+DEFAULT_DOWNLOAD_STREAMING_RATE = 64
 PODCAST_URL = "podcast.url"
 PODCAST_EPISODE_NAME = "podcast.episode.name"
 PODCAST_EPISODE_URL = "podcast.episode.url"
@@ -157,6 +166,33 @@ BLUETOOTH_SINK = "bluetooth-sink"
 YA_STREAM = "ya-streams"
 ARCHIVE = "archive"
 
+CACHE = "cache"
+THUMBNAIL_CACHE_FOLDER = "thumbnail.cache.folder"
+THUMBNAIL_CACHE_SIZE = "thumbnail.cache.size"
+DEFAULT_THUMBNAIL_CACHE_FOLDER = os.path.join("cache", "thumbnails")
+DEFAULT_THUMBNAIL_CACHE_SIZE = 64
+IMAGE_CACHE_SIZE = "image.cache.size"
+DEFAULT_IMAGE_CACHE_SIZE = 32
+EMBEDDED_IMAGE_INDEX = "embedded.image.index"
+DEFAULT_EMBEDDED_IMAGE_INDEX = os.path.join("cache", "embedded.images.json")
+BACKGROUND_CACHE_FOLDER = "background.cache.folder"
+BACKGROUND_CACHE_SIZE = "background.cache.size"
+DEFAULT_BACKGROUND_CACHE_FOLDER = os.path.join("cache", "backgrounds")
+DEFAULT_BACKGROUND_CACHE_SIZE = 128
+WEB_IMAGE_CACHE_FOLDER = "web.image.cache.folder"
+WEB_IMAGE_CACHE_SIZE = "web.image.cache.size"
+DEFAULT_WEB_IMAGE_CACHE_FOLDER = os.path.join("cache", "web.images")
+DEFAULT_WEB_IMAGE_CACHE_SIZE = 32
+FEED_CACHE_FOLDER = "feed.cache.folder"
+FEED_CACHE_MAX_AGE = "feed.cache.max.age"
+DEFAULT_FEED_CACHE_FOLDER = os.path.join("cache", "feeds")
+DEFAULT_FEED_CACHE_MAX_AGE = 60
+LOOKUP_CACHE_FILE = "lookup.cache.file"
+LOOKUP_CACHE_SIZE = "lookup.cache.size"
+DEFAULT_LOOKUP_CACHE_FILE = os.path.join("cache", "lookup.db")
+DEFAULT_LOOKUP_CACHE_SIZE = 64
+SCREENSAVER_BLUR_RADIUS = 4
+
 COLLECTION = "collection"
 DATABASE_FILE = "database.file"
 BASE_FOLDER = "base.folder"
@@ -798,6 +834,14 @@ class Config(object):
         c[NO_FRAME] = config_file.getboolean(SCREEN_INFO, NO_FRAME)
         c[FLIP_TOUCH_XY] = config_file.getboolean(SCREEN_INFO, FLIP_TOUCH_XY)
         c[MULTI_TOUCH] = config_file.getboolean(SCREEN_INFO, MULTI_TOUCH)
+        try:
+            c[FULL_FRAME_UPDATE] = config_file.getboolean(SCREEN_INFO, FULL_FRAME_UPDATE)
+        except:
+            c[FULL_FRAME_UPDATE] = False
+        try:
+            c[ADAPTIVE_FRAME_RATE] = config_file.getboolean(SCREEN_INFO, ADAPTIVE_FRAME_RATE)
+        except:
+            c[ADAPTIVE_FRAME_RATE] = True
         config[SCREEN_INFO] = c
         self.screen_rect = pygame.Rect(0, 0, c[WIDTH], c[HEIGHT])
 
@@ -880,14 +924,39 @@ class Config(object):
         
         c = {
             HTTP_PORT : config_file.get(WEB_SERVER, HTTP_PORT),
-            HTTPS: config_file.getboolean(WEB_SERVER, HTTPS)
+            HTTPS: config_file.getboolean(WEB_SERVER, HTTPS),
+            WEBSOCKET_COMPRESSION: False,
+            WEBSOCKET_QUEUE_SIZE: DEFAULT_WEBSOCKET_QUEUE_SIZE
         }
+        try:
+            c[WEBSOCKET_COMPRESSION] = config_file.getboolean(WEB_SERVER, WEBSOCKET_COMPRESSION)
+        except:
+            pass
+        try:
+            c[WEBSOCKET_QUEUE_SIZE] = config_file.getint(WEB_SERVER, WEBSOCKET_QUEUE_SIZE)
+        except:
+            pass
         config[WEB_SERVER] = c
         
         c = {STREAM_SERVER_PORT : config_file.get(STREAM_SERVER, STREAM_SERVER_PORT)}
         config[STREAM_SERVER] = c
         
         config[PODCASTS_FOLDER] = config_file.get(PODCASTS, PODCASTS_FOLDER)
+        config[DOWNLOAD_MAX_RATE] = 0
+        config[DOWNLOAD_STREAMING_RATE] = DEFAULT_DOWNLOAD_STREAMING_RATE
+        config[DOWNLOAD_SEGMENTS] = 1
+        try:
+            config[DOWNLOAD_MAX_RATE] = config_file.getint(PODCASTS, DOWNLOAD_MAX_RATE)
+        except:
+            pass
+        try:
+            config[DOWNLOAD_STREAMING_RATE] = config_file.getint(PODCASTS, DOWNLOAD_STREAMING_RATE)
+        except:
+            pass
+        try:
+            config[DOWNLOAD_SEGMENTS] = max(1, config_file.getint(PODCASTS, DOWNLOAD_SEGMENTS))
+        except:
+            pass
 
         show_numbers = False
         try:
@@ -902,6 +971,70 @@ class Config(object):
         }
         config[COLLECTION] = c        
 
+        c = {
+            THUMBNAIL_CACHE_FOLDER: DEFAULT_THUMBNAIL_CACHE_FOLDER,
+            THUMBNAIL_CACHE_SIZE: DEFAULT_THUMBNAIL_CACHE_SIZE,
+            IMAGE_CACHE_SIZE: DEFAULT_IMAGE_CACHE_SIZE,
+            EMBEDDED_IMAGE_INDEX: DEFAULT_EMBEDDED_IMAGE_INDEX,
+            BACKGROUND_CACHE_FOLDER: DEFAULT_BACKGROUND_CACHE_FOLDER,
+            BACKGROUND_CACHE_SIZE: DEFAULT_BACKGROUND_CACHE_SIZE,
+            WEB_IMAGE_CACHE_FOLDER: DEFAULT_WEB_IMAGE_CACHE_FOLDER,
+            WEB_IMAGE_CACHE_SIZE: DEFAULT_WEB_IMAGE_CACHE_SIZE,
+            FEED_CACHE_FOLDER: DEFAULT_FEED_CACHE_FOLDER,
+            FEED_CACHE_MAX_AGE: DEFAULT_FEED_CACHE_MAX_AGE,
+            LOOKUP_CACHE_FILE: DEFAULT_LOOKUP_CACHE_FILE,
+            LOOKUP_CACHE_SIZE: DEFAULT_LOOKUP_CACHE_SIZE
+        }
+        try:
+            c[THUMBNAIL_CACHE_FOLDER] = config_file.get(CACHE, THUMBNAIL_CACHE_FOLDER) or DEFAULT_THUMBNAIL_CACHE_FOLDER
+        except:
+            pass
+        try:
+            c[THUMBNAIL_CACHE_SIZE] = config_file.getint(CACHE, THUMBNAIL_CACHE_SIZE)
+        except:
+            pass
+        try:
+            c[IMAGE_CACHE_SIZE] = config_file.getint(CACHE, IMAGE_CACHE_SIZE)
+        except:
+            pass
+        try:
+            c[EMBEDDED_IMAGE_INDEX] = config_file.get(CACHE, EMBEDDED_IMAGE_INDEX) or DEFAULT_EMBEDDED_IMAGE_INDEX
+        except:
+            pass
+        try:
+            c[BACKGROUND_CACHE_FOLDER] = config_file.get(CACHE, BACKGROUND_CACHE_FOLDER) or DEFAULT_BACKGROUND_CACHE_FOLDER
+        except:
+            pass
+        try:
+            c[BACKGROUND_CACHE_SIZE] = config_file.getint(CACHE, BACKGROUND_CACHE_SIZE)
+        except:
+            pass
+        try:
+            c[WEB_IMAGE_CACHE_FOLDER] = config_file.get(CACHE, WEB_IMAGE_CACHE_FOLDER) or DEFAULT_WEB_IMAGE_CACHE_FOLDER
+        except:
+            pass
+        try:
+            c[WEB_IMAGE_CACHE_SIZE] = config_file.getint(CACHE, WEB_IMAGE_CACHE_SIZE)
+        except:
+            pass
+        try:
+            c[FEED_CACHE_FOLDER] = config_file.get(CACHE, FEED_CACHE_FOLDER) or DEFAULT_FEED_CACHE_FOLDER
+        except:
+            pass
+        try:
+            c[FEED_CACHE_MAX_AGE] = config_file.getint(CACHE, FEED_CACHE_MAX_AGE)
+        except:
+            pass
+        try:
+            c[LOOKUP_CACHE_FILE] = config_file.get(CACHE, LOOKUP_CACHE_FILE) or DEFAULT_LOOKUP_CACHE_FILE
+        except:
+            pass
+        try:
+            c[LOOKUP_CACHE_SIZE] = config_file.getint(CACHE, LOOKUP_CACHE_SIZE)
+        except:
+            pass
+        config[CACHE] = c
+
         c = {RADIO: config_file.getboolean(HOME_MENU, RADIO)}
         c[AUDIO_FILES] = config_file.getboolean(HOME_MENU, AUDIO_FILES)
         c[AUDIOBOOKS] = config_file.getboolean(HOME_MENU, AUDIOBOOKS)
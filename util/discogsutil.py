@@ -19,15 +19,19 @@ import logging
 import discogs_client
 import requests
 
+from util.lookupcache import DISCOGS
+
 class DiscogsUtil(object):
     """ Discogs.com utility class """
     
-    def __init__(self, t):
+    def __init__(self, t, lookup_cache=None):
         """ Initializer. Create Discogs Client 
         
         :param t: token
+        :param lookup_cache: persistent lookup cache, None - no caching
         """
         self.peppy_player_user_agent = "PeppyPlayer +https://github.com/project-owner/Peppy"
+        self.lookup_cache = lookup_cache
         self.init_client(t)
 
     def init_client(self, token):
@@ -59,13 +63,13 @@ class DiscogsUtil(object):
                 return None
         except Exception as e:
             logging.error(str(e))
-            self.init_client()
-            return None
+            self.init_client(self.token)
+            raise
         
         return result
         
     def get_album_art_url(self, query, per_page=12):
-        """ Get album art URL
+        """ Get album art URL. The result is taken from the lookup cache if available.
         
         :param query: search query
         
@@ -73,7 +77,23 @@ class DiscogsUtil(object):
         """
         if query == None:
             return None
+
+        if self.lookup_cache == None:
+            try:
+                return self.fetch_album_art_url(query, per_page)
+            except Exception as e:
+                logging.debug(e)
+                return None
+
+        return self.lookup_cache.get(DISCOGS, query, lambda q: self.fetch_album_art_url(q, per_page))
+
+    def fetch_album_art_url(self, query, per_page=12):
+        """ Get album art URL from Discogs. The network errors are not handled.
         
+        :param query: search query
+        
+        :return: album art URL or None if not found
+        """
         result = self.search(query)
         if result == None: return None
 
@@ -88,14 +108,11 @@ class DiscogsUtil(object):
         }
         url += "&token=" + self.token
         content = requests.get(url, headers=headers, params=parameters, timeout=(2, 2))
+        content.raise_for_status()
 
-        if content:
-            j = content.json()
-            results = j["results"]
-            if len(results) == 0:
-                return None
-            else:
-                r = results[0]
-                return r["cover_image"]
-        else:
+        results = content.json()["results"]
+        if len(results) == 0:
             return None
+        else:
+            r = results[0]
+            return r["cover_image"]
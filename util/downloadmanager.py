@@ -0,0 +1,513 @@
+# Copyright 2026 Peppy Player peppy.player@gmail.com
+#
+# This file is part of Peppy Player.
+#
+# Peppy Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Peppy Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import time
+import json
+import shutil
+import hashlib
+import logging
+import requests
+
+from threading import Thread, RLock
+from collections import OrderedDict
+from requests.adapters import HTTPAdapter
+
+STATUS_QUEUED = "queued"
+STATUS_LOADING = "loading"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+STATUS_CANCELLED = "cancelled"
+
+PART_EXTENSION = ".part"
+CHUNK_SIZE = 16384
+REQUEST_TIMEOUT = (5, 10)
+MAX_RETRIES = 5
+RETRY_DELAY = 2
+KILOBYTE = 1024
+HTTP_OK = 200
+HTTP_PARTIAL_CONTENT = 206
+HTTP_RANGE_NOT_SATISFIABLE = 416
+
+class DownloadManager(object):
+    """ Downloads files one by one from the persistent queue. The file is downloaded into
+    the part files using HTTP Range requests, so the interrupted download continues from
+    the last received byte, also after restart. If the server supports ranges the file can
+    be split into segments downloaded in parallel. All downloads share the bandwidth limit,
+    the lower limit is used while the player is streaming. The downloaded file is verified
+    by its size and by the optional SHA-256 checksum. The part files of the failed download
+    are kept, so adding the same file again (or restarting) resumes it.
+    """
+
+    lock = RLock()
+
+    def __init__(self, queue_file, max_rate=0, streaming_rate=0, segments=1, is_streaming=None):
+        """ Initializer
+
+        :param queue_file: the file where the queue is saved
+        :param max_rate: bandwidth limit in KB/s, 0 - unlimited
+        :param streaming_rate: bandwidth limit in KB/s while the player is streaming, 0 - use max rate
+        :param segments: the number of segments downloaded in parallel
+        :param is_streaming: function which returns True if the player is streaming
+        """
+        self.queue_file = queue_file
+        self.segments = max(1, segments)
+        self.limiter = RateLimiter(max_rate, streaming_rate, is_streaming)
+        self.jobs = OrderedDict()
+        self.listeners = []
+        self.thread = None
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.segments)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.load_queue()
+
+    def add_listener(self, listener):
+        """ Add listener called when the download is finished or failed
+
+        :param listener: function with job dictionary argument
+        """
+        if listener not in self.listeners:
+            self.listeners.append(listener)
+
+    def start(self):
+        """ Start download thread if there are queued jobs """
+
+        with self.lock:
+            if self.thread != None or not self.get_queued_jobs():
+                return
+            self.thread = Thread(target=self.download_jobs, daemon=True)
+            self.thread.start()
+
+    def add(self, url, path, data=None, checksum=None):
+        """ Add file to the download queue
+
+        :param url: file URL
+        :param path: destination file path
+        :param data: dictionary saved with the job and passed to the listeners
+        :param checksum: SHA-256 checksum of the file
+
+        :return: job dictionary
+        """
+        with self.lock:
+            job = self.jobs.get(url)
+            if job != None and job["status"] == STATUS_FAILED and job["path"] == path:
+                job["status"] = STATUS_QUEUED
+                job["data"] = data or job["data"]
+                job["checksum"] = checksum or job["checksum"]
+                self.save_queue()
+            elif job == None or job["status"] in (STATUS_DONE, STATUS_FAILED, STATUS_CANCELLED):
+                if job != None and job["status"] == STATUS_FAILED:
+                    self.delete_parts(job)
+                job = {
+                    "url": url,
+                    "path": path,
+                    "status": STATUS_QUEUED,
+                    "size": None,
+                    "downloaded": 0,
+                    "segments": None,
+                    "checksum": checksum,
+                    "data": data or {}
+                }
+                self.jobs[url] = job
+                self.save_queue()
+        self.start()
+        return job
+
+    def cancel(self, url):
+        """ Cancel download and delete the part files
+
+        :param url: file URL
+        """
+        with self.lock:
+            job = self.jobs.get(url)
+            if job == None or job["status"] in (STATUS_DONE, STATUS_CANCELLED):
+                return
+            job["status"] = STATUS_CANCELLED
+            self.save_queue()
+        self.delete_parts(job)
+
+    def get_progress(self, url):
+        """ Get download progress
+
+        :param url: file URL
+
+        :return: dictionary with status, size, downloaded bytes and percent or None if the file is unknown
+        """
+        with self.lock:
+            job = self.jobs.get(url)
+            if job == None:
+                return None
+            return self.get_job_progress(job)
+
+    def get_progress_list(self):
+        """ Get progress of all downloads
+
+        :return: list of progress dictionaries
+        """
+        with self.lock:
+            return [self.get_job_progress(job) for job in self.jobs.values()]
+
+    def get_job_progress(self, job):
+        """ Convert job into progress dictionary
+
+        :param job: job dictionary
+
+        :return: progress dictionary
+        """
+        p = {"url": job["url"], "status": job["status"], "size": job["size"], "downloaded": job["downloaded"]}
+        if job["status"] == STATUS_DONE:
+            p["percent"] = 100
+        elif job["size"]:
+            p["percent"] = min(100, int(job["downloaded"] * 100 / job["size"]))
+        else:
+            p["percent"] = None
+        return p
+
+    def get_queued_jobs(self):
+        """ Get jobs waiting for download
+
+        :return: list of jobs
+        """
+        with self.lock:
+            return [j for j in self.jobs.values() if j["status"] in (STATUS_QUEUED, STATUS_LOADING)]
+
+    def download_jobs(self):
+        """ Thread method """
+
+        while True:
+            with self.lock:
+                jobs = self.get_queued_jobs()
+                if not jobs:
+                    self.thread = None
+                    return
+                job = jobs[0]
+                job["status"] = STATUS_LOADING
+
+            try:
+                result = self.download(job)
+            except Exception as e:
+                logging.debug(e)
+                result = False
+
+            with self.lock:
+                if job["status"] == STATUS_CANCELLED:
+                    continue
+                job["status"] = STATUS_DONE if result else STATUS_FAILED
+                self.save_queue()
+
+            for listener in self.listeners:
+                try:
+                    listener(job)
+                except Exception as e:
+                    logging.debug(e)
+
+    def download(self, job):
+        """ Download file
+
+        :param job: job dictionary
+
+        :return: True - file downloaded and verified, False - download failed
+        """
+        size, accept_ranges = self.get_file_info(job["url"])
+        with self.lock:
+            if job["size"] and size and job["size"] != size:
+                self.delete_parts(job)
+                job["segments"] = None
+            job["size"] = size
+            if job["segments"] == None:
+                job["segments"] = self.segments if size and accept_ranges and size > self.segments * CHUNK_SIZE else 1
+            self.save_queue()
+
+        ranges = self.get_ranges(size, job["segments"])
+        with self.lock:
+            job["downloaded"] = sum(self.get_part_size(job, i) for i in range(len(ranges)))
+
+        if len(ranges) == 1:
+            results = [self.download_segment(job, 0, ranges[0][0], ranges[0][1])]
+        else:
+            results = [None] * len(ranges)
+            def download_segment(i, start, end):
+                results[i] = self.download_segment(job, i, start, end)
+            threads = [Thread(target=download_segment, args=[i, r[0], r[1]]) for i, r in enumerate(ranges)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        if job["status"] == STATUS_CANCELLED or not all(results):
+            return False
+
+        return self.merge_parts(job, len(ranges))
+
+    def get_file_info(self, url):
+        """ Get file size and range support
+
+        :param url: file URL
+
+        :return: tuple (size or None, True - ranges supported)
+        """
+        try:
+            r = self.session.head(url, allow_redirects=True, timeout=REQUEST_TIMEOUT)
+            size = int(r.headers.get("Content-Length", 0)) or None
+            return (size, r.headers.get("Accept-Ranges", "").lower() == "bytes")
+        except Exception as e:
+            logging.debug(e)
+            return (None, False)
+
+    def get_ranges(self, size, segments):
+        """ Split file into segments
+
+        :param size: file size or None
+        :param segments: the number of segments
+
+        :return: list of tuples (first byte, last byte or None)
+        """
+        if not size or segments == 1:
+            return [(0, size - 1 if size else None)]
+
+        step = size // segments
+        ranges = []
+        for i in range(segments):
+            end = size - 1 if i == segments - 1 else (i + 1) * step - 1
+            ranges.append((i * step, end))
+        return ranges
+
+    def download_segment(self, job, index, start, end):
+        """ Download one segment. Continue from the end of the part file, retry on errors.
+
+        :param job: job dictionary
+        :param index: segment index
+        :param start: the first byte
+        :param end: the last byte or None for the end of file
+
+        :return: True - segment downloaded, False - failed
+        """
+        part = self.get_part_path(job, index)
+
+        for attempt in range(MAX_RETRIES):
+            have = self.get_part_size(job, index)
+            if end != None and start + have > end:
+                return True
+
+            headers = {}
+            if start + have > 0 or end != None:
+                headers["Range"] = f"""bytes={start + have}-{"" if end == None else end}"""
+
+            try:
+                with self.session.get(job["url"], headers=headers, stream=True, timeout=REQUEST_TIMEOUT) as r:
+                    if r.status_code == HTTP_RANGE_NOT_SATISFIABLE and end == None and have > 0:
+                        return True
+                    if r.status_code == HTTP_OK:
+                        if start > 0:
+                            return False
+                        mode = "wb"
+                        with self.lock:
+                            job["downloaded"] -= have
+                    elif r.status_code == HTTP_PARTIAL_CONTENT:
+                        mode = "ab"
+                    else:
+                        raise Exception(f"""HTTP status {r.status_code}: {job["url"]}""")
+
+                    with open(part, mode) as f:
+                        for chunk in r.iter_content(chunk_size=CHUNK_SIZE):
+                            if job["status"] == STATUS_CANCELLED:
+                                return False
+                            if not chunk:
+                                continue
+                            self.limiter.consume(len(chunk))
+                            f.write(chunk)
+                            with self.lock:
+                                job["downloaded"] += len(chunk)
+
+                if end == None or start + self.get_part_size(job, index) > end:
+                    return True
+            except Exception as e:
+                logging.debug(e)
+
+            if job["status"] == STATUS_CANCELLED:
+                return False
+            time.sleep(RETRY_DELAY * (attempt + 1))
+
+        return False
+
+    def merge_parts(self, job, segments):
+        """ Join the part files and verify the result
+
+        :param job: job dictionary
+        :param segments: the number of segments
+
+        :return: True - file is correct, False - verification failed
+        """
+        path = job["path"]
+        tmp_path = path + PART_EXTENSION
+        try:
+            if segments == 1:
+                os.replace(self.get_part_path(job, 0), tmp_path)
+            else:
+                with open(tmp_path, "wb") as f:
+                    for i in range(segments):
+                        with open(self.get_part_path(job, i), "rb") as part:
+                            shutil.copyfileobj(part, f)
+
+            if not self.verify(tmp_path, job["size"], job["checksum"]):
+                logging.debug(f"""Verification failed: {job["url"]}""")
+                os.remove(tmp_path)
+                self.delete_parts(job)
+                with self.lock:
+                    job["downloaded"] = 0
+                    job["segments"] = None
+                return False
+
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logging.debug(e)
+            return False
+
+        self.delete_parts(job)
+        return True
+
+    def verify(self, path, size, checksum):
+        """ Verify file size and checksum
+
+        :param path: file path
+        :param size: expected size or None
+        :param checksum: expected SHA-256 checksum or None
+
+        :return: True - file is correct, False - file is corrupted
+        """
+        if size and os.path.getsize(path) != size:
+            return False
+
+        if checksum:
+            h = hashlib.sha256()
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(CHUNK_SIZE * 4), b""):
+                    h.update(block)
+            return h.hexdigest().lower() == checksum.lower()
+
+        return True
+
+    def get_part_path(self, job, index):
+        """ Get part file path
+
+        :param job: job dictionary
+        :param index: segment index
+
+        :return: part file path
+        """
+        return job["path"] + PART_EXTENSION + str(index)
+
+    def get_part_size(self, job, index):
+        """ Get the size of the part file
+
+        :param job: job dictionary
+        :param index: segment index
+
+        :return: size in bytes
+        """
+        try:
+            return os.path.getsize(self.get_part_path(job, index))
+        except Exception:
+            return 0
+
+    def delete_parts(self, job):
+        """ Delete all part files of the job
+
+        :param job: job dictionary
+        """
+        for i in range(max(self.segments, job["segments"] or 1)):
+            try:
+                os.remove(self.get_part_path(job, i))
+            except Exception:
+                pass
+
+    def load_queue(self):
+        """ Load the jobs which were not finished. The failed jobs are queued again. """
+
+        try:
+            with open(self.queue_file, "r", encoding="utf-8") as f:
+                jobs = json.load(f)
+        except Exception:
+            return
+
+        with self.lock:
+            for job in jobs:
+                job["status"] = STATUS_QUEUED
+                self.jobs[job["url"]] = job
+
+    def save_queue(self):
+        """ Save the jobs which are not finished including the failed ones """
+
+        with self.lock:
+            jobs = [j for j in self.jobs.values() if j["status"] in (STATUS_QUEUED, STATUS_LOADING, STATUS_FAILED)]
+            tmp_path = self.queue_file + ".tmp"
+            try:
+                folder = os.path.dirname(self.queue_file)
+                if folder:
+                    os.makedirs(folder, exist_ok=True)
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(jobs, f)
+                os.replace(tmp_path, self.queue_file)
+            except Exception as e:
+                logging.debug(e)
+
+class RateLimiter(object):
+    """ Token bucket shared by all download threads """
+
+    lock = RLock()
+
+    def __init__(self, max_rate, streaming_rate, is_streaming):
+        """ Initializer
+
+        :param max_rate: bandwidth limit in KB/s, 0 - unlimited
+        :param streaming_rate: bandwidth limit in KB/s while the player is streaming, 0 - use max rate
+        :param is_streaming: function which returns True if the player is streaming
+        """
+        self.max_rate = max_rate
+        self.streaming_rate = streaming_rate
+        self.is_streaming = is_streaming
+        self.available = 0
+        self.last = time.monotonic()
+
+    def get_rate(self):
+        """ Get the current limit
+
+        :return: limit in bytes per second, 0 - unlimited
+        """
+        rate = self.max_rate
+        if self.streaming_rate and self.is_streaming and self.is_streaming():
+            rate = min(rate, self.streaming_rate) if rate else self.streaming_rate
+        return rate * KILOBYTE
+
+    def consume(self, n):
+        """ Wait until the specified number of bytes can be received
+
+        :param n: the number of bytes
+        """
+        rate = self.get_rate()
+        if not rate:
+            return
+
+        with self.lock:
+            now = time.monotonic()
+            self.available = min(rate, self.available + (now - self.last) * rate) - n
+            self.last = now
+            delay = -self.available / rate if self.available < 0 else 0
+
+        if delay:
+            time.sleep(delay)
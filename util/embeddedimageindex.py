@@ -0,0 +1,350 @@
+# Copyright 2026 Peppy Player peppy.player@gmail.com
+#
+# This file is part of Peppy Player.
+#
+# Peppy Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Peppy Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import json
+import logging
+
+from threading import RLock, Timer, Event
+
+EXT_MP3 = ".mp3"
+EXT_FLAC = ".flac"
+EXT_MP4 = ".mp4"
+EXT_M4A = ".m4a"
+
+ID3_HEADER_SIZE = 10
+ID3_FOOTER_FLAG = 0x10
+ID3_EXTENDED_HEADER_FLAG = 0x40
+ID3_DATA_LENGTH_FLAG = 0x01
+ID3_PICTURE_HEADER_SIZE = 80
+FLAC_PICTURE_BLOCK = 6
+FLAC_LAST_BLOCK_FLAG = 0x80
+MP4_COVER_PATH = [b"moov", b"udta", b"meta", b"ilst", b"covr"]
+SAVE_DELAY = 2.0
+
+class EmbeddedImageIndex(object):
+    """ Persistent index of the audio files with embedded images.
+    The presence of the image is detected by reading the tag headers only, the image payload
+    is never read. The result is stored per file path and modification time in the sidecar
+    file. The index is saved with a delay to write the results of many probes at once.
+    Each file is opened only once: the threads probing the file which is already being probed
+    wait for the result of the first probe.
+    """
+
+    lock = RLock()
+
+    def __init__(self, path):
+        """ Initializer
+
+        :param path: index file path
+        """
+        self.path = path
+        self.entries = None
+        self.modified = False
+        self.save_timer = None
+        self.probes = {}
+
+    def get(self, filename):
+        """ Get the indexed value without probing the file
+
+        :param filename: audio file path
+
+        :return: True - file has embedded image, False - no image, None - file is not in the index
+        """
+        try:
+            mtime = os.stat(filename).st_mtime_ns
+        except Exception:
+            return False
+
+        with self.lock:
+            self.load()
+            e = self.entries.get(filename)
+        if e and e[0] == mtime:
+            return e[1]
+        return None
+
+    def probe(self, filename):
+        """ Check if the audio file has embedded image. Use the index if possible.
+
+        :param filename: audio file path
+
+        :return: True - file has embedded image, False - no image
+        """
+        try:
+            mtime = os.stat(filename).st_mtime_ns
+        except Exception:
+            return False
+
+        with self.lock:
+            self.load()
+            e = self.entries.get(filename)
+            if e and e[0] == mtime:
+                return e[1]
+            event = self.probes.get(filename)
+            owner = event == None
+            if owner:
+                event = self.probes[filename] = Event()
+
+        if not owner:
+            event.wait()
+            with self.lock:
+                e = self.entries.get(filename)
+            return bool(e and e[1])
+
+        flag = False
+        try:
+            flag = has_embedded_image(filename)
+        finally:
+            with self.lock:
+                self.entries[filename] = [mtime, flag]
+                self.modified = True
+                self.probes.pop(filename, None)
+            event.set()
+        return flag
+
+    def save_later(self):
+        """ Save index after SAVE_DELAY seconds. All changes made during this time are saved at once. """
+
+        with self.lock:
+            if self.save_timer != None:
+                return
+            self.save_timer = Timer(SAVE_DELAY, self.save)
+            self.save_timer.daemon = True
+            self.save_timer.start()
+
+    def load(self):
+        """ Load index file once """
+
+        if self.entries != None:
+            return
+
+        self.entries = {}
+        if not self.path or not os.path.isfile(self.path):
+            return
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+        except Exception as e:
+            logging.debug(e)
+
+    def save(self):
+        """ Save index file if it was modified """
+
+        with self.lock:
+            self.save_timer = None
+            if not self.modified or not self.path:
+                return
+            data = json.dumps(self.entries)
+            self.modified = False
+
+        tmp_path = self.path + ".tmp"
+        try:
+            folder = os.path.dirname(self.path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logging.debug(e)
+
+def has_embedded_image(filename):
+    """ Check if the audio file has embedded image by reading the tag headers.
+    Supported formats: MP3, FLAC, MP4, M4A
+
+    :param filename: audio file path
+
+    :return: True - file has embedded image, False - no image
+    """
+    name = filename.lower()
+    try:
+        with open(filename, "rb") as f:
+            if name.endswith(EXT_MP3):
+                return probe_id3(f)
+            elif name.endswith(EXT_FLAC):
+                return probe_flac(f)
+            elif name.endswith(EXT_MP4) or name.endswith(EXT_M4A):
+                return probe_mp4(f)
+    except Exception as e:
+        logging.debug(e)
+    return False
+
+def get_syncsafe_int(b):
+    """ Decode ID3 syncsafe integer
+
+    :param b: 4 bytes
+
+    :return: integer value
+    """
+    return (b[0] << 21) | (b[1] << 14) | (b[2] << 7) | b[3]
+
+def probe_id3(f):
+    """ Find the APIC frame without description in ID3v2 tag. Only frame headers are read.
+
+    :param f: file object
+
+    :return: True - picture frame found, False - not found
+    """
+    header = f.read(ID3_HEADER_SIZE)
+    if len(header) < ID3_HEADER_SIZE or header[:3] != b"ID3":
+        return False
+
+    major = header[3]
+    flags = header[5]
+    end = ID3_HEADER_SIZE + get_syncsafe_int(header[6:10])
+    pos = ID3_HEADER_SIZE
+
+    if major == 2:
+        id_size, frame_header_size, picture_id = 3, 6, b"PIC"
+    else:
+        id_size, frame_header_size, picture_id = 4, 10, b"APIC"
+
+    if flags & ID3_EXTENDED_HEADER_FLAG and major > 2:
+        b = f.read(4)
+        if major == 4:
+            pos += get_syncsafe_int(b)
+        else:
+            pos += 4 + int.from_bytes(b, "big")
+
+    while pos + frame_header_size <= end:
+        f.seek(pos)
+        h = f.read(frame_header_size)
+        if len(h) < frame_header_size or h[0] == 0:
+            break
+
+        if major == 2:
+            size = int.from_bytes(h[3:6], "big")
+        elif major == 4:
+            size = get_syncsafe_int(h[4:8])
+        else:
+            size = int.from_bytes(h[4:8], "big")
+
+        if h[:id_size] == picture_id:
+            data = f.read(min(size, ID3_PICTURE_HEADER_SIZE))
+            if major == 4 and h[9] & ID3_DATA_LENGTH_FLAG:
+                data = data[4:]
+            if is_default_picture(data, major):
+                return True
+
+        pos += frame_header_size + size
+    return False
+
+def is_default_picture(data, major):
+    """ Check that the picture frame has empty description
+
+    :param data: the beginning of the frame payload
+    :param major: ID3v2 major version
+
+    :return: True - empty description, False - not empty
+    """
+    if len(data) < 4:
+        return False
+
+    encoding = data[0]
+    if major == 2:
+        i = 4
+    else:
+        i = data.find(b"\x00", 1)
+        if i == -1:
+            return False
+        i += 1
+    i += 1
+
+    if encoding == 1 or encoding == 2:
+        if data[i:i + 2] == b"\xff\xfe" or data[i:i + 2] == b"\xfe\xff":
+            i += 2
+        return data[i:i + 2] == b"\x00\x00"
+    return data[i:i + 1] == b"\x00"
+
+def probe_flac(f):
+    """ Find PICTURE metadata block in FLAC file. Only block headers are read.
+
+    :param f: file object
+
+    :return: True - picture block found, False - not found
+    """
+    h = f.read(4)
+    if h[:3] == b"ID3":
+        b = f.read(6)
+        skip = ID3_HEADER_SIZE + get_syncsafe_int(b[2:6])
+        if b[1] & ID3_FOOTER_FLAG:
+            skip += ID3_HEADER_SIZE
+        f.seek(skip)
+        h = f.read(4)
+
+    if h != b"fLaC":
+        return False
+
+    while True:
+        b = f.read(4)
+        if len(b) < 4:
+            return False
+        if b[0] & 0x7F == FLAC_PICTURE_BLOCK:
+            return True
+        if b[0] & FLAC_LAST_BLOCK_FLAG:
+            return False
+        f.seek(int.from_bytes(b[1:4], "big"), os.SEEK_CUR)
+
+def probe_mp4(f):
+    """ Find cover atom in MP4 file. Only atom headers are read.
+
+    :param f: file object
+
+    :return: True - cover atom found, False - not found
+    """
+    r = (0, os.fstat(f.fileno()).st_size)
+    for name in MP4_COVER_PATH:
+        if name == b"ilst":
+            # 'meta' is usually a full box with 4 bytes of version and flags
+            a = find_atom(f, r[0] + 4, r[1], name) or find_atom(f, r[0], r[1], name)
+        else:
+            a = find_atom(f, r[0], r[1], name)
+        if a == None:
+            return False
+        r = a
+    return True
+
+def find_atom(f, start, end, name):
+    """ Find MP4 atom between two positions
+
+    :param f: file object
+    :param start: start position
+    :param end: end position
+    :param name: atom name
+
+    :return: tuple (content start, content end) or None if not found
+    """
+    pos = start
+    while pos + 8 <= end:
+        f.seek(pos)
+        h = f.read(8)
+        if len(h) < 8:
+            return None
+        size = int.from_bytes(h[:4], "big")
+        header_size = 8
+        if size == 1:
+            size = int.from_bytes(f.read(8), "big")
+            header_size = 16
+        elif size == 0:
+            size = end - pos
+        if size < header_size:
+            return None
+        if h[4:8] == name:
+            return (pos + header_size, pos + size)
+        pos += size
+    return None
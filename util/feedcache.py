@@ -0,0 +1,266 @@
+# Copyright 2026 Peppy Player peppy.player@gmail.com
+#
+# This file is part of Peppy Player.
+#
+# Peppy Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Peppy Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import time
+import json
+import hashlib
+import logging
+import requests
+import feedparser
+
+from threading import RLock, get_ident
+from concurrent.futures import ThreadPoolExecutor, wait
+from requests.adapters import HTTPAdapter
+
+FEED_EXTENSION = ".json"
+MAX_WORKERS = 4
+REQUEST_TIMEOUT = (2, 2)
+HTTP_NOT_MODIFIED = 304
+HTTP_NOT_FOUND = 404
+
+class FeedCache(object):
+    """ Persistent cache of the podcast feeds. The feed summary and the list of episodes are
+    saved on disk with the ETag and Last-Modified headers of the response. The cached feed is
+    returned immediately, the stale feeds are refreshed in the background by the pool of threads
+    sharing one HTTP session. The refresh uses conditional requests, so the unchanged feed
+    is neither downloaded nor parsed again.
+    """
+
+    lock = RLock()
+
+    def __init__(self, folder, max_age, max_workers=MAX_WORKERS):
+        """ Initializer
+
+        :param folder: cache folder
+        :param max_age: the age of the feed in seconds after which it's refreshed
+        :param max_workers: the maximum number of concurrent requests
+        """
+        self.folder = folder
+        self.max_age = max_age
+        self.feeds = {}
+        self.refreshing = set()
+        self.listeners = []
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def add_listener(self, listener):
+        """ Add listener called when the feed was changed by the background refresh
+
+        :param listener: function with feed URL argument
+        """
+        if listener not in self.listeners:
+            self.listeners.append(listener)
+
+    def get_feed(self, url):
+        """ Get cached feed. The stale feed is returned and refreshed in the background.
+
+        :param url: feed URL
+
+        :return: feed dictionary or None if the feed is not in cache
+        """
+        feed = self.get_cached_feed(url)
+        if feed != None and time.time() - feed["fetched"] > self.max_age:
+            self.refresh(url)
+        return feed
+
+    def get_feeds(self, urls):
+        """ Get feeds. The feeds missing in the cache are fetched concurrently.
+
+        :param urls: list of feed URLs
+
+        :return: dictionary where the key is feed URL and value is feed dictionary
+        """
+        result = {}
+        missing = []
+        for url in urls:
+            feed = self.get_feed(url)
+            if feed == None:
+                missing.append(url)
+            else:
+                result[url] = feed
+
+        if missing:
+            futures = {self.executor.submit(self.fetch, url): url for url in missing}
+            wait(futures)
+            for future, url in futures.items():
+                feed = future.result()
+                if feed != None:
+                    result[url] = feed
+
+        return result
+
+    def get_cached_feed(self, url):
+        """ Get feed from memory or from disk
+
+        :param url: feed URL
+
+        :return: feed dictionary or None
+        """
+        with self.lock:
+            feed = self.feeds.get(url)
+        if feed != None:
+            return feed
+
+        try:
+            with open(self.get_path(url), "r", encoding="utf-8") as f:
+                feed = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logging.debug(e)
+            return None
+
+        with self.lock:
+            self.feeds[url] = feed
+        return feed
+
+    def refresh(self, url):
+        """ Start refreshing feed in the background
+
+        :param url: feed URL
+        """
+        with self.lock:
+            if url in self.refreshing:
+                return
+            self.refreshing.add(url)
+        self.executor.submit(self.refresh_feed, url)
+
+    def refresh_feed(self, url):
+        """ Refresh feed and notify listeners if it was changed
+
+        :param url: feed URL
+        """
+        try:
+            old_feed = self.get_cached_feed(url)
+            feed = self.fetch(url)
+            if feed != None and old_feed != None and feed["episodes"] != old_feed["episodes"]:
+                for listener in self.listeners:
+                    listener(url)
+        except Exception as e:
+            logging.debug(e)
+        finally:
+            with self.lock:
+                self.refreshing.discard(url)
+
+    def fetch(self, url):
+        """ Fetch feed using conditional request
+
+        :param url: feed URL
+
+        :return: feed dictionary or None if the feed is not available
+        """
+        cached = self.get_cached_feed(url)
+        headers = {}
+        if cached != None:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        try:
+            response = self.session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+        except Exception as e:
+            logging.debug(e)
+            return cached
+
+        if response.status_code == HTTP_NOT_MODIFIED and cached != None:
+            feed = dict(cached)
+        elif response.status_code == HTTP_NOT_FOUND:
+            return None
+        else:
+            rss = feedparser.parse(response.content)
+            if not rss or getattr(rss, "bozo_exception", None):
+                return cached
+            feed = self.get_summary(url, rss)
+            feed["etag"] = response.headers.get("ETag")
+            feed["last_modified"] = response.headers.get("Last-Modified")
+
+        feed["fetched"] = time.time()
+        self.save(url, feed)
+        return feed
+
+    def get_summary(self, url, rss):
+        """ Convert parsed feed into dictionary
+
+        :param url: feed URL
+        :param rss: parsed feed
+
+        :return: feed dictionary
+        """
+        image = ""
+        if "image" in rss.feed and "href" in rss.feed.image:
+            image = rss.feed.image.href.strip()
+
+        episodes = []
+        for entry in rss.entries:
+            try:
+                enclosure = entry.enclosures[0]
+            except:
+                continue
+            episode_url = getattr(enclosure, "href", None)
+            if episode_url == None:
+                episode_url = getattr(enclosure, "url", None)
+            if episode_url == None:
+                continue
+            episodes.append({
+                "title": entry.get("title", ""),
+                "url": episode_url,
+                "length": getattr(enclosure, "length", None),
+                "type": getattr(enclosure, "type", None),
+                "summary": entry.get("summary", "")
+            })
+
+        return {
+            "url": url,
+            "title": rss.feed.get("title", ""),
+            "subtitle": rss.feed.get("subtitle", ""),
+            "image": image,
+            "episodes": episodes
+        }
+
+    def save(self, url, feed):
+        """ Save feed in memory and on disk
+
+        :param url: feed URL
+        :param feed: feed dictionary
+        """
+        with self.lock:
+            self.feeds[url] = feed
+
+        path = self.get_path(url)
+        tmp_path = f"""{path}.{get_ident()}.tmp"""
+        try:
+            os.makedirs(self.folder, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(feed, f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logging.debug(e)
+
+    def get_path(self, url):
+        """ Get feed file path
+
+        :param url: feed URL
+
+        :return: file path
+        """
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.folder, key + FEED_EXTENSION)
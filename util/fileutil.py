@@ -70,6 +70,7 @@ class FileUtil(object):
             
         self.current_folder = self.config[FILE_PLAYBACK][CURRENT_FOLDER] or self.USER_HOME
         self.cre = compile(r'(\d+)') # compiled regular expression
+        self.listing_cache = util.memory_cache.get_namespace("folder.listing")
     
     def get_windows_disks(self):
         """ Return disks available on Windows machine
@@ -143,13 +144,50 @@ class FileUtil(object):
                 return True
         return False
     
-    def get_folder_content(self, folder_name, store_folder_name=True, load_images=True, show_file_details=False):
+    def get_folder_entries(self, folder_name):
+        """ Read folder entries using scandir. The entries are cached until the folder modification time changes.
+
+        :param folder_name: folder name
+
+        :return: list of tuples (file name, folder flag, real path)
+        """
+        try:
+            mtime = os.stat(folder_name).st_mtime_ns
+        except Exception:
+            return []
+
+        c = self.listing_cache.get(folder_name)
+        if c and c[0] == mtime:
+            return c[1]
+
+        real_folder = os.path.realpath(folder_name)
+        entries = []
+        with os.scandir(folder_name) as it:
+            for e in it:
+                try:
+                    is_dir = e.is_dir()
+                    if not is_dir and not e.is_file():
+                        continue
+                    if e.is_symlink():
+                        real_path = os.path.realpath(e.path)
+                    else:
+                        real_path = os.path.join(real_folder, e.name)
+                except OSError:
+                    continue
+                entries.append((e.name, is_dir, real_path))
+
+        self.listing_cache[folder_name] = (mtime, entries)
+        return entries
+
+    def get_folder_content(self, folder_name, store_folder_name=True, load_images=True, show_file_details=False, load_folder_images=True):
         """ Return the list representing folder content 
         
         :param folder_name: folder name
         :param store_folder_name: remember folder name
-        :param load_images: show if file has embedded image
+        :param load_images: show if file has embedded image. Only indexed files are known,
+            the other files are probed in the background and have None value
         :param show_file_details: show file details like size, time created and time modified
+        :param load_folder_images: True - find folder images, False - use only cached folder images
 
         :return:  
         """
@@ -179,6 +217,7 @@ class FileUtil(object):
         audio_files = []
         playlists = []
         images = []
+        unknown_images = []
 
         config_file_types = self.config[FILE_TYPES]
 
@@ -191,9 +230,8 @@ class FileUtil(object):
         if d:
             sort_order.reverse()
         
-        for f in os.listdir(folder_name):
+        for f, is_dir, real_path in self.get_folder_entries(folder_name):
             file_path = os.path.join(folder_name, f)
-            real_path = os.path.realpath(file_path)
             
             state = State()
             state.folder = folder_name
@@ -201,17 +239,20 @@ class FileUtil(object):
             state.file_name = f
             state.url = real_path
             
-            if os.path.isdir(file_path) and not re.match(RE_HIDDEN_FOLDER_PREFIXES, f) and FOLDERS in sort_order: # folder
+            if is_dir and not re.match(RE_HIDDEN_FOLDER_PREFIXES, f) and FOLDERS in sort_order: # folder
                 try:
                     if self.config[ENABLE_FOLDER_IMAGES]:
-                        folder_image_path = self.util.get_folder_image_path(real_path)
+                        folder_image_path = self.util.get_folder_image_path(real_path, load_folder_images)
                         if folder_image_path:
                             state.file_type = FOLDER_WITH_ICON
                             state.file_image_path = folder_image_path
+                        state.has_folder_image = bool(folder_image_path)
+                        if folder_image_path == False:
+                            state.has_folder_image = None
                     folders.append(state)
                 except PermissionError:
                     pass
-            elif os.path.isfile(file_path) and not f.startswith("."): # audio file
+            elif not is_dir and not f.startswith("."): # audio file
                 if show_file_details:
                     stats = os.stat(file_path)
                     state.file_size = stats.st_size
@@ -227,8 +268,10 @@ class FileUtil(object):
 
                 if self.is_audio_file(f) and  FILES in sort_order:
                     state.file_type = FILE_AUDIO
-                    if load_images and self.image_util.get_image_from_audio_file(file_path):
-                        state.has_embedded_image = True
+                    if load_images:
+                        state.has_embedded_image = self.image_util.has_embedded_image(file_path, probe=False)
+                        if state.has_embedded_image == None:
+                            unknown_images.append(file_path)
                     else:
                         state.has_embedded_image = False
                     audio_files.append(state)
@@ -268,6 +311,9 @@ class FileUtil(object):
 
         for n, f in enumerate(files):
             f.comparator_item = n
+
+        if unknown_images:
+            self.image_util.probe_embedded_images(unknown_images)
         
         return files
     
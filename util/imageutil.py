@@ -26,15 +26,22 @@ from util.config import SHOW_EMBEDDED_IMAGES, USAGE, USE_WEB, COLORS, COLOR_DARK
     SCREEN_INFO, WIDTH, HEIGHT, BACKGROUND, BLUR_RADIUS, OVERLAY_COLOR, OVERLAY_OPACITY, BACKGROUND_DEFINITIONS, \
     BGR_FILENAME, SCREEN_BGR_NAMES, ICONS, ICONS_COLOR_1_MAIN, ICONS_COLOR_1_ON, ICONS_COLOR_2_MAIN, ICONS_COLOR_2_ON, \
     IMAGE_SIZE_WITHOUT_LABEL, ICONS_TYPE, ICON_SIZE, GENERATED_IMAGE, COLOR_MEDIUM, HIDE_FOLDER_NAME, \
-    ENABLE_EMBEDDED_IMAGES, USE_ALBUM_ART
+    ENABLE_EMBEDDED_IMAGES, USE_ALBUM_ART, CACHE, THUMBNAIL_CACHE_FOLDER, THUMBNAIL_CACHE_SIZE, EMBEDDED_IMAGE_INDEX, \
+    BACKGROUND_CACHE_FOLDER, BACKGROUND_CACHE_SIZE, SCREENSAVER_BLUR_RADIUS
 from PIL import Image, ImageFilter
 from PIL.ImageColor import getcolor, getrgb
 from PIL.ImageOps import grayscale
 from io import BytesIO
 from svg import Parser, Rasterizer
 from util.fileutil import FOLDER, FOLDER_WITH_ICON, FILE_AUDIO, FILE_PLAYLIST, FILE_IMAGE, FILE_CD_DRIVE
+from util.thumbnailcache import ThumbnailCache
+from util.backgroundcache import BackgroundCache, build_background, paint_background
+from util.embeddedimageindex import EmbeddedImageIndex
+from concurrent.futures import ThreadPoolExecutor
 from urllib import request
 from urllib.request import urlopen
+from urllib.error import HTTPError
+from util.lookupcache import URL
 from mutagen.id3 import ID3
 from mutagen.flac import FLAC
 from mutagen.mp4 import MP4
@@ -67,6 +74,8 @@ BI_COLOR = "bi-color"
 GRADIENT = "gradient"
 
 HTTP_CONNECTION_TIMEOUT_SEC = 12
+HTTP_NOT_FOUND = [404, 410]
+ICON_LOADER_WORKERS = 4
 
 class ImageUtil(object):
     """ Image Utility class """
@@ -79,6 +88,7 @@ class ImageUtil(object):
         self.util = util
         self.config = util.config
         self.discogs_util = util.discogs_util
+        self.lookup_cache = util.lookup_cache
 
         self.COLOR_MAIN_1 = self.color_to_hex(self.config[ICONS][ICONS_COLOR_1_MAIN])
         self.COLOR_ON_1 = self.color_to_hex(self.config[ICONS][ICONS_COLOR_1_ON])
@@ -92,11 +102,24 @@ class ImageUtil(object):
         self.COLOR_OFF = self.color_to_hex(self.config[COLORS][COLOR_DARK_LIGHT])
         self.COLOR_MUTE = self.color_to_hex(self.config[COLORS][COLOR_MUTE])        
 
-        self.image_cache = {}
-        self.image_cache_base64 = {}
-        self.svg_cache = {}
-        self.background_cache = {}
-        self.album_art_url_cache = {}
+        self.memory_cache = util.memory_cache
+        self.image_cache = self.memory_cache.get_namespace("image")
+        self.image_cache_base64 = self.memory_cache.get_namespace("image.base64")
+        self.svg_cache = self.memory_cache.get_namespace("svg")
+        self.svg_sources = {}
+        self.pinned_images = set()
+        self.background_cache = self.memory_cache.get_namespace("background")
+        self.album_art_url_cache = self.memory_cache.get_namespace("album.art.url")
+        self.thumbnail_cache = None
+        if self.config[CACHE][THUMBNAIL_CACHE_SIZE] > 0:
+            self.thumbnail_cache = ThumbnailCache(self.config[CACHE][THUMBNAIL_CACHE_FOLDER], self.config[CACHE][THUMBNAIL_CACHE_SIZE])
+        self.embedded_image_index = EmbeddedImageIndex(self.config[CACHE][EMBEDDED_IMAGE_INDEX])
+        self.background_disk_cache = None
+        if self.config[CACHE][BACKGROUND_CACHE_SIZE] > 0:
+            self.background_disk_cache = BackgroundCache(self.config[CACHE][BACKGROUND_CACHE_FOLDER], self.config[CACHE][BACKGROUND_CACHE_SIZE])
+            self.prebuild_backgrounds()
+        self.icon_loader = ThreadPoolExecutor(max_workers=ICON_LOADER_WORKERS)
+        self.icon_futures = []
         self.FILE_EXTENSIONS_EMBEDDED_IMAGES = None
         if self.config[SHOW_EMBEDDED_IMAGES]:
             self.FILE_EXTENSIONS_EMBEDDED_IMAGES = ["." + s for s in self.config[SHOW_EMBEDDED_IMAGES]]
@@ -132,7 +155,9 @@ class ImageUtil(object):
             key = cache_key
         
         if EXT_SVG in path:
-            svg_image = self.svg_cache[path]
+            svg_image = self.get_svg_source(path)
+            if svg_image == None:
+                return None
             img = base64.b64encode(svg_image.encode()).decode()
             self.image_cache_base64[key] = img
             return img
@@ -154,6 +179,7 @@ class ImageUtil(object):
         """ Load image. 
         First, check if image is in the cache.
         If yes, return the image from the cache.
+        If not, check if the scaled image is in the thumbnail cache.
         If not load image file and place it in the cache.
         
         :param path: image path
@@ -173,6 +199,12 @@ class ImageUtil(object):
                 return (path, i)
             except KeyError:
                 pass
+
+            if bounding_box and self.thumbnail_cache:
+                img = self.thumbnail_cache.get_image(path, bounding_box)
+                if img:
+                    self.image_cache[path + str(bounding_box[0])] = img
+                    return (path, img)
             
         try:            
             image = pygame.image.load(path.encode("utf-8")).convert_alpha()            
@@ -186,6 +218,8 @@ class ImageUtil(object):
                 scale_ratio = self.get_scale_ratio(bounding_box, img)
                 img = self.scale_image(image, scale_ratio)
                 p = path + str(bounding_box[0])
+                if use_cache and self.thumbnail_cache:
+                    self.thumbnail_cache.cache_image(img, path, bounding_box)
             if use_cache:
                 self.image_cache[p] = img
             return (path, img)
@@ -203,10 +237,21 @@ class ImageUtil(object):
         """
         if not img: return
 
+        return self.get_size_scale_ratio(bounding_box, img.get_size(), fit_height, fit_width, fit_all)
+
+    def get_size_scale_ratio(self, bounding_box, size, fit_height=False, fit_width=False, fit_all=False):
+        """ Return scale ratio calculated from provided constraints (bounding box) and image size
+
+        :param bounding_box: bounding box
+        :param size: tuple (width, height) of the image
+        :param fit_height: True - fit image height to bounding box
+
+        :return: tuple representing scale ratio
+        """
         w = bounding_box[0]
         h = bounding_box[1]
-        width = img.get_size()[0]
-        height = img.get_size()[1]
+        width = size[0]
+        height = size[1]
         
         if (width >= w and height > h) or (width > w and height >= h):
             k1 = w/width
@@ -292,21 +337,93 @@ class ImageUtil(object):
         :param return_buffer: True - return image buffer, False - return Pygame image
         :return: image or None if not found
         """
-        if not filename: return None
+        if not self.is_embedded_image_enabled(filename): return None
+
+        name = filename.lower()
+
+        if name.endswith(EXT_MP3):
+            return self.get_image_from_mp3(filename, return_buffer)
+        elif name.endswith(EXT_FLAC):
+            return self.get_image_from_flac(filename, return_buffer)
+        else:
+            return self.get_image_from_mp4(filename, return_buffer)
+
+    def is_embedded_image_enabled(self, filename):
+        """ Check if embedded images are enabled for the file type
+
+        :param filename: file name
+        :return: True - enabled, False - disabled
+        """
+        if not filename or not self.FILE_EXTENSIONS_EMBEDDED_IMAGES: return False
 
         name = filename.lower()
 
         if name.endswith(EXT_MP3):
-            if self.FILE_EXTENSIONS_EMBEDDED_IMAGES and EXT_MP3 in self.FILE_EXTENSIONS_EMBEDDED_IMAGES:
-                return self.get_image_from_mp3(filename, return_buffer)
+            return EXT_MP3 in self.FILE_EXTENSIONS_EMBEDDED_IMAGES
         elif name.endswith(EXT_FLAC):
-            if self.FILE_EXTENSIONS_EMBEDDED_IMAGES and EXT_FLAC in self.FILE_EXTENSIONS_EMBEDDED_IMAGES:
-                return self.get_image_from_flac(filename, return_buffer)
+            return EXT_FLAC in self.FILE_EXTENSIONS_EMBEDDED_IMAGES
         elif name.endswith(EXT_MP4) or name.endswith(EXT_M4A):
-            if self.FILE_EXTENSIONS_EMBEDDED_IMAGES and ((EXT_MP4 in self.FILE_EXTENSIONS_EMBEDDED_IMAGES) or (EXT_M4A in self.FILE_EXTENSIONS_EMBEDDED_IMAGES)):
-                return self.get_image_from_mp4(filename, return_buffer)
+            return (EXT_MP4 in self.FILE_EXTENSIONS_EMBEDDED_IMAGES) or (EXT_M4A in self.FILE_EXTENSIONS_EMBEDDED_IMAGES)
 
-        return None
+        return False
+
+    def has_embedded_image(self, filename, probe=True):
+        """ Check if audio file has embedded image without loading the image
+
+        :param filename: file name
+        :param probe: True - read tag headers if the file is not in the index, False - use the index only
+        :return: True - has image, False - no image, None - unknown (only if probe is False)
+        """
+        if not self.is_embedded_image_enabled(filename): return False
+
+        if probe:
+            return self.embedded_image_index.probe(filename)
+        else:
+            return self.embedded_image_index.get(filename)
+
+    def probe_embedded_images(self, filenames):
+        """ Check audio files for embedded images in the background. The results are saved in the index.
+
+        :param filenames: list of audio file paths
+        """
+        self.icon_loader.submit(self.probe_audio_files, filenames)
+
+    def probe_audio_files(self, filenames):
+        """ Probe audio files and save the index. Called by the worker pool.
+
+        :param filenames: list of audio file paths
+        """
+        try:
+            for filename in filenames:
+                self.embedded_image_index.probe(filename)
+            self.embedded_image_index.save_later()
+        except Exception as e:
+            logging.debug(e)
+
+    def get_scaled_image_from_audio_file(self, filename, bounding_box):
+        """ Fetch image from audio file and scale it to the bounding box.
+        Use thumbnail cache if available.
+
+        :param filename: file name
+        :param bounding_box: tuple (width, height)
+        :return: scaled image or None if not found
+        """
+        if not self.is_embedded_image_enabled(filename): return None
+
+        if self.thumbnail_cache:
+            img = self.thumbnail_cache.get_image(filename, bounding_box)
+            if img:
+                return img
+
+        img = self.get_image_from_audio_file(filename)
+        if not img:
+            return None
+
+        ratio = self.get_scale_ratio(bounding_box, img)
+        scaled_img = self.scale_image(img, ratio)
+        if self.thumbnail_cache:
+            self.thumbnail_cache.cache_image(scaled_img, filename, bounding_box)
+        return scaled_img
 
     def get_image_from_mp3(self, filename, return_buffer=False):
         """ Fetch image from mp3 file
@@ -388,10 +505,8 @@ class ImageUtil(object):
         :return: audio file icon
         """
         if url:
-            img = self.get_image_from_audio_file(url)
-            if img:
-                ratio = self.get_scale_ratio((bb.w, bb.h), img)
-                scaled_img = self.scale_image(img, ratio)
+            scaled_img = self.get_scaled_image_from_audio_file(url, (bb.w, bb.h))
+            if scaled_img:
                 return (url, scaled_img)
 
         d = os.path.join(FOLDER_ICONS, DEFAULT_CD_IMAGE)
@@ -578,6 +693,30 @@ class ImageUtil(object):
         except KeyError:
             pass
         
+        s = self.get_colored_svg(path, color_1, color_2, gradient)
+
+        try:
+            bitmap_image = Parser.parse(s)
+        except:
+            logging.debug("Problem parsing file %s", path)
+            return None
+        
+        if self.config[USAGE][USE_WEB]:
+            self.svg_sources[cache_path] = (path, color_1, color_2, gradient)
+            self.svg_cache[cache_path] = s
+        
+        return self.scale_svg_image(cache_path, bitmap_image, bounding_box, scale)
+
+    def get_colored_svg(self, path, color_1, color_2=None, gradient=False):
+        """ Read monochrome SVG image and replace its colors
+
+        :param path: svg image path
+        :param color_1: base icon hex color
+        :param color_2: second hex color
+        :param gradient: True - create gradient, False - use solid colors
+
+        :return: SVG image text
+        """
         s = codecs.open(path, "r").read()
 
         if gradient:
@@ -592,17 +731,37 @@ class ImageUtil(object):
                 s = s.replace(SVG_DEFAULT_COLOR_1, color_2)
             else:
                 s = s.replace(SVG_DEFAULT_COLOR_1, color_1)
-        
+
+        return s
+
+    def get_svg_source(self, cache_path):
+        """ Get SVG image text for web UI. If the text was removed from cache
+        it's created again from the file and the colors used for the icon.
+
+        :param cache_path: icon cache key
+
+        :return: SVG image text or None if the icon is unknown
+        """
+        s = self.svg_cache.get(cache_path)
+        if s != None:
+            return s
+
+        source = self.svg_sources.get(cache_path)
+        if source == None:
+            return None
+
+        path, color_1, color_2, gradient = source
         try:
-            bitmap_image = Parser.parse(s)
-        except:
-            logging.debug("Problem parsing file %s", path)
+            if color_1 == None:
+                s = codecs.open(path, "r").read()
+            else:
+                s = self.get_colored_svg(path, color_1, color_2, gradient)
+        except Exception as e:
+            logging.debug(e)
             return None
-        
-        if self.config[USAGE][USE_WEB]:
-            self.svg_cache[cache_path] = s
-        
-        return self.scale_svg_image(cache_path, bitmap_image, bounding_box, scale)
+
+        self.svg_cache[cache_path] = s
+        return s
     
     def load_multi_color_svg_icon(self, filename, bounding_box=None, scale=1.0):
         """ Load SVG image
@@ -630,14 +789,43 @@ class ImageUtil(object):
             return None
 
         if self.config[USAGE][USE_WEB]:
-            try:
-                self.svg_cache[cache_path]
-            except KeyError:
-                t = cache_path.replace('\\','/')
+            t = cache_path.replace('\\','/')
+            self.svg_sources[t] = (path, None, None, False)
+            if t not in self.svg_cache:
                 self.svg_cache[t] = codecs.open(path, "r").read()
         
         return self.scale_svg_image(cache_path, svg_image, bounding_box, scale)
 
+    def pin_screen_images(self, screen):
+        """ Protect images of the current screen from eviction. The images pinned for the previous screen are unpinned.
+
+        :param screen: the current screen
+        """
+        keys = set()
+        self.collect_image_keys(screen, keys)
+
+        for key in self.pinned_images - keys:
+            self.image_cache.unpin_key(key)
+            self.svg_cache.unpin_key(key)
+        for key in keys - self.pinned_images:
+            self.image_cache.pin_key(key)
+            self.svg_cache.pin_key(key)
+        self.pinned_images = keys
+
+    def collect_image_keys(self, component, keys):
+        """ Collect cache keys of the component images
+
+        :param component: component or container
+        :param keys: set of keys
+        """
+        content = getattr(component, "content", None)
+        if isinstance(content, tuple) and len(content) > 1 and isinstance(content[0], str):
+            keys.add(content[0])
+
+        for c in getattr(component, "components", None) or []:
+            if c:
+                self.collect_image_keys(c, keys)
+
     def scale_svg_image(self, cache_path, svg_image, bounding_box=None, scale=1.0):
         """ Scale SVG image
         
@@ -817,14 +1005,8 @@ class ImageUtil(object):
         else:
             icon_box = (icon_size, icon_size)
 
-        image_size = self.config[IMAGE_SIZE]
         if icon_bb:
-            if show_label:
-                image_box = ((icon_bb[0] /100) * image_size, (icon_bb[1] / 100) * image_size)
-            else:
-                w = (icon_bb[0] / 100) * self.config[IMAGE_SIZE_WITHOUT_LABEL]
-                h = (icon_bb[1] / 100) * self.config[IMAGE_SIZE_WITHOUT_LABEL]
-                image_box = (w, h)
+            image_box = self.get_file_image_box(icon_bb, show_label)
 
         if file_type == FOLDER:
             ratio = self.get_scale_ratio(icon_box, icon_folder[1])
@@ -832,13 +1014,11 @@ class ImageUtil(object):
             return (icon_folder[0], scaled_img)
         elif file_type == FILE_AUDIO:
             if self.config[ENABLE_EMBEDDED_IMAGES]:
-                img = self.get_image_from_audio_file(url)
+                scaled_img = self.get_scaled_image_from_audio_file(url, image_box)
             else:
-                img = None
+                scaled_img = None
 
-            if img:
-                ratio = self.get_scale_ratio(image_box, img)
-                scaled_img = self.scale_image(img, ratio)
+            if scaled_img:
                 return (url, scaled_img)
             else:
                 ratio = self.get_scale_ratio(icon_box, icon_file_audio[1])
@@ -868,6 +1048,20 @@ class ImageUtil(object):
                 scaled_img = self.scale_image(icon_image_file, ratio)
                 return (icon_image_file[0], scaled_img)
 
+    def get_file_image_box(self, icon_bb, show_label=True):
+        """ Get the bounding box of the image which is shown instead of the file icon
+
+        :param icon_bb: tuple (width, height) of the icon bounding box
+        :param show_label: True - take label into account
+
+        :return: tuple (width, height)
+        """
+        if show_label:
+            image_size = self.config[IMAGE_SIZE]
+        else:
+            image_size = self.config[IMAGE_SIZE_WITHOUT_LABEL]
+        return ((icon_bb[0] / 100) * image_size, (icon_bb[1] / 100) * image_size)
+
     def get_cd_album_art(self, album, bb):
         """ Return album art image
         
@@ -896,7 +1090,7 @@ class ImageUtil(object):
                 return (url, i)
             except KeyError:
                 pass
-            img = self.load_image_from_url(url)
+            img = self.load_image_from_url(url, True)
         
         if img == None:
             return None
@@ -981,18 +1175,27 @@ class ImageUtil(object):
         else:
             return "#%06x" % ((color[0] << 16) + (color[1] << 8) + color[2])
 
-    def load_image_from_url(self, url):
+    def load_image_from_url(self, url, cache=False):
         """ Load image from specified URL
         
         :param url: image url
+        :param cache: True - keep image in the persistent lookup cache (album art), False - always download
         
         :return: image from url
         """
-        try:
-            hdrs = {'User-Agent': 'PeppyPlayer + https://github.com/project-owner/Peppy'}
-            req = request.Request(url, headers=hdrs)
-            stream = urlopen(req, timeout=HTTP_CONNECTION_TIMEOUT_SEC).read()
+        if cache:
+            stream = self.lookup_cache.get(URL, url, self.fetch_url, False)
+        else:
+            try:
+                stream = self.fetch_url(url)
+            except Exception as e:
+                logging.debug(e)
+                return None
+
+        if stream == None:
+            return None
 
+        try:
             buf = BytesIO(stream)
             image = pygame.image.load(buf).convert_alpha()
             return (url, image)
@@ -1000,6 +1203,22 @@ class ImageUtil(object):
             logging.debug(e)
             return None
 
+    def fetch_url(self, url):
+        """ Download content from specified URL. The network errors are not handled.
+
+        :param url: content url
+
+        :return: content bytes or None if the content was not found
+        """
+        hdrs = {'User-Agent': 'PeppyPlayer + https://github.com/project-owner/Peppy'}
+        req = request.Request(url, headers=hdrs)
+        try:
+            return urlopen(req, timeout=HTTP_CONNECTION_TIMEOUT_SEC).read()
+        except HTTPError as e:
+            if e.code in HTTP_NOT_FOUND:
+                return None
+            raise
+
     def scale_image_with_padding(self, w, h, img, padding=0, scale_factor=1):
         """ Scale image using specified padding and scale factor
         
@@ -1069,23 +1288,28 @@ class ImageUtil(object):
         :return: new painted surface
         """
         image = surface
-        size = surface.get_size()
-        result = pygame.Surface(size)
-        result.fill((0, 0, 0), None, pygame.BLEND_RGB_ADD)
-        overlay = section[OVERLAY_COLOR]
-        overlay_opacity = section[OVERLAY_OPACITY]
         blur_radius = section[BLUR_RADIUS]
 
         if blur_radius and blur_radius > 0:
             image = self.blur_image(image, blur_radius)
 
-        if overlay:
-            image.fill(overlay, None, pygame.BLEND_RGBA_ADD)
-            image.fill((255, 255, 255, overlay_opacity), None, pygame.BLEND_RGBA_MULT)
+        return paint_background(image, section[OVERLAY_COLOR], section[OVERLAY_OPACITY])
 
-        result.blit(image, (0, 0))
+    def prebuild_backgrounds(self):
+        """ Start preparing all background variants in the separate process.
+        The variants which are already in the disk cache are skipped.
+        """
+        size = (self.config[SCREEN_INFO][WIDTH], self.config[SCREEN_INFO][HEIGHT])
+        jobs = []
+        for definition in self.config[BACKGROUND_DEFINITIONS].values():
+            filename = definition.get(BGR_FILENAME)
+            if not filename:
+                continue
+            path = os.path.join(FOLDER_BACKGROUNDS, filename)
+            for blur_radius in sorted(set([definition[BLUR_RADIUS], SCREENSAVER_BLUR_RADIUS])):
+                jobs.append((path, size, blur_radius, definition[OVERLAY_COLOR], definition[OVERLAY_OPACITY]))
 
-        return result
+        self.background_disk_cache.start_prebuild(jobs)
 
     def get_background_count(self):
         """ Get background count
@@ -1125,12 +1349,12 @@ class ImageUtil(object):
             return None
 
         filename = info[BGR_FILENAME]
-        image = None
         cache_key = filename
 
         if blur_radius:
             cache_key = filename + "." + str(blur_radius)
-            info[BLUR_RADIUS] = blur_radius
+        else:
+            blur_radius = info[BLUR_RADIUS]
 
         try:
             image = self.background_cache[cache_key]
@@ -1139,27 +1363,24 @@ class ImageUtil(object):
             pass
 
         path = os.path.join(FOLDER_BACKGROUNDS, filename)
-        image = self.load_pygame_image(path, None, use_cache=False)
+        size = (self.config[SCREEN_INFO][WIDTH], self.config[SCREEN_INFO][HEIGHT])
+        variant = (path, size, blur_radius, info[OVERLAY_COLOR], info[OVERLAY_OPACITY])
+        i = None
 
-        if not image:
-            return None
+        if self.background_disk_cache:
+            i = self.background_disk_cache.get_image(*variant)
 
-        w = self.config[SCREEN_INFO][WIDTH]
-        h = self.config[SCREEN_INFO][HEIGHT]
-        width = image[1].get_size()[0]
-        height = image[1].get_size()[1]
-                
-        if width == w and height == h:
-            i = self.prepare_background(image, info)            
-        else:
-            ratio = min(width / w, height / h)
-            scale_ratio = (int(width / ratio), int(height / ratio))
-            img = self.scale_image(image[1], scale_ratio)
-            i = self.prepare_background(img, info)
+        if i == None:
+            i = build_background(*variant)
+            if i == None:
+                return None
+            if self.background_disk_cache:
+                self.background_disk_cache.cache_image(i, *variant)
 
-        self.background_cache[cache_key] = (filename, i, info["num"])
+        bgr = (filename, i, info["num"])
+        self.background_cache[cache_key] = bgr
 
-        return self.background_cache[cache_key]
+        return bgr
 
     def tint_image(self, src):
         """ Tint the provided image 
@@ -1241,13 +1462,22 @@ class ImageUtil(object):
         state.state_off_image = state.icon_base = (GENERATED_IMAGE + state.name + ".off", images[1])
         state.state_on_image = (GENERATED_IMAGE + state.name + ".on", images[0])
 
-    def add_file_icon(self, page, icon_box, icon_box_without_label):
-        """ Set file icons
+    def add_file_icon(self, page, icon_box, icon_box_without_label, icon_listener=None):
+        """ Set file icons. If it's unknown whether audio file has embedded image or folder has image
+        and the listener is provided then the default icon is set and the file or folder is probed
+        by the worker pool. The listener is called by the main loop when the image is loaded.
+        Unfinished tasks of the previous page are cancelled.
 
         :param page: page items
         :param icon_box: icon bounding box
         :param icon_box_without_label: icon bounding box without label
+        :param icon_listener: function which takes the state with the new icon
         """
+        if icon_listener:
+            for f in self.icon_futures:
+                f.cancel()
+            self.icon_futures = []
+
         for s in page:
             if getattr(s, "icon_base", None) != None:
                 continue 
@@ -1260,8 +1490,111 @@ class ImageUtil(object):
                 s.show_label = True
                 w = icon_box.w
                 h = icon_box.h
+
+            url = s.url
+            pending = False
+            if s.file_type == FILE_AUDIO and hasattr(s, "has_embedded_image") and not has_embedded_image:
+                url = None
+                pending = has_embedded_image == None and self.config[ENABLE_EMBEDDED_IMAGES] and self.is_embedded_image_enabled(s.url)
+            elif s.file_type == FOLDER and getattr(s, "has_folder_image", False) == None:
+                pending = True
                 
-            s.icon_base = self.get_file_icon(s.file_type, getattr(s, "file_image_path", ""), (w, h), url=s.url, show_label=s.show_label)
+            s.icon_base = self.get_file_icon(s.file_type, getattr(s, "file_image_path", ""), (w, h), url=url, show_label=s.show_label)
+
+            if pending and icon_listener:
+                self.icon_futures.append(self.icon_loader.submit(self.load_file_icon, s, (w, h), icon_listener))
+
+    def load_file_icon(self, s, bounding_box, icon_listener):
+        """ Find embedded image of audio file or folder image and read its pixels.
+        Called by the worker pool. Only files are read here, the state and the icon
+        are updated by the main loop in set_file_icon.
+
+        :param s: file state
+        :param bounding_box: icon bounding box
+        :param icon_listener: function which takes the state with the new icon
+        """
+        try:
+            image_box = self.get_file_image_box(bounding_box, s.show_label)
+            if s.file_type == FILE_AUDIO:
+                has_embedded_image = self.embedded_image_index.probe(s.url)
+                self.embedded_image_index.save_later()
+                path = s.url
+                pixels = self.read_image_pixels(path, image_box, True) if has_embedded_image else None
+                self.util.scheduler.post(self.set_file_icon, s, has_embedded_image, None, pixels, image_box, icon_listener)
+            else:
+                path = self.util.get_folder_image_path(s.url)
+                pixels = self.read_image_pixels(path, image_box) if path else None
+                self.util.scheduler.post(self.set_file_icon, s, None, path, pixels, image_box, icon_listener)
+        except Exception as e:
+            logging.debug(e)
+
+    def read_image_pixels(self, path, bounding_box, embedded=False):
+        """ Read image, scale it and return its pixels. The thumbnail cache is used if available.
+        The method doesn't create Pygame surfaces, so it can be called by the worker thread.
+
+        :param path: image file or audio file path
+        :param bounding_box: tuple (width, height)
+        :param embedded: True - read image embedded in audio file, False - read image file
+
+        :return: tuple (size, RGBA bytes) or None
+        """
+        if self.thumbnail_cache:
+            pixels = self.thumbnail_cache.get_pixels(path, bounding_box)
+            if pixels:
+                return pixels
+
+        try:
+            if embedded:
+                buffer = self.get_image_from_audio_file(path, True)
+                if not buffer:
+                    return None
+            else:
+                buffer = open(path, "rb")
+            with buffer:
+                img = Image.open(buffer).convert("RGBA")
+                ratio = self.get_size_scale_ratio(bounding_box, img.size)
+                img = img.resize(ratio)
+        except Exception as e:
+            logging.debug(e)
+            return None
+
+        pixels = (img.size, img.tobytes())
+        if self.thumbnail_cache:
+            self.thumbnail_cache.cache_pixels(pixels[0], pixels[1], path, bounding_box)
+        return pixels
+
+    def set_file_icon(self, s, has_embedded_image, folder_image_path, pixels, image_box, icon_listener):
+        """ Update file state and create the icon from the pixels read by the worker pool.
+        Called by the main loop.
+
+        :param s: file state
+        :param has_embedded_image: True - audio file has image, False - no image, None - folder
+        :param folder_image_path: folder image path or None
+        :param pixels: tuple (size, RGBA bytes) or None
+        :param image_box: image bounding box
+        :param icon_listener: function which takes the state with the new icon
+        """
+        try:
+            if s.file_type == FILE_AUDIO:
+                s.has_embedded_image = has_embedded_image
+                path = s.url
+            else:
+                s.has_folder_image = bool(folder_image_path)
+                path = folder_image_path
+
+            if pixels == None:
+                return
+
+            image = pygame.image.fromstring(pixels[1], pixels[0], "RGBA").convert_alpha()
+            if s.file_type != FILE_AUDIO:
+                s.file_type = FOLDER_WITH_ICON
+                s.file_image_path = folder_image_path
+                self.image_cache[path + str(image_box[0])] = image
+
+            s.icon_base = (path, image)
+            icon_listener(s)
+        except Exception as e:
+            logging.debug(e)
 
     def get_album_art_bgr(self, image):
         """ Get album art background image
@@ -87,6 +87,7 @@ USER_EVENT_TYPE = pygame.USEREVENT + 1
 VOICE_EVENT_TYPE = pygame.USEREVENT + 2
 REST_EVENT_TYPE = pygame.USEREVENT + 3
 SELECT_EVENT_TYPE = pygame.USEREVENT + 4
+WAKEUP_EVENT_TYPE = pygame.USEREVENT + 5
 SUB_TYPE_KEYBOARD = 0
 KEY_SUB_TYPE = "sub_type"
 KEY_ACTION = "action"
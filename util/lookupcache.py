@@ -0,0 +1,346 @@
+# Copyright 2026 Peppy Player peppy.player@gmail.com
+#
+# This file is part of Peppy Player.
+#
+# Peppy Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Peppy Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import time
+import sqlite3
+import logging
+import unicodedata
+
+from threading import RLock, Event
+from concurrent.futures import ThreadPoolExecutor
+
+DISCOGS = "discogs"
+LYRICS = "lyrics"
+URL = "url"
+
+DAY = 24 * 60 * 60
+SOURCE_TTL = {
+    DISCOGS: (30 * DAY, DAY),
+    LYRICS: (30 * DAY, DAY),
+    URL: (7 * DAY, 60 * 60)
+}
+DEFAULT_TTL = (DAY, 60 * 60)
+
+KIND_NONE = 0
+KIND_TEXT = 1
+KIND_BYTES = 2
+
+MAX_WORKERS = 2
+MAX_VALUE_SIZE = 2 * 1024 * 1024
+TRIM_PERIOD = 32
+TRIM_RATIO = 0.9
+
+class Request(object):
+    """ The request in progress. The threads asking for the same key wait for its result. """
+
+    def __init__(self):
+        """ Initializer """
+
+        self.event = Event()
+        self.value = None
+
+class LookupCache(object):
+    """ Persistent cache of the web lookups (album art URLs, lyrics, downloaded images).
+    The results are saved in SQLite database with the time-to-live defined per source.
+    Not found results are cached as well but with the shorter TTL. The failed requests
+    (network errors) are not cached. The concurrent requests for the same key are sent
+    only once, other threads wait for the result of the first one.
+    """
+
+    lock = RLock()
+
+    def __init__(self, path, max_size, ttl=SOURCE_TTL, max_workers=MAX_WORKERS):
+        """ Initializer
+
+        :param path: database file path
+        :param max_size: the maximum size of the cached values in bytes
+        :param ttl: dictionary where key is source and value is tuple (found TTL, not found TTL) in seconds
+        :param max_workers: the number of prefetch threads
+        """
+        self.path = path
+        self.max_size = max_size
+        self.ttl = ttl
+        self.requests = {}
+        self.prefetchers = []
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.inserts = 0
+        self.hits = 0
+        self.misses = 0
+        self.fetches = 0
+        self.shared = 0
+        self.connection = self.connect(path)
+        self.purge()
+
+    def connect(self, path):
+        """ Open database, create table if required. In-memory database is used if the file cannot be opened.
+
+        :param path: database file path
+
+        :return: database connection
+        """
+        try:
+            folder = os.path.dirname(path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            connection = sqlite3.connect(path, check_same_thread=False)
+            self.create_table(connection)
+        except Exception as e:
+            logging.debug(e)
+            connection = sqlite3.connect(":memory:", check_same_thread=False)
+            self.create_table(connection)
+        return connection
+
+    def create_table(self, connection):
+        """ Create lookup table
+
+        :param connection: database connection
+        """
+        connection.execute("""CREATE TABLE IF NOT EXISTS lookup (
+            source TEXT NOT NULL,
+            key TEXT NOT NULL,
+            kind INTEGER NOT NULL,
+            value BLOB,
+            size INTEGER NOT NULL,
+            stored REAL NOT NULL,
+            expires REAL NOT NULL,
+            PRIMARY KEY (source, key))""")
+        connection.execute("CREATE INDEX IF NOT EXISTS lookup_stored ON lookup (stored)")
+        connection.commit()
+
+    def get(self, source, query, fetch, normalize=True):
+        """ Get value from cache or fetch it
+
+        :param source: source name e.g. DISCOGS
+        :param query: lookup query e.g. 'artist - title' or URL
+        :param fetch: function which gets value for query. It should return None if nothing was found
+            and raise exception if the request failed.
+        :param normalize: True - normalize query, False - use query as is (e.g. for URLs)
+
+        :return: value (string or bytes) or None if not found
+        """
+        if query == None:
+            return None
+
+        key = get_key(query) if normalize else query
+        if not key:
+            return None
+
+        with self.lock:
+            found, value = self.get_cached(source, key)
+            if found:
+                self.hits += 1
+                return value
+
+            request = self.requests.get((source, key))
+            owner = request == None
+            if owner:
+                request = Request()
+                self.requests[(source, key)] = request
+                self.misses += 1
+            else:
+                self.shared += 1
+
+        if not owner:
+            request.event.wait()
+            return request.value
+
+        value = None
+        try:
+            with self.lock:
+                self.fetches += 1
+            value = fetch(query)
+            self.put(source, key, value)
+        except Exception as e:
+            logging.debug(e)
+            value = None
+        finally:
+            request.value = value
+            with self.lock:
+                self.requests.pop((source, key), None)
+            request.event.set()
+
+        return value
+
+    def get_cached(self, source, key):
+        """ Get value from database
+
+        :param source: source name
+        :param key: normalized query
+
+        :return: tuple (found, value). found is False if the key is not in cache or expired
+        """
+        with self.lock:
+            try:
+                row = self.connection.execute("SELECT kind, value, expires FROM lookup WHERE source=? AND key=?",
+                    (source, key)).fetchone()
+            except Exception as e:
+                logging.debug(e)
+                return (False, None)
+
+        if row == None or row[2] < time.time():
+            return (False, None)
+
+        kind, value = row[0], row[1]
+        if kind == KIND_NONE:
+            return (True, None)
+        elif kind == KIND_TEXT:
+            return (True, bytes(value).decode("utf-8"))
+        else:
+            return (True, bytes(value))
+
+    def put(self, source, key, value):
+        """ Save value in database
+
+        :param source: source name
+        :param key: normalized query
+        :param value: string, bytes or None for not found result
+        """
+        if value == None:
+            kind, data = KIND_NONE, None
+        elif isinstance(value, str):
+            kind, data = KIND_TEXT, value.encode("utf-8")
+        else:
+            kind, data = KIND_BYTES, bytes(value)
+
+        size = len(data) if data != None else 0
+        if size > MAX_VALUE_SIZE:
+            return
+
+        found_ttl, not_found_ttl = self.ttl.get(source, DEFAULT_TTL)
+        now = time.time()
+        expires = now + (not_found_ttl if kind == KIND_NONE else found_ttl)
+
+        with self.lock:
+            try:
+                self.connection.execute("INSERT OR REPLACE INTO lookup VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (source, key, kind, data, size, now, expires))
+                self.connection.commit()
+            except Exception as e:
+                logging.debug(e)
+                return
+
+            self.inserts += 1
+            if self.inserts % TRIM_PERIOD == 0:
+                self.trim()
+
+    def add_prefetcher(self, prefetcher):
+        """ Add prefetch function. It's called in the background for each prefetched query.
+
+        :param prefetcher: function with query argument, usually the cached lookup e.g. LyricsUtil.get_lyrics
+        """
+        with self.lock:
+            if prefetcher not in self.prefetchers:
+                self.prefetchers.append(prefetcher)
+
+    def remove_prefetcher(self, prefetcher):
+        """ Remove prefetch function
+
+        :param prefetcher: prefetch function
+        """
+        with self.lock:
+            if prefetcher in self.prefetchers:
+                self.prefetchers.remove(prefetcher)
+
+    def prefetch(self, query):
+        """ Run all prefetch functions for the query in the background.
+        The following lookups for the same query either find the result in cache
+        or wait for the request which is already in progress.
+
+        :param query: lookup query e.g. 'artist - title'
+        """
+        if not query:
+            return
+
+        with self.lock:
+            prefetchers = list(self.prefetchers)
+
+        for prefetcher in prefetchers:
+            self.executor.submit(self.run_prefetcher, prefetcher, query)
+
+    def run_prefetcher(self, prefetcher, query):
+        """ Thread method. Call prefetch function.
+
+        :param prefetcher: prefetch function
+        :param query: lookup query
+        """
+        try:
+            prefetcher(query)
+        except Exception as e:
+            logging.debug(e)
+
+    def purge(self):
+        """ Remove expired entries and trim database to the maximum size """
+
+        with self.lock:
+            try:
+                self.connection.execute("DELETE FROM lookup WHERE expires < ?", (time.time(),))
+                self.connection.commit()
+            except Exception as e:
+                logging.debug(e)
+            self.trim()
+
+    def trim(self):
+        """ Remove the oldest entries if the total size exceeds the maximum size """
+
+        with self.lock:
+            try:
+                total = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM lookup").fetchone()[0]
+                if total <= self.max_size:
+                    return
+
+                excess = total - int(self.max_size * TRIM_RATIO)
+                keys = []
+                for source, key, size in self.connection.execute("SELECT source, key, size FROM lookup ORDER BY stored"):
+                    keys.append((source, key))
+                    excess -= size
+                    if excess <= 0:
+                        break
+
+                self.connection.executemany("DELETE FROM lookup WHERE source=? AND key=?", keys)
+                self.connection.commit()
+            except Exception as e:
+                logging.debug(e)
+
+    def get_statistics(self):
+        """ Get statistics
+
+        :return: dictionary with the number of hits, misses, fetches and shared requests
+        """
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "fetches": self.fetches, "shared": self.shared}
+
+    def close(self):
+        """ Stop prefetch threads and close database """
+
+        self.executor.shutdown(wait=False)
+        with self.lock:
+            try:
+                self.connection.close()
+            except Exception as e:
+                logging.debug(e)
+
+def get_key(query):
+    """ Normalize query: unicode normalization, lower case, single spaces, spaces around dash
+
+    :param query: query e.g. 'Artist  -  Title'
+
+    :return: normalized query e.g. 'artist - title'
+    """
+    s = unicodedata.normalize("NFKC", query).lower()
+    tokens = [" ".join(t.split()) for t in s.split("-")]
+    return " - ".join(tokens).strip(" -")
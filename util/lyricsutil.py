@@ -16,20 +16,29 @@
 # along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
 
 import json
+import logging
+
 from urllib import request
 from urllib.parse import quote
+from util.lookupcache import LYRICS
+
+HTTP_TIMEOUT_SEC = 5
+STATUS_OK = 200
+STATUS_NOT_FOUND = 404
 
 class LyricsUtil(object):
     """ Lyrics utility class """
     
-    def __init__(self, t, lines, line_length):
+    def __init__(self, t, lines, line_length, lookup_cache=None):
         """ Initializer
         
         :param t: token
         :param lines: number of lyrics lines on screen
         :param line_length: maximum line length
+        :param lookup_cache: persistent lookup cache, None - no caching
         """
         self.key = t
+        self.lookup_cache = lookup_cache
         self.lines = lines
         self.line_length = line_length
         self.musixmatch_url_template = "https://api.musixmatch.com/ws/1.1/matcher.lyrics.get?format=jsonp&callback=callback&q_artist={artist}&q_track={track}&apikey={key}"
@@ -47,12 +56,31 @@ class LyricsUtil(object):
         return lyrics
 
     def get_musixmatch_lyrics(self, query_string):
-        """ Get lyrics from musixmatch
+        """ Get lyrics from musixmatch. The result is taken from the lookup cache if available.
         
         :param query_string: query string
         
         :return: lyrics text
         """
+        if query_string == None:
+            return None
+
+        if self.lookup_cache == None:
+            try:
+                return self.fetch_musixmatch_lyrics(query_string)
+            except Exception as e:
+                logging.debug(e)
+                return None
+
+        return self.lookup_cache.get(LYRICS, query_string, self.fetch_musixmatch_lyrics)
+
+    def fetch_musixmatch_lyrics(self, query_string):
+        """ Fetch lyrics from musixmatch. The network errors are not handled.
+        
+        :param query_string: query string
+        
+        :return: lyrics text or None if lyrics not found
+        """
         lyrics = None
         tokens = query_string.split("-")
         if tokens == None or len(tokens) == 1:
@@ -71,32 +99,24 @@ class LyricsUtil(object):
         
         status_code = j["message"]["header"]["status_code"]
         
-        if status_code == 200:
+        if status_code == STATUS_OK:
             lyrics = j["message"]["body"]["lyrics"]["lyrics_body"]
             if lyrics != None and len(lyrics.strip()) == 0:
                 lyrics = None
-        elif status_code == 401:
-            print("limit reached")
+        elif status_code != STATUS_NOT_FOUND:
+            raise RuntimeError(f"""Musixmatch request failed, status code: {status_code}""")
         
         return lyrics
     
     def get_response(self, url):
-        """ Get HTTP response for provided URL
+        """ Get HTTP response for provided URL. The network errors are not handled.
         
         :param url: the query URL
         
         :return: HTTP response in the form of JSON object
         """
         req = request.Request(url)
-        site = None
-        
-        try:
-            site = request.urlopen(req)
-        except:
-            pass
-            
-        if site == None:
-            return None
+        site = request.urlopen(req, timeout=HTTP_TIMEOUT_SEC)
                
         charset = site.info().get_content_charset()
         html = site.read()
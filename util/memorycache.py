@@ -0,0 +1,301 @@
+# Copyright 2026 Peppy Player peppy.player@gmail.com
+#
+# This file is part of Peppy Player.
+#
+# Peppy Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Peppy Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
+
+import sys
+import logging
+import pygame
+
+from collections import OrderedDict
+from threading import RLock
+
+MEGABYTE = 1024 * 1024
+EVICTION_RATIO = 0.9
+
+class MemoryCache(object):
+    """ Memory cache shared by all utilities. The size of each entry is estimated in bytes
+    (surface width x height x bytes per pixel). The least recently used entries are removed
+    when the total size exceeds the budget. Pinned entries are counted but never removed.
+    Entries are separated by namespaces, each namespace has its own hit/miss statistics.
+    """
+
+    lock = RLock()
+
+    def __init__(self, max_size):
+        """ Initializer
+
+        :param max_size: cache budget in megabytes, 0 - no limit
+        """
+        self.max_size = max_size * MEGABYTE
+        self.entries = OrderedDict()
+        self.pinned = OrderedDict()
+        self.total_size = 0
+        self.namespaces = {}
+
+    def get_namespace(self, name, pin=False):
+        """ Get namespace view. The view can be used as a dictionary.
+
+        :param name: namespace name
+        :param pin: True - pin all entries of the namespace, False - use LRU eviction
+
+        :return: namespace view
+        """
+        with self.lock:
+            try:
+                return self.namespaces[name]
+            except KeyError:
+                pass
+            n = CacheNamespace(self, name, pin)
+            self.namespaces[name] = n
+            return n
+
+    def get(self, namespace, key):
+        """ Get cached value
+
+        :param namespace: namespace view
+        :param key: entry key
+
+        :return: cached value
+
+        :raise KeyError: entry not in cache
+        """
+        k = (namespace.name, key)
+        with self.lock:
+            try:
+                e = self.pinned[k]
+            except KeyError:
+                try:
+                    e = self.entries[k]
+                    self.entries.move_to_end(k)
+                except KeyError:
+                    namespace.misses += 1
+                    raise
+            namespace.hits += 1
+            return e[0]
+
+    def put(self, namespace, key, value, pin=False):
+        """ Put value in cache
+
+        :param namespace: namespace view
+        :param key: entry key
+        :param value: value to cache
+        :param pin: True - never remove the entry, False - the entry can be removed
+        """
+        k = (namespace.name, key)
+        size = self.get_size(value)
+        with self.lock:
+            self.delete(namespace, k)
+            if pin or namespace.pin or k in namespace.pinned_keys:
+                self.pinned[k] = (value, size)
+            else:
+                self.entries[k] = (value, size)
+            namespace.size += size
+            self.total_size += size
+            if self.max_size and self.total_size > self.max_size:
+                self.evict(k)
+
+    def remove(self, namespace, key):
+        """ Remove entry from cache
+
+        :param namespace: namespace view
+        :param key: entry key
+        """
+        with self.lock:
+            self.delete(namespace, (namespace.name, key))
+
+    def delete(self, namespace, k):
+        """ Delete entry and update the size counters
+
+        :param namespace: namespace view
+        :param k: tuple (namespace name, entry key)
+
+        :return: True - entry deleted, False - entry not in cache
+        """
+        e = self.pinned.pop(k, None) or self.entries.pop(k, None)
+        if e == None:
+            return False
+        namespace.size -= e[1]
+        self.total_size -= e[1]
+        return True
+
+    def pin(self, namespace, key):
+        """ Protect entry from eviction. The key is pinned even if it's not in cache yet.
+
+        :param namespace: namespace view
+        :param key: entry key
+        """
+        k = (namespace.name, key)
+        with self.lock:
+            namespace.pinned_keys.add(k)
+            e = self.entries.pop(k, None)
+            if e != None:
+                self.pinned[k] = e
+
+    def unpin(self, namespace, key):
+        """ Allow eviction of the entry
+
+        :param namespace: namespace view
+        :param key: entry key
+        """
+        k = (namespace.name, key)
+        with self.lock:
+            namespace.pinned_keys.discard(k)
+            if namespace.pin:
+                return
+            e = self.pinned.pop(k, None)
+            if e != None:
+                self.entries[k] = e
+
+    def clear(self, namespace):
+        """ Remove all entries of the namespace
+
+        :param namespace: namespace view
+        """
+        with self.lock:
+            keys = [k for k in list(self.entries) + list(self.pinned) if k[0] == namespace.name]
+            for k in keys:
+                self.delete(namespace, k)
+
+    def evict(self, keep=None):
+        """ Remove the least recently used entries until the total size is below the budget
+
+        :param keep: tuple (namespace name, entry key) of the entry which should not be removed
+        """
+        target = self.max_size * EVICTION_RATIO
+        n = 0
+        while self.entries and self.total_size > target:
+            if next(iter(self.entries)) == keep:
+                break
+            k, e = self.entries.popitem(last=False)
+            self.namespaces[k[0]].size -= e[1]
+            self.total_size -= e[1]
+            n += 1
+        logging.debug(f"""Memory cache: removed {n} entries, size: {self.total_size} bytes""")
+
+    def get_size(self, value):
+        """ Estimate the memory size of the value
+
+        :param value: cached value
+
+        :return: size in bytes
+        """
+        if value is None:
+            return 0
+        elif isinstance(value, pygame.Surface):
+            return value.get_width() * value.get_height() * value.get_bytesize()
+        elif isinstance(value, (str, bytes, bytearray)):
+            return len(value)
+        elif isinstance(value, (tuple, list)):
+            return sum(self.get_size(v) for v in value)
+        else:
+            return sys.getsizeof(value)
+
+    def get_statistics(self):
+        """ Get cache statistics
+
+        :return: dictionary where key - namespace name, value - dictionary with hits, misses, size and number of entries
+        """
+        with self.lock:
+            stats = {}
+            for name, n in self.namespaces.items():
+                stats[name] = {"hits": n.hits, "misses": n.misses, "size": n.size, "entries": len(n)}
+            return stats
+
+class CacheNamespace(object):
+    """ Dictionary-like view of one namespace of the memory cache """
+
+    def __init__(self, cache, name, pin=False):
+        """ Initializer
+
+        :param cache: memory cache
+        :param name: namespace name
+        :param pin: True - pin all entries, False - use LRU eviction
+        """
+        self.cache = cache
+        self.name = name
+        self.pin = pin
+        self.pinned_keys = set()
+        self.hits = 0
+        self.misses = 0
+        self.size = 0
+
+    def __getitem__(self, key):
+        return self.cache.get(self, key)
+
+    def __setitem__(self, key, value):
+        self.cache.put(self, key, value)
+
+    def __delitem__(self, key):
+        with self.cache.lock:
+            if not self.cache.delete(self, (self.name, key)):
+                raise KeyError(key)
+
+    def __contains__(self, key):
+        k = (self.name, key)
+        with self.cache.lock:
+            return k in self.cache.entries or k in self.cache.pinned
+
+    def __len__(self):
+        with self.cache.lock:
+            return len([k for k in list(self.cache.entries) + list(self.cache.pinned) if k[0] == self.name])
+
+    def get(self, key, default=None):
+        """ Get cached value
+
+        :param key: entry key
+        :param default: value returned if the key is not in cache
+
+        :return: cached value or default
+        """
+        try:
+            return self.cache.get(self, key)
+        except KeyError:
+            return default
+
+    def put(self, key, value, pin=False):
+        """ Put value in cache
+
+        :param key: entry key
+        :param value: value to cache
+        :param pin: True - never remove the entry, False - the entry can be removed
+        """
+        self.cache.put(self, key, value, pin)
+
+    def remove(self, key):
+        """ Remove entry
+
+        :param key: entry key
+        """
+        self.cache.remove(self, key)
+
+    def pin_key(self, key):
+        """ Protect entry from eviction
+
+        :param key: entry key
+        """
+        self.cache.pin(self, key)
+
+    def unpin_key(self, key):
+        """ Allow eviction of the entry
+
+        :param key: entry key
+        """
+        self.cache.unpin(self, key)
+
+    def clear(self):
+        """ Remove all entries """
+
+        self.cache.clear(self)
@@ -0,0 +1,220 @@
+# Copyright 2026 Peppy Player peppy.player@gmail.com
+#
+# This file is part of Peppy Player.
+#
+# Peppy Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Peppy Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
+
+import time
+import logging
+
+from subprocess import Popen, PIPE, DEVNULL
+from threading import Thread, RLock, Condition
+from collections import OrderedDict
+
+AMIXER = "amixer"
+EQUALIZER_DEVICE = "equal"
+DEFAULT_FLUSH_INTERVAL = 1 / 30
+
+class MixerService(object):
+    """ ALSA mixer service. The mixer commands are sent to the long-running 'amixer -s' processes,
+    one process per device and scale. The writes are coalesced: only the latest value of each
+    control is sent, not more often than once per flush interval. All commands collected
+    during the interval are written to the process in one batch.
+    """
+
+    lock = RLock()
+
+    def __init__(self, enabled=True, interval=DEFAULT_FLUSH_INTERVAL):
+        """ Initializer
+
+        :param enabled: True - send commands, False - ignore commands (not Linux platform)
+        :param interval: the minimum time between two batches in seconds
+        """
+        self.enabled = enabled
+        self.interval = interval
+        self.condition = Condition(self.lock)
+        self.write_lock = RLock()
+        self.pending = OrderedDict()
+        self.processes = {}
+        self.thread = None
+        self.last_flush = 0
+        self.commands = 0
+        self.coalesced = 0
+        self.batches = 0
+
+    def set_volume(self, control, level, mapped=False):
+        """ Set volume of the simple mixer control
+
+        :param control: control name
+        :param level: volume level 0-100
+        :param mapped: True - use mapped volume (linear scale), False - use raw volume
+        """
+        self.add_command(None, mapped, ("sset", control), f"""sset {quote(control)} {level}%""")
+
+    def set_equalizer(self, values):
+        """ Set all equalizer bands in one batch
+
+        :param values: list of band values in range 0-100
+        """
+        with self.lock:
+            for i, v in enumerate(values):
+                self.set_equalizer_band(i + 1, v)
+
+    def set_equalizer_band(self, band, value):
+        """ Set one equalizer band
+
+        :param band: band number in range 1-10
+        :param value: value in range 0-100
+        """
+        self.add_command(EQUALIZER_DEVICE, False, ("cset", band), f"""cset numid={band} {value}""")
+
+    def add_command(self, device, mapped, control, command):
+        """ Add command to the next batch. The command replaces the previous command for the same control.
+
+        :param device: ALSA device name, None - default device
+        :param mapped: True - mapped volume, False - raw volume
+        :param control: control key
+        :param command: amixer command
+        """
+        if not self.enabled:
+            return
+
+        key = (device, mapped, control)
+        with self.condition:
+            if key in self.pending:
+                self.coalesced += 1
+            self.pending[key] = command
+            self.commands += 1
+            self.condition.notify()
+            if self.thread == None:
+                self.thread = Thread(target=self.write_commands, daemon=True)
+                self.thread.start()
+
+    def write_commands(self):
+        """ Thread method. Waits for commands and writes them in batches. """
+
+        while True:
+            with self.condition:
+                while not self.pending:
+                    self.condition.wait()
+                delay = self.last_flush + self.interval - time.monotonic()
+
+            if delay > 0:
+                time.sleep(delay)
+
+            with self.condition:
+                batch = self.pending
+                self.pending = OrderedDict()
+                self.last_flush = time.monotonic()
+                self.batches += 1
+
+            self.flush(batch)
+
+    def flush(self, batch):
+        """ Write commands to the amixer processes
+
+        :param batch: dictionary where key is (device, mapped, control) and value is command
+        """
+        groups = OrderedDict()
+        for (device, mapped, _), command in batch.items():
+            groups.setdefault((device, mapped), []).append(command)
+
+        with self.write_lock:
+            for key, commands in groups.items():
+                data = ("\n".join(commands) + "\n").encode()
+                for _ in range(2):
+                    process = self.get_process(*key)
+                    if process == None:
+                        break
+                    try:
+                        process.stdin.write(data)
+                        process.stdin.flush()
+                        break
+                    except Exception as e:
+                        logging.debug(e)
+                        self.close_process(key)
+
+    def get_process(self, device, mapped):
+        """ Get running amixer process, start it if required
+
+        :param device: ALSA device name, None - default device
+        :param mapped: True - mapped volume, False - raw volume
+
+        :return: process or None if it cannot be started
+        """
+        key = (device, mapped)
+        process = self.processes.get(key)
+        if process != None and process.poll() == None:
+            return process
+
+        command = [AMIXER, "-q"]
+        if device:
+            command.extend(["-D", device])
+        if mapped:
+            command.append("-M")
+        command.append("-s")
+
+        try:
+            process = Popen(command, stdin=PIPE, stdout=DEVNULL, stderr=DEVNULL, shell=False)
+        except Exception as e:
+            logging.debug(e)
+            return None
+
+        self.processes[key] = process
+        return process
+
+    def close_process(self, key):
+        """ Close amixer process
+
+        :param key: tuple (device, mapped)
+        """
+        process = self.processes.pop(key, None)
+        if process == None:
+            return
+        try:
+            process.stdin.close()
+            process.wait(1)
+        except Exception:
+            process.kill()
+
+    def stop(self):
+        """ Write pending commands and stop all amixer processes """
+
+        with self.lock:
+            batch = self.pending
+            self.pending = OrderedDict()
+        self.flush(batch)
+
+        with self.write_lock:
+            for key in list(self.processes.keys()):
+                self.close_process(key)
+
+    def get_statistics(self):
+        """ Get statistics
+
+        :return: dictionary with the number of commands, coalesced commands and batches
+        """
+        with self.lock:
+            return {"commands": self.commands, "coalesced": self.coalesced, "batches": self.batches}
+
+def quote(name):
+    """ Quote control name which contains spaces
+
+    :param name: control name
+
+    :return: quoted name
+    """
+    if " " in name:
+        return "'" + name + "'"
+    return name
@@ -0,0 +1,129 @@
+# Copyright 2026 Peppy Player peppy.player@gmail.com
+#
+# This file is part of Peppy Player.
+#
+# Peppy Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Peppy Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+
+from collections import OrderedDict
+from threading import RLock
+
+MAX_ENTRIES = 32
+
+class PageIndex(object):
+    """ Materialized page boundaries. Keeps the first key of every page for each topic query.
+    Any page is fetched by a keyset seek starting from its first key. The boundaries are
+    invalidated when the collection database is modified.
+
+    The query builder is a function which takes two optional parameters: the first key
+    of the page and the page size. Without parameters it returns the query for all
+    unique values. With parameters it returns the query for one page.
+    """
+
+    lock = RLock()
+
+    def __init__(self, dbutil, max_entries=MAX_ENTRIES):
+        """ Initializer
+
+        :param dbutil: DB utility class
+        :param max_entries: maximum number of cached queries
+        """
+        self.dbutil = dbutil
+        self.max_entries = max_entries
+        self.boundaries = OrderedDict()
+        self.data_version = None
+
+    def get_boundaries(self, builder, column, page_size):
+        """ Get the first keys of all pages. Build them if not in cache.
+
+        :param builder: query builder
+        :param column: column name
+        :param page_size: page size
+
+        :return: list of the first keys
+        """
+        query, params = builder()
+        key = (query, tuple(params), page_size)
+
+        with self.lock:
+            self.check_data_version()
+            try:
+                self.boundaries.move_to_end(key)
+                return self.boundaries[key]
+            except KeyError:
+                pass
+
+        q = f"""
+            SELECT {column} FROM (
+                SELECT {column}, ROW_NUMBER() OVER (ORDER BY {column}) AS n FROM ({query})
+            )
+            WHERE (n - 1) % {page_size} = 0
+            ORDER BY n
+        """
+        r = self.dbutil.run_parameterized_query(q, params)
+        if r == None:
+            return []
+        b = [n[0] for n in r]
+
+        with self.lock:
+            self.boundaries[key] = b
+            if len(self.boundaries) > self.max_entries:
+                self.boundaries.popitem(last=False)
+        logging.debug(f"""Page index created: {column}, pages: {len(b)}""")
+        return b
+
+    def get_page_count(self, builder, column, page_size):
+        """ Get page count
+
+        :param builder: query builder
+        :param column: column name
+        :param page_size: page size
+
+        :return: page count
+        """
+        return len(self.get_boundaries(builder, column, page_size))
+
+    def get_page(self, builder, column, page, page_size):
+        """ Get values for the page
+
+        :param builder: query builder
+        :param column: column name
+        :param page: page number starting from 1
+        :param page_size: page size
+
+        :return: list of values
+        """
+        b = self.get_boundaries(builder, column, page_size)
+        if not page or page < 1 or page > len(b):
+            return []
+
+        query, params = builder(b[page - 1], page_size)
+        q = f"""
+            SELECT {column} FROM ({query})
+            ORDER BY {column}
+            LIMIT {page_size}
+        """
+        r = self.dbutil.run_parameterized_query(q, params)
+        if not r:
+            return []
+        return [n[0] for n in r]
+
+    def check_data_version(self):
+        """ Clean cache if the database was modified by this or any other connection """
+
+        v = self.dbutil.get_data_version()
+        if v != self.data_version:
+            self.boundaries.clear()
+            self.data_version = v
@@ -16,13 +16,13 @@
 # along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
 
 import os
-import feedparser
 import requests
 import codecs
 import json
 import logging
 
-from threading import Thread
+from threading import RLock
+
 from util.keys import *
 from ui.state import State
 from ui.layout.borderlayout import BorderLayout
@@ -30,11 +30,15 @@ from ui.screen.screen import PERCENT_TOP_HEIGHT, PERCENT_TITLE_FONT
 from ui.screen.menuscreen import PERCENT_TOP_HEIGHT as PERCENT_TOP_HEIGHT_MENU_SCREEN
 from ui.menu.menu import Menu
 from util.config import PODCASTS, AUDIO_FILES, LOADING, PODCASTS_FOLDER, COLORS, COLOR_DARK, \
-    UTF8, FOLDER_PLAYLISTS
+    UTF8, FOLDER_PLAYLISTS, CACHE, FEED_CACHE_FOLDER, FEED_CACHE_MAX_AGE, DOWNLOAD_MAX_RATE, \
+    DOWNLOAD_STREAMING_RATE, DOWNLOAD_SEGMENTS, PLAYER_SETTINGS, PAUSE
+from util.feedcache import FeedCache
+from util.downloadmanager import DownloadManager, STATUS_DONE
 
 FILE_PODCASTS = "podcasts.m3u"
 FILE_DEFAULT_PODCAST = "podcasts.svg"
 FILE_PODCASTS_JSON = "podcasts.json"
+FILE_DOWNLOADS = os.path.join("cache", "downloads.json")
 
 STATUS_AVAILABLE = "available"
 STATUS_LOADING = "loading"
@@ -50,6 +54,8 @@ PAGE_SIZE_PODCASTS = MENU_ROWS_PODCASTS * MENU_COLUMNS_PODCASTS
 
 class PodcastsUtil(object):
     """ Podcasts Utility class """
+
+    lock = RLock()
     
     def __init__(self, util):
         """ Initializer
@@ -65,8 +71,18 @@ class PodcastsUtil(object):
         self.available_icon = None
         self.loading_icon = None
         self.loaded_icon = None
-        self.podcast_image_cache = {}
+        self.podcast_image_cache = util.memory_cache.get_namespace("podcast.image")
         self.podcasts_json = []
+        c = self.config[CACHE]
+        self.feed_cache = FeedCache(c[FEED_CACHE_FOLDER], c[FEED_CACHE_MAX_AGE] * 60)
+        self.feed_cache.add_listener(self.update_podcast_info)
+        self.save_callbacks = {}
+        self.download_manager = DownloadManager(FILE_DOWNLOADS, self.config[DOWNLOAD_MAX_RATE],
+            self.config[DOWNLOAD_STREAMING_RATE], self.config[DOWNLOAD_SEGMENTS], self.is_playing)
+        self.download_manager.add_listener(self.episode_downloaded)
+        for job in self.download_manager.get_queued_jobs():
+            self.loading.append(os.path.basename(job["path"]))
+        self.download_manager.start()
         
         layout = BorderLayout(util.screen_rect)
         layout.set_percent_constraints(PERCENT_TOP_HEIGHT, PERCENT_TOP_HEIGHT_MENU_SCREEN, 0, 0)
@@ -214,6 +230,8 @@ class PodcastsUtil(object):
         except:
             pass              
         
+        self.feed_cache.get_feeds([link for link in links[start_index : end_index] if link not in self.summary_cache])
+
         for i, link in enumerate(links[start_index : end_index]):
             try:
                 p = self.summary_cache[link]
@@ -240,12 +258,13 @@ class PodcastsUtil(object):
             return []
 
         result = []
+        self.feed_cache.get_feeds([link for link in links if link not in self.summary_cache])
 
         for i, link in enumerate(links):
             try:
                 p = self.summary_cache[link]
                 p.index = i
-                result[link] = p
+                result.append(p)
                 continue
             except:
                 pass
@@ -272,21 +291,15 @@ class PodcastsUtil(object):
         except:
             pass
 
-        try:
-            response = requests.get(podcast_url, timeout=(2, 2))
-            if response.status_code == 404:
-                return None
-            rss = feedparser.parse(response.content)
-            if rss and getattr(rss, "bozo_exception", None):
-                return None
-        except Exception as e:
+        feed = self.feed_cache.get_feed(podcast_url) or self.feed_cache.fetch(podcast_url)
+        if feed == None:
             return None
             
         s = State()
         s.index = index
-        s.name = rss.feed.title
+        s.name = feed["title"]
         s.l_name = s.name
-        s.description = rss.feed.subtitle
+        s.description = feed["subtitle"]
         s.url = podcast_url
         s.online = True
         s.fixed_height = int(self.podcast_button_font_size * 0.8)
@@ -295,11 +308,7 @@ class PodcastsUtil(object):
         s.bgr = self.config[COLORS][COLOR_DARK]
         s.show_bgr = True
             
-        if 'image' in rss.feed and 'href' in rss.feed.image:
-            img = rss.feed.image.href.strip()
-        else:
-            img = ''
-            
+        img = feed["image"]
         s.image_name = img
         if include_icon:
             s.icon_base = self.get_podcast_image(img, 0.48, 0.8, self.podcast_button_bb)
@@ -307,6 +316,23 @@ class PodcastsUtil(object):
         
         return s
 
+    def update_podcast_info(self, podcast_url):
+        """ Update podcast info after the feed was refreshed in the background.
+        Called by the feed cache thread. The current episodes stay available,
+        they will be created again from the new feed on the next request.
+        
+        :param podcast_url: podcast url
+        """
+        p = self.summary_cache.get(podcast_url)
+        feed = self.feed_cache.get_cached_feed(podcast_url)
+        if p == None or feed == None:
+            return
+
+        with self.lock:
+            p.name = p.l_name = feed["title"]
+            p.description = feed["subtitle"]
+            p.episodes_stale = True
+
     def get_podcasts_from_disk(self, page, page_size):
         """ Get one page of loaded podcasts
         
@@ -505,43 +531,33 @@ class PodcastsUtil(object):
         """
         podcast = None
         try:
-            podcast = self.summary_cache[podcast_url]
-            podcast_image_url = podcast.image_name
-            episodes = podcast.episodes
-            return episodes
+            with self.lock:
+                podcast = self.summary_cache[podcast_url]
+                podcast_image_url = podcast.image_name
+                if not getattr(podcast, "episodes_stale", False):
+                    return podcast.episodes
         except:
             pass
         
         episodes = []
-        rss = feedparser.parse(podcast_url)
-        if rss == None:
-            return episodes
+        feed = self.feed_cache.get_feed(podcast_url) or self.feed_cache.fetch(podcast_url)
+        if feed == None:
+            return getattr(podcast, "episodes", episodes)
 
         if podcast == None:
             index = self.get_podcast_index(podcast_url)
             podcast = self.get_podcast_info(index, podcast_url)
             podcast_image_url = podcast.image_name
         
-        entries = rss.entries
-        i = 0
-        
-        for entry in entries:
-            try:
-                enclosure = entry.enclosures[0]
-            except:
-                continue
+        for i, entry in enumerate(feed["episodes"]):
             s = State()
             s.index = i
-            s.name = entry.title
+            s.name = entry["title"]
             s.l_name = s.name
-
-            s.url = getattr(enclosure, "href", None)
-            if s.url == None:
-                s.url = getattr(enclosure, "url", None)
-            s.length = getattr(enclosure, "length", None)
-            s.type = enclosure.type
-
-            s.description = self.clean_summary(entry.summary)
+            s.url = entry["url"]
+            s.length = entry["length"]
+            s.type = entry["type"]
+            s.description = self.clean_summary(entry["summary"])
             s.fixed_height = int(self.episode_button_font_size * 0.8)
             s.file_type = PODCASTS
             s.online = podcast.online
@@ -554,9 +570,10 @@ class PodcastsUtil(object):
             episode_name = s.url.split("/")[-1]
             self.set_episode_icon(episode_name, self.episode_button_bb, s)
             episodes.append(s)
-            i += 1
         
-        self.summary_cache[podcast_url].episodes = episodes        
+        with self.lock:
+            self.summary_cache[podcast_url].episodes = episodes
+            self.summary_cache[podcast_url].episodes_stale = False
         return episodes
 
     def get_episodes_from_disk(self, podcast_url):
@@ -637,39 +654,81 @@ class PodcastsUtil(object):
         return False
 
     def save_episode(self, state, callback):
-        """ Start saving thread """
+        """ Add episode to the download queue
         
-        thread = Thread(target=self.save, args=[state, callback])
-        thread.start()
-
-    def save(self, button_state, callback):
-        """ Episode saving thread
-        
-        :param button_state: state object defining episode details
+        :param state: state object defining episode details
         :param callback: callback function to call when saving finished
         """
         podcast_folder = self.config[PODCASTS_FOLDER]
-        url = button_state.url
+        url = state.url
         filename = url.split('/')[-1]
 
         if "?" in filename:
             filename = filename.split("?")[0]    
 
-        self.loading.append(filename)
+        if filename not in self.loading:
+            self.loading.append(filename)
+        self.save_callbacks[url] = callback
+
+        episode = {
+            "name": state.name,
+            "description": state.description,
+            "podcast_name": state.podcast_name,
+            "podcast_url": state.podcast_url,
+            "podcast_image_url": state.podcast_image_url
+        }
+        self.download_manager.add(url, os.path.join(podcast_folder, filename), episode)
+
+    def episode_downloaded(self, job):
+        """ Download manager listener. Save podcast image and episode details.
         
-        episode_file = os.path.join(podcast_folder, filename)
-        self.save_file_from_web(episode_file, url)
-                            
-        url = button_state.podcast_image_url
+        :param job: download job
+        """
+        filename = os.path.basename(job["path"])
+        if filename in self.loading:
+            self.loading.remove(filename)
+        callback = self.save_callbacks.pop(job["url"], None)
+
+        if job["status"] != STATUS_DONE:
+            return
+
+        s = State()
+        for k, v in job["data"].items():
+            setattr(s, k, v)
+        s.url = job["url"]
+        s.file_name = job["path"]
+
+        if len(self.podcasts_json) == 0:
+            self.podcasts_json = self.load_podcasts()
+
+        url = s.podcast_image_url
         if url.startswith("http"):
             f = url.split("/")[-1]
-            image_file = os.path.join(podcast_folder, f)
-            self.save_file_from_web(image_file, url)
+            image_file = os.path.join(self.config[PODCASTS_FOLDER], f)
+            try:
+                self.save_file_from_web(image_file, url)
+            except Exception as e:
+                logging.debug(e)
                            
-        self.loading.remove(filename)
-        button_state.file_name = episode_file
-        self.cache_episode(button_state)
-        callback()       
+        self.cache_episode(s)
+        if callback:
+            callback()
+
+    def get_download_progress(self, url):
+        """ Get episode download progress
+        
+        :param url: episode URL
+        
+        :return: progress dictionary or None if the episode is not downloaded
+        """
+        return self.download_manager.get_progress(url)
+
+    def is_playing(self):
+        """ Check if the player is playing. The downloads use less bandwidth while playing.
+        
+        :return: True - playing, False - paused or stopped
+        """
+        return not self.config[PLAYER_SETTINGS][PAUSE]
 
     def save_file_from_web(self, filename, url):
         """ Save file from web
@@ -703,7 +762,9 @@ class PodcastsUtil(object):
                 break
         
         if podcast == None:
-            p = self.summary_cache[state.podcast_url]
+            p = self.summary_cache.get(state.podcast_url)
+            if p == None:
+                p = self.get_podcast_info(self.get_podcast_index(state.podcast_url), state.podcast_url, False)
             podcast_json = {
                 "name": p.name,
                 "url": p.url,
@@ -0,0 +1,123 @@
+# Copyright 2026 Peppy Player peppy.player@gmail.com
+#
+# This file is part of Peppy Player.
+#
+# Peppy Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Peppy Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
+
+from util.collector import SEARCH_COLUMNS
+
+MIN_LENGTH = 2
+
+class Searcher(object):
+    """ Collection search using the topic column indexes and the full-text search table """
+
+    def __init__(self, dbutil):
+        """ Initializer
+
+        :param dbutil: DB utility class
+        """
+        self.dbutil = dbutil
+        self.fts_available = None
+
+    def is_fts_available(self, column):
+        """ Check if the column can be searched using the full-text search table
+
+        :param column: column name
+
+        :return: True - full-text search available, False - not available
+        """
+        if self.fts_available == None:
+            self.fts_available = bool(self.dbutil.conn) and self.dbutil.is_fts_available()
+        return self.fts_available and column in SEARCH_COLUMNS
+
+    def get_prefix_ranges(self, prefix):
+        """ Get index ranges for all cases of the first prefix character.
+        The ranges are sorted and don't overlap.
+
+        :param prefix: prefix string
+
+        :return: list of tuples (from, to)
+        """
+        first = prefix[0]
+        chars = sorted(set([first.upper(), first.lower()]))
+        return [(c, chr(ord(c) + 1)) for c in chars]
+
+    def get_prefix_query(self, column, prefix, value=None, limit=None):
+        """ Prepare the query for unique values starting with prefix (case-insensitive).
+        Each case of the first character is a separate index range seek.
+
+        :param column: column name
+        :param prefix: prefix string
+        :param value: first key of the page, None - all values
+        :param limit: page size
+
+        :return: tuple (query, parameters)
+        """
+        subqueries = []
+        params = []
+        for r in self.get_prefix_ranges(prefix):
+            q = f"""
+                SELECT DISTINCT {column} FROM {self.dbutil.table_name}
+                WHERE {column} >= ? AND {column} < ? AND
+                LENGTH({column}) > {MIN_LENGTH} AND
+                {column} LIKE ?
+            """
+            params.extend([r[0], r[1], r[0] + prefix[1:] + "%"])
+            q = self.add_keyset(q, params, column, value, limit)
+            subqueries.append(q)
+        return (" UNION ".join(subqueries), params)
+
+    def get_pattern_query(self, column, pattern, value=None, limit=None):
+        """ Prepare the query for unique values containing pattern (case-insensitive).
+        Uses the full-text search table if available.
+
+        :param column: column name
+        :param pattern: search string
+        :param value: first key of the page, None - all values
+        :param limit: page size
+
+        :return: tuple (query, parameters)
+        """
+        if self.is_fts_available(column):
+            q = f"""
+                SELECT DISTINCT {column}
+                FROM {self.dbutil.fts_table_name}
+                WHERE {column} LIKE ? AND LENGTH({column}) > {MIN_LENGTH}
+            """
+        else:
+            q = f"""
+                SELECT DISTINCT {column}
+                FROM {self.dbutil.table_name}
+                WHERE LENGTH(TRIM({column})) > {MIN_LENGTH} AND
+                LOWER(TRIM({column})) LIKE LOWER(?)
+            """
+        params = ["%" + pattern + "%"]
+        return (self.add_keyset(q, params, column, value, limit), params)
+
+    def add_keyset(self, query, params, column, value, limit):
+        """ Add keyset condition to the query
+
+        :param query: query
+        :param params: query parameters, keyset value will be appended
+        :param column: column name
+        :param value: first key of the page, None - no keyset condition
+        :param limit: page size
+
+        :return: query with keyset condition
+        """
+        if value == None:
+            return query
+
+        params.append(value)
+        return f"""SELECT {column} FROM ({query} AND {column} >= ? ORDER BY {column} LIMIT {limit})"""
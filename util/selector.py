@@ -20,8 +20,11 @@ import sys
 import sqlite3
 import logging
 
+from functools import partial
 from util.collector import DbUtil, FILENAME, TITLE, FOLDER
 from util.keys import KEY_ABC, KEY_SEARCH
+from util.searcher import Searcher
+from util.pageindex import PageIndex
 
 class Selector(object):
     """ Collection of the SQL select statements and helper functions """
@@ -35,32 +38,8 @@ class Selector(object):
             self.dbutil = dbutil
         else:
             self.dbutil = DbUtil()
-
-    def get_sign(self, next):
-        """ Get comparison sign
-
-        :param next: next page parameter
-
-        :return: > for next < for previous
-        """
-        if next: return ">"
-        else: return "<"
-
-    def get_count(self, result, page_size):
-        """ Get page count
-
-        :param result: result set
-        :param page_size: page size
-
-        :return: number of pages
-        """
-        n = 0
-        if result:
-            m = int(result[0][0])
-            n = int(m / page_size)
-            if m % page_size != 0:
-                n += 1
-        return n
+        self.searcher = Searcher(self.dbutil)
+        self.page_index = PageIndex(self.dbutil)
 
     def get_list(self, r, single=True):
         """ Get list of values from provided result set
@@ -79,20 +58,6 @@ class Selector(object):
                     result.append((n[0], n[1]))
         return result
 
-    def get_offset(self, page, next, page_size):
-        """ Get offset clause
-
-        :param page: page number
-        :param next: next or previous page
-        :param page_size: page size
-
-        :return: empty string for next, OFFSET clause for previous
-        """
-        if next:
-            return ""
-        else:
-            return "OFFSET " + str((page - 1) * page_size)
-
     def get_topic_page(self, mode, topic, search_str, current_page, previous_page, first, last, page_size):
         """ Dispatching function to get topic page
 
@@ -108,71 +73,28 @@ class Selector(object):
         :return: list of items for topic page
         """
         if mode == KEY_ABC:
-            return self.get_abc_page(topic, search_str, current_page, previous_page, first, last, page_size=page_size)
+            return self.get_page_by_char(topic, search_str, current_page, page_size=page_size)
         elif mode == KEY_SEARCH:
-            return self.get_search_page(topic, search_str, current_page, previous_page, first, last, page_size=page_size)
+            return self.get_page_by_pattern(topic, search_str, current_page, page_size=page_size)
         else:
-            return self.get_list_page(topic, search_str, current_page, previous_page, first, last, page_size=page_size)
-
-    def get_list_page(self, topic, search_str, current_page, previous_page, first, last, page_size):
-        """ Get the list of items for the topic page
-
-        :param topic: collection topic
-        :param search_str: search string (if any)
-        :param current_page: current topic page number
-        :param previous_page: previous topic page number
-        :param first: first item in previous select
-        :param last: last item in previous select
-        :param page_size: page size
+            return self.get_page(topic, page_size, current_page)
 
-        :return: list of items for topic page
-        """
-        if current_page == previous_page:
-            return self.get_page(topic, page_size)
-        elif current_page > previous_page:
-            return self.get_page(topic, page_size, last, None, True)
-        elif current_page < previous_page:
-            return self.get_page(topic, page_size, first, current_page, False)
+    def get_list_query(self, column, value=None, limit=None):
+        """ Prepare the query for all unique values of the column
 
-    def get_abc_page(self, topic, search_str, current_page, previous_page, first, last, page_size=10):
-        """ Get the list of items for the topic page with alphabetical search
-
-        :param topic: collection topic
-        :param search_str: search string (if any)
-        :param current_page: current topic page number
-        :param previous_page: previous topic page number
-        :param first: first item in previous select
-        :param last: last item in previous select
-        :param page_size: page size
+        :param column: column name
+        :param value: first key of the page, None - all values
+        :param limit: page size
 
-        :return: list of items for topic page
+        :return: tuple (query, parameters)
         """
-        if current_page == previous_page:
-            return self.get_page_by_char(topic, search_str, page_size=page_size)
-        elif current_page > previous_page:
-            return self.get_page_by_char(topic, search_str, last, None, True, page_size=page_size)
-        elif current_page < previous_page:
-            return self.get_page_by_char(topic, search_str, first, current_page, False, page_size=page_size)
-
-    def get_search_page(self, topic, search_str, current_page, previous_page, first, last, page_size):
-        """ Get the list of items for the topic page with keyboard search
-
-        :param topic: collection topic
-        :param search_str: search string (if any)
-        :param current_page: current topic page number
-        :param previous_page: previous topic page number
-        :param first: first item in previous select
-        :param last: last item in previous select
-        :param page_size: page size
-
-        :return: list of items for topic page
+        query = f"""
+            SELECT DISTINCT {column}
+            FROM {self.dbutil.table_name}
+            WHERE LENGTH({column}) > 0
         """
-        if current_page == previous_page:
-            return self.get_page_by_pattern(topic, search_str, page_size=page_size)
-        elif current_page > previous_page:
-            return self.get_page_by_pattern(topic, search_str, last, True, page_size=page_size)
-        elif current_page < previous_page:
-            return self.get_page_by_pattern(topic, search_str, first, current_page, False, page_size=page_size)
+        params = []
+        return (self.searcher.add_keyset(query, params, column, value, limit), params)
 
     def get_page_count(self, column, page_size):
         """ Get page count
@@ -182,34 +104,20 @@ class Selector(object):
 
         :return: page count
         """
-        query = f"""
-            SELECT COUNT(DISTINCT {column})
-            FROM {self.dbutil.table_name}
-            WHERE LENGTH({column}) > 0
-        """
-        return self.get_count(self.dbutil.run_parameterized_query(query, ()), page_size)
+        builder = partial(self.get_list_query, column)
+        return self.page_index.get_page_count(builder, column, page_size)
 
-    def get_page(self, column, page_size, value="", page=None, next=True):
-        """ Get values for the current page
+    def get_page(self, column, page_size, page=1):
+        """ Get values for the page
 
         :param column: column name
         :param page_size: page size
-        :param value: first or last value in the current page
         :param page: page number
-        :param next: True - next page, False - previous page
 
         :return: list of values
         """
-        query = f"""
-            SELECT DISTINCT {column}
-            FROM {self.dbutil.table_name} 
-            WHERE LENGTH({column}) > 0 AND 
-            {column} {self.get_sign(next)} ?
-            ORDER BY {column} ASC 
-            LIMIT {page_size} {self.get_offset(page, next, page_size)}
-        """
-        g = self.get_list(self.dbutil.run_parameterized_query(query, (value,)))
-        return g
+        builder = partial(self.get_list_query, column)
+        return self.page_index.get_page(builder, column, page, page_size)
 
     def get_page_count_by_char(self, column, ch, page_size):
         """ Get page count filtered by the first character
@@ -220,37 +128,25 @@ class Selector(object):
 
         :return: page count
         """
-        query = f"""
-            SELECT COUNT(DISTINCT {column})
-            FROM {self.dbutil.table_name} 
-            WHERE LENGTH(TRIM({column})) > 2 AND 
-            LOWER(TRIM({column})) like ?
-            ORDER BY {column} ASC
-        """
-        return self.get_count(self.dbutil.run_parameterized_query(query, (ch.lower() + "%",)), page_size)
+        if not ch:
+            return 0
+        builder = partial(self.searcher.get_prefix_query, column, ch)
+        return self.page_index.get_page_count(builder, column, page_size)
 
-    def get_page_by_char(self, column, ch, value="", page=None, next=True, page_size=10):
+    def get_page_by_char(self, column, ch, page=1, page_size=10):
         """ Get values for the page filtered by the first character
 
         :param column: column name
         :param ch: character
-        :param value: first or last value in the current page
         :param page: page number
-        :param next: True - next page, False - previous page
         :param page_size: page size
 
         :return: list of values
         """
-        query = f"""
-            SELECT DISTINCT {column}
-            FROM {self.dbutil.table_name} 
-            WHERE LENGTH(TRIM({column})) > 2 AND 
-            LOWER(TRIM({column})) like ? AND 
-            {column} {self.get_sign(next)} ?
-            ORDER BY {column} ASC 
-            LIMIT {page_size} {self.get_offset(page, next, page_size)}
-        """
-        return self.get_list(self.dbutil.run_parameterized_query(query, (ch.lower() + "%", value)))
+        if not ch:
+            return []
+        builder = partial(self.searcher.get_prefix_query, column, ch)
+        return self.page_index.get_page(builder, column, page, page_size)
 
     def get_page_count_by_pattern(self, column, pattern, page_size):
         """ Get page count filtered by the search pattern
@@ -261,37 +157,21 @@ class Selector(object):
 
         :return: page count
         """
-        query = f"""
-            SELECT COUNT(DISTINCT {column})
-            FROM {self.dbutil.table_name} 
-            WHERE LENGTH(LOWER(TRIM({column}))) > 0 AND 
-            LOWER(TRIM({column})) like ?
-            ORDER BY {column} ASC
-        """
-        return self.get_count(self.dbutil.run_parameterized_query(query, ("%" + pattern.lower() + "%",)), page_size)
+        builder = partial(self.searcher.get_pattern_query, column, pattern)
+        return self.page_index.get_page_count(builder, column, page_size)
 
-    def get_page_by_pattern(self, column, pattern, value="", page=None, next=True, page_size=10):
+    def get_page_by_pattern(self, column, pattern, page=1, page_size=10):
         """ Get values for the page filtered by the string pattern
 
         :param column: column name
         :param pattern: serach pattern
-        :param value: first or last value in the current page
         :param page: page number
-        :param next: True - next page, False - previous page
         :param page_size: page size
 
         :return: list of values
         """
-        query = f"""
-            SELECT DISTINCT {column}
-            FROM {self.dbutil.table_name} 
-            WHERE LENGTH(TRIM({column})) > 2 AND 
-            LOWER(TRIM({column})) like ? AND 
-            {column} {self.get_sign(next)} ?
-            ORDER BY {column} ASC 
-            LIMIT {page_size} {self.get_offset(page, next, page_size)}
-        """
-        return self.get_list(self.dbutil.run_parameterized_query(query, ("%" + pattern + "%", value)))
+        builder = partial(self.searcher.get_pattern_query, column, pattern)
+        return self.page_index.get_page(builder, column, page, page_size)
 
     def get_topic_detail_page(self, topic, selection, current_page, prev_page, first, last, page_size):
         """ Get topic details
@@ -306,50 +186,50 @@ class Selector(object):
 
         :return: list of items for topic page
         """
-        if current_page == prev_page:
-            return self.get_page_by_column(topic, selection, page_size=page_size)
-        elif current_page > prev_page:
-            return self.get_page_by_column(topic, selection, last, None, next=True, page_size=page_size)
-        elif current_page < prev_page:
-            return self.get_page_by_column(topic, selection, first, current_page, next=False, page_size=page_size)
+        return self.get_page_by_column(topic, selection, current_page, page_size=page_size)
 
-    def get_page_count_by_column(self, topic, param, page_size):
-        """ Get page count filtered by the column
+    def get_column_query(self, topic, param, value=None, limit=None):
+        """ Prepare the query for all unique folders filtered by the column
 
         :param topic: collection topic
         :param param: selection parameter
-        :param page_size: page size
+        :param value: first key of the page, None - all values
+        :param limit: page size
 
-        :return: page count
+        :return: tuple (query, parameters)
         """
         query = f"""
-            SELECT COUNT(DISTINCT folder)
+            SELECT DISTINCT {FOLDER}
             FROM {self.dbutil.table_name}
             WHERE {topic} = ?
         """
-        return self.get_count(self.dbutil.run_parameterized_query(query, (param,)), page_size)
+        params = [param]
+        return (self.searcher.add_keyset(query, params, FOLDER, value, limit), params)
+
+    def get_page_count_by_column(self, topic, param, page_size):
+        """ Get page count filtered by the column
+
+        :param topic: collection topic
+        :param param: selection parameter
+        :param page_size: page size
+
+        :return: page count
+        """
+        builder = partial(self.get_column_query, topic, param)
+        return self.page_index.get_page_count(builder, FOLDER, page_size)
 
-    def get_page_by_column(self, topic, param, value='', page=None, next=True, page_size=10):
+    def get_page_by_column(self, topic, param, page=1, page_size=10):
         """ Get values for the page filtered by the colum
 
         :param topic: collection topic
         :param param: selection parameter
-        :param value: first or last value in the current page
         :param page: page number
-        :param next: True - next page, False - previous page
         :param page_size: page size
 
         :return: list of values
         """
-        query = f"""
-            SELECT DISTINCT folder
-            FROM {self.dbutil.table_name}
-            WHERE {topic} = ?
-            AND folder {self.get_sign(next)} ?
-            ORDER BY folder ASC 
-            LIMIT {page_size} {self.get_offset(page, next, page_size)}
-        """
-        return self.get_list(self.dbutil.run_parameterized_query(query, (param, value)), True)
+        builder = partial(self.get_column_query, topic, param)
+        return self.page_index.get_page(builder, FOLDER, page, page_size)
 
     def get_filename_by_title(self, folder, title):
         """ Get filename by title
@@ -0,0 +1,268 @@
+# Copyright 2026 Peppy Player peppy.player@gmail.com
+#
+# This file is part of Peppy Player.
+#
+# Peppy Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Peppy Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import time
+import struct
+import hashlib
+import logging
+import pygame
+
+from threading import RLock
+
+THUMBNAIL_EXTENSION = ".rgba"
+THUMBNAIL_MAGIC = b"PPT1"
+THUMBNAIL_HEADER = struct.Struct("<4sII")
+PIXEL_FORMAT = "RGBA"
+BYTES_PER_PIXEL = 4
+TOUCH_INTERVAL = 3600
+EVICTION_RATIO = 0.9
+MEGABYTE = 1024 * 1024
+
+class ThumbnailCache(object):
+    """ Persistent cache of the scaled images. The key is the hash of the source file path,
+    its modification time and the bounding box. The thumbnail file keeps raw RGBA pixels
+    which are loaded without decoding. The least recently used files are deleted
+    when the cache size exceeds the limit.
+    """
+
+    lock = RLock()
+    extension = THUMBNAIL_EXTENSION
+
+    def __init__(self, folder, max_size):
+        """ Initializer
+
+        :param folder: cache folder
+        :param max_size: cache size limit in megabytes
+        """
+        self.folder = folder
+        self.max_size = max_size * MEGABYTE
+        self.entries = None
+        self.total_size = 0
+
+    def get_key(self, path, bounding_box, variant=None):
+        """ Get thumbnail key
+
+        :param path: source file path
+        :param bounding_box: tuple (width, height)
+        :param variant: string describing additional image processing, None - scaling only
+
+        :return: key or None if source file doesn't exist
+        """
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except Exception:
+            return None
+        s = f"""{os.path.abspath(path)}|{mtime}|{int(bounding_box[0])}x{int(bounding_box[1])}"""
+        if variant:
+            s += "|" + variant
+        return hashlib.sha1(s.encode("utf-8")).hexdigest()
+
+    def get_thumbnail_path(self, key):
+        """ Get thumbnail file path
+
+        :param key: thumbnail key
+
+        :return: file path
+        """
+        return os.path.join(self.folder, key[:2], key + self.extension)
+
+    def get_image(self, path, bounding_box, variant=None):
+        """ Get thumbnail from the cache
+
+        :param path: source file path
+        :param bounding_box: tuple (width, height)
+        :param variant: string describing additional image processing
+
+        :return: image or None if not in cache
+        """
+        pixels = self.get_pixels(path, bounding_box, variant)
+        if pixels == None:
+            return None
+
+        try:
+            image = pygame.image.fromstring(pixels[1], pixels[0], PIXEL_FORMAT)
+        except Exception as e:
+            logging.debug(e)
+            return None
+
+        try:
+            return image.convert_alpha()
+        except Exception:
+            return image
+
+    def get_pixels(self, path, bounding_box, variant=None):
+        """ Read thumbnail pixels. The method doesn't create Pygame surface,
+        so it can be called by the worker thread.
+
+        :param path: source file path
+        :param bounding_box: tuple (width, height)
+        :param variant: string describing additional image processing
+
+        :return: tuple (size, RGBA bytes) or None if not in cache
+        """
+        key = self.get_key(path, bounding_box, variant)
+        if not key:
+            return None
+
+        thumbnail_path = self.get_thumbnail_path(key)
+        try:
+            with open(thumbnail_path, "rb") as f:
+                data = f.read()
+            magic, w, h = THUMBNAIL_HEADER.unpack_from(data)
+            if magic != THUMBNAIL_MAGIC or len(data) != THUMBNAIL_HEADER.size + w * h * BYTES_PER_PIXEL:
+                raise ValueError(f"""Corrupted thumbnail {thumbnail_path}""")
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logging.debug(e)
+            self.delete(thumbnail_path)
+            return None
+
+        self.touch(thumbnail_path)
+        return ((w, h), data[THUMBNAIL_HEADER.size:])
+
+    def cache_image(self, image, path, bounding_box, variant=None):
+        """ Save thumbnail in the cache
+
+        :param image: scaled image
+        :param path: source file path
+        :param bounding_box: tuple (width, height)
+        :param variant: string describing additional image processing
+        """
+        if image == None:
+            return
+
+        try:
+            data = pygame.image.tostring(image, PIXEL_FORMAT, False)
+        except Exception as e:
+            logging.debug(e)
+            return
+
+        self.cache_pixels(image.get_size(), data, path, bounding_box, variant)
+
+    def cache_pixels(self, size, data, path, bounding_box, variant=None):
+        """ Save thumbnail pixels in the cache
+
+        :param size: tuple (width, height) of the scaled image
+        :param data: RGBA bytes
+        :param path: source file path
+        :param bounding_box: tuple (width, height)
+        :param variant: string describing additional image processing
+        """
+        key = self.get_key(path, bounding_box, variant)
+        if not key:
+            return
+
+        thumbnail_path = self.get_thumbnail_path(key)
+        w, h = size
+        tmp_path = thumbnail_path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(thumbnail_path), exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                f.write(THUMBNAIL_HEADER.pack(THUMBNAIL_MAGIC, w, h))
+                f.write(data)
+            os.replace(tmp_path, thumbnail_path)
+        except Exception as e:
+            logging.debug(e)
+            self.delete(tmp_path)
+            return
+
+        self.add_entry(thumbnail_path, THUMBNAIL_HEADER.size + len(data))
+
+    def add_entry(self, path, size):
+        """ Account the new file and delete the least recently used files if the cache is full
+
+        :param path: file path
+        :param size: file size
+        """
+        with self.lock:
+            self.load_entries()
+            old_size = self.entries.get(path, (0, 0))[0]
+            self.entries[path] = (size, time.time())
+            self.total_size += size - old_size
+            if self.total_size > self.max_size:
+                self.evict()
+
+    def touch(self, thumbnail_path):
+        """ Update the last access time of the thumbnail. The file modification time
+        is used as the access time, it's updated not more often than once per TOUCH_INTERVAL.
+
+        :param thumbnail_path: thumbnail file path
+        """
+        now = time.time()
+        with self.lock:
+            if self.entries != None:
+                e = self.entries.get(thumbnail_path)
+                if e and now - e[1] < TOUCH_INTERVAL:
+                    return
+        try:
+            if now - os.stat(thumbnail_path).st_mtime < TOUCH_INTERVAL:
+                return
+            os.utime(thumbnail_path)
+        except Exception:
+            return
+        with self.lock:
+            if self.entries != None and thumbnail_path in self.entries:
+                self.entries[thumbnail_path] = (self.entries[thumbnail_path][0], now)
+
+    def load_entries(self):
+        """ Scan the cache folder once to get the size and the access time of all thumbnails """
+
+        if self.entries != None:
+            return
+
+        self.entries = {}
+        self.total_size = 0
+        if not os.path.isdir(self.folder):
+            return
+
+        for d in os.scandir(self.folder):
+            if not d.is_dir():
+                continue
+            for f in os.scandir(d.path):
+                if not f.name.endswith(self.extension):
+                    continue
+                try:
+                    st = f.stat()
+                except Exception:
+                    continue
+                self.entries[f.path] = (st.st_size, st.st_mtime)
+                self.total_size += st.st_size
+
+        logging.debug(f"""Thumbnail cache: {len(self.entries)} files, {self.total_size} bytes""")
+
+    def evict(self):
+        """ Delete the least recently used thumbnails until the cache size is below the limit """
+
+        target = self.max_size * EVICTION_RATIO
+        for p, e in sorted(self.entries.items(), key=lambda i: i[1][1]):
+            if self.total_size <= target:
+                break
+            self.delete(p)
+            del self.entries[p]
+            self.total_size -= e[0]
+
+    def delete(self, path):
+        """ Delete file
+
+        :param path: file path
+        """
+        try:
+            os.remove(path)
+        except Exception:
+            pass
@@ -17,6 +17,7 @@
 
 import os
 import ssl
+import stat
 import codecs
 import importlib
 import logging
@@ -44,6 +45,11 @@ from util.cdutil import CdUtil
 from util.switchutil import SwitchUtil
 from util.sambautil import SambaUtil
 from util.yastreamutil import YaStreamUtil
+from util.memorycache import MemoryCache
+from util.mixerservice import MixerService
+from util.lookupcache import LookupCache
+from ui.compositor import Compositor
+from event.scheduler import Scheduler
 from mutagen import File
 
 IMAGE_VOLUME = "volume"
@@ -144,6 +150,17 @@ class Util(object):
         self.screen_rect = self.config_class.screen_rect
         self.config[LABELS] = self.get_labels()
         self.pygame_screen = self.config_class.pygame_screen
+        self.compositor = Compositor(self.config[SCREEN_INFO][FULL_FRAME_UPDATE])
+        self.scheduler = Scheduler(self.config[SCREEN_INFO][FRAME_RATE], self.config[SCREEN_INFO][ADAPTIVE_FRAME_RATE])
+        self.compositor.set_wakeup(self.scheduler.wakeup)
+        self.memory_cache = MemoryCache(self.config[CACHE][IMAGE_CACHE_SIZE])
+        self.folder_image_cache = self.memory_cache.get_namespace("folder.image")
+        self.text_cache = self.memory_cache.get_namespace("text")
+        self.text_size_cache = self.memory_cache.get_namespace("text.size")
+        self.mixer_service = MixerService(self.config[LINUX_PLATFORM], 1 / self.config[SCREEN_INFO][FRAME_RATE])
+        self.lookup_cache = LookupCache(self.config[CACHE][LOOKUP_CACHE_FILE], self.config[CACHE][LOOKUP_CACHE_SIZE] * 1024 * 1024)
+        self.font_file = None
+        self.font_language = None
         self.CURRENT_WORKING_DIRECTORY = os.getcwd()
         self.read_storage()
                 
@@ -156,7 +173,7 @@ class Util(object):
     def init_utilities(self):
         """ Initialize utilities """
 
-        self.discogs_util = DiscogsUtil(self.k1)
+        self.discogs_util = DiscogsUtil(self.k1, self.lookup_cache)
         self.image_util = ImageUtil(self)
         self.file_util = FileUtil(self)
         self.switch_util = SwitchUtil(self)
@@ -302,37 +319,80 @@ class Util(object):
 
         return fonts        
 
-    def get_font(self, size):
-        """ Return font from cache if not in cache load, place in cache and return.
-        
-        :param size: font size 
+    def get_font_file(self):
+        """ Return the font file for the current language.
+        The language folder is read only when the language or the font changes.
+
+        :return: font file path
         """
-        if os.getcwd() != self.CURRENT_WORKING_DIRECTORY:
-            os.chdir(self.CURRENT_WORKING_DIRECTORY)
-        
         current_language = self.config[CURRENT][LANGUAGE]
-        path = os.path.join(os.getcwd(), FOLDER_LANGUAGES, current_language)
+        if (current_language, self.config[FONT_KEY]) == self.font_language:
+            return self.font_file
+
+        path = os.path.join(self.CURRENT_WORKING_DIRECTORY, FOLDER_LANGUAGES, current_language)
         language_specific_font = None
         for file in os.listdir(path):
             if file.lower().endswith(".ttf"):
                 language_specific_font = file
                 break
-        
+
         if language_specific_font:
-            key = language_specific_font + str(size)
             filename = os.path.join(path, language_specific_font)
         else:
-            font_name = self.config[FONT_KEY]
-            key = font_name + str(size)
-            filename = os.path.join(FOLDER_FONT, font_name)
-            
-        if key in self.font_cache:
+            filename = os.path.join(self.CURRENT_WORKING_DIRECTORY, FOLDER_FONT, self.config[FONT_KEY])
+
+        self.font_file = filename
+        self.font_language = (current_language, self.config[FONT_KEY])
+        return filename
+
+    def get_font(self, size):
+        """ Return font from cache if not in cache load, place in cache and return.
+        
+        :param size: font size 
+        """
+        key = (self.get_font_file(), size)
+        try:
             return self.font_cache[key]
+        except KeyError:
+            pass
         
-        font = pygame.font.Font(filename, size)
+        font = pygame.font.Font(key[0], size)
         self.font_cache[key] = font
         return font
 
+    def render_text(self, font, text, color):
+        """ Render text. The rendered surface is taken from cache if available.
+        The font should be created by get_font.
+
+        :param font: font
+        :param text: text to render
+        :param color: text color
+
+        :return: rendered text surface
+        """
+        key = (font, text, tuple(color))
+        label = self.text_cache.get(key)
+        if label == None:
+            label = font.render(text, 1, color)
+            self.text_cache[key] = label
+        return label
+
+    def get_text_size(self, font, text):
+        """ Return the size of the rendered text. The size is taken from cache if available.
+        The font should be created by get_font.
+
+        :param font: font
+        :param text: text
+
+        :return: tuple (width, height)
+        """
+        key = (font, text)
+        size = self.text_size_cache.get(key)
+        if size == None:
+            size = font.size(text)
+            self.text_size_cache[key] = size
+        return size
+
     def get_current_font_name(self):
         """ Return the current font name
 
@@ -473,12 +533,30 @@ class Util(object):
         genre_button_state.v_align = V_ALIGN_TOP
         genre_button_state.v_offset = 35
 
-    def add_icon(self, button_state, scale_factor=None):
+    def add_icon(self, button_state, scale_factor=None, thumbnail=False):
         """ Add icons to the button
 
         :param button_state: button state object
         :param scale_factor: image scale factor
+        :param thumbnail: True - load only scaled icon using thumbnail cache, False - load original and scaled icons
         """
+        bb = button_state.bounding_box
+        if scale_factor:
+            sf = scale_factor
+        else:
+            sf = (bb.w, bb.h)
+
+        if thumbnail:
+            icon = self.image_util.load_image(button_state.image_path, bounding_box=sf)
+            if not icon and hasattr(button_state, "default_icon_path"):
+                icon = self.image_util.load_image(button_state.default_icon_path, bounding_box=sf)
+            elif not icon and hasattr(button_state, "logo_image_path"):
+                icon = self.image_util.load_image(button_state.logo_image_path, bounding_box=sf)
+            if icon:
+                button_state.icon_base = icon
+                button_state.icon_base_scaled = icon[1]
+                return
+
         path = button_state.image_path
         icon = self.image_util.load_image(path)
         if not icon:
@@ -490,11 +568,6 @@ class Util(object):
                 icon = button_state.icon_base
         
         button_state.icon_base = icon
-        bb = button_state.bounding_box
-        if scale_factor:
-            sf = scale_factor
-        else:
-            sf = (bb.w, bb.h)
 
         if icon:
             scale_ratio = self.image_util.get_scale_ratio(sf, icon[1])
@@ -1159,7 +1232,7 @@ class Util(object):
         
         :return: list of state objects representing folder content
         """
-        content = self.file_util.get_folder_content(folder_name, load_images=False)
+        content = self.file_util.get_folder_content(folder_name, load_images=self.config[ENABLE_EMBEDDED_IMAGES], load_folder_images=False)
         if not content:
             return None
         
@@ -1263,25 +1336,42 @@ class Util(object):
     
         return files
 
-    def get_folder_image_path(self, folder):
-        """ Return the path to image representing folder 
+    def get_folder_image_path(self, folder, probe=True):
+        """ Return the path to image representing folder.
+        The result is cached until the folder modification time changes.
         
         :param folder_name: folder name
-        :return: path to image file
+        :param probe: True - read folder if the result is not in cache, False - use cache only
+        :return: path to image file, None - no image, False - not in cache (only if probe is False)
         """
         if not folder: return None
         
-        if not os.path.isdir(folder):
+        try:
+            st = os.stat(folder)
+        except Exception:
+            st = None
+
+        if st == None or not stat.S_ISDIR(st.st_mode):
             self.config[FILE_PLAYBACK][CURRENT_FOLDER] = ""
             self.config[FILE_PLAYBACK][CURRENT_FILE] = "" 
             return None
-        
-        for f in os.listdir(folder):
-            if f.lower() in self.config[FOLDER_IMAGES]:
-                file_path = os.path.join(folder, f)
-                real_path = os.path.realpath(file_path)
-                return real_path
-        return None
+
+        c = self.folder_image_cache.get(folder)
+        if c and c[0] == st.st_mtime_ns:
+            return c[1] or None
+
+        if not probe:
+            return False
+
+        real_path = None
+        with os.scandir(folder) as it:
+            for e in it:
+                if e.name.lower() in self.config[FOLDER_IMAGES]:
+                    real_path = os.path.realpath(e.path)
+                    break
+
+        self.folder_image_cache[folder] = (st.st_mtime_ns, real_path or "")
+        return real_path
 
     def get_dictionary_value(self, d, key, df=None):
         """ Return value retrieved from provided dictionary by provided key
@@ -1390,8 +1480,7 @@ class Util(object):
             self.config[CURRENT][EQUALIZER] = values.copy()
             return
 
-        for i, v in enumerate(values):
-            self.set_equalizer_band_value(i + 1, v)
+        self.mixer_service.set_equalizer(values)
 
     def set_equalizer_band_value(self, band, value):
         """ Set equalizer values for one frequency bands
@@ -1399,12 +1488,7 @@ class Util(object):
         :param band: frequency band number in range 1-10
         :param value: value in range 0-100
         """
-        command = "amixer -D equal cset numid={0} {1}".format(band, value)
-        if self.config[LINUX_PLATFORM]:
-            try:
-                Popen(command.split(), shell=False)
-            except Exception as e:
-                logging.debug(e)
+        self.mixer_service.set_equalizer_band(band, value)
         
     def read_storage(self):
         """ Read storage """
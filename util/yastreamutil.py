@@ -40,7 +40,7 @@ class YaStreamUtil(object):
         self.util = util
         self.config = util.config
         self.image_util = util.image_util
-        self.thumbnail_cache = {}
+        self.thumbnail_cache = util.memory_cache.get_namespace("yastream.thumbnail")
         self.ya_stream_player_playlist_cache = []
         
     def get_ya_stream_playlist(self):
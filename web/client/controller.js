@@ -64,7 +64,10 @@ function dispatchMessageFromServer(msg) {
 
 	console.log("command: " + c);
 	
-	if(c == "update_screen") {
+	if(c == "patch") {
+		applyPatch(d);
+	}
+	else if(c == "update_screen") {
 		updateScreen(comps);
 	}
 	else if(c == "update_element") {
@@ -140,15 +143,13 @@ function stopScreensaver() {
 * @param ids - the list of component ids to remove
 */
 function removeComponents(ids) {
-	var panel = document.getElementById('panel');
-	
 	console.log("removing components");
 	
 	for (var i=0; i < ids.length; i++) {
 		var id = ids[i];
-		var element = document.getElementById(id);
+		var element = findComponent(id);
 		if(element != null) {
-			panel.removeChild(element);
+			element.parentElement.removeChild(element);
 			console.log("removed component: " + id);
 		}
 	}
@@ -237,6 +238,109 @@ function handleBackground(d) {
 	}
 }
 
+/**
+* Apply the patch received from server and acknowledge it
+*
+* @param d - the patch with added, updated and removed components
+*/
+function applyPatch(d) {
+	console.log("applying patch: " + d.version);
+	
+	if(d.reset) {
+		updateScreen(d.add);
+	} else {
+		removeComponents(d.remove);
+		updatePatchComponents(d.add.concat(d.update));
+	}
+	
+	if(d.order) {
+		orderComponents(d.order);
+	}
+	
+	sendDataToServer({"command": "ack", "version": d.version});
+	console.log("patch applied");
+}
+
+/**
+* Replace components or add new components to the panel
+*
+* @param components - the list of components
+*/
+function updatePatchComponents(components) {
+	var panel = document.getElementById('panel');
+	
+	for (var i=0; i < components.length; i++) {
+		var d = components[i];
+		
+		if(d.type == "screen") {
+			handleBackground(d);
+			continue;
+		} else if(d.type == "stream_player") {
+			if(document.getElementById(d.name) == null) {
+				document.body.appendChild(createComponent(d));
+			} else {
+				update_stream_player(d);
+			}
+			continue;
+		}
+		
+		var comp = createComponent(d);
+		if(comp == null) {
+			continue;
+		}
+		
+		var element = findComponent(d.key);
+		if(element != null) {
+			element.parentElement.replaceChild(comp, element);
+		} else if(panel != null) {
+			panel.appendChild(comp);
+		}
+	}
+}
+
+/**
+* Find component by the key sent by server or by component ID
+*
+* @param key - the component key
+* 
+* @return the component or null if not found
+*/
+function findComponent(key) {
+	var panel = document.getElementById('panel');
+	if(panel != null) {
+		for (var i=0; i < panel.children.length; i++) {
+			if(panel.children[i].getAttribute("data-key") === key) {
+				return panel.children[i];
+			}
+		}
+	}
+	return document.getElementById(key);
+}
+
+/**
+* Put panel components in the specified order, the screensaver overlay stays on top
+*
+* @param keys - the list of component keys
+*/
+function orderComponents(keys) {
+	var panel = document.getElementById('panel');
+	if(panel == null) {
+		return;
+	}
+	
+	for (var i=0; i < keys.length; i++) {
+		var element = findComponent(keys[i]);
+		if(element != null && element.parentElement === panel) {
+			panel.appendChild(element);
+		}
+	}
+	
+	var overlay = document.getElementById('overlay');
+	if(overlay != null) {
+		panel.appendChild(overlay);
+	}
+}
+
 /**
 * Update components
 *
@@ -57,7 +57,7 @@ function createComponent(d) {
 			sliderWidth = d.w;
 		}
 	} else if(d.type == "image") {
-		comp = createImage(d.name, d.data, d.filename, d.x, d.y, d.w, d.h);
+		comp = createImage(d.name, d.data, d.filename, d.x, d.y, d.w, d.h, d.url);
 		if(d.name == volumeKnobId || d.name == timerKnobId) {
 			comp.setAttribute("style", "cursor: move;");
 		} else if(d.name == "pause.image" && d.filename.endsWith("play.png")) {			
@@ -82,6 +82,9 @@ function createComponent(d) {
 	} else if(d.type == "stream_player") {
 		comp = createStreamPlayer(d.name, d.port, d.volume, d.mute, d.pause);
 	}
+	if(comp != null && d.key) {
+		comp.setAttribute("data-key", d.key);
+	}
 	return comp;
 }
 
@@ -226,7 +229,7 @@ function createPanel(id, width, height, fgr, bgr, bgrType) {
 
 	if((bgrType == "image" || bgrType == "album.art") && bgr) {
 		console.log(bgrType);
-		var img = createImage(bgr.filename, bgr.data, bgr.filename, bgr.x, bgr.y, bgr.w, bgr.h);
+		var img = createImage(bgr.filename, bgr.data, bgr.filename, bgr.x, bgr.y, bgr.w, bgr.h, bgr.url);
 		panel.appendChild(img);
 	} else {	
 		var rect = createRectangle(id + ".rect", 0, 0, width, height, fgr, bgr, 0);
@@ -291,13 +294,16 @@ function createRectangle(id, x, y, w, h, lineColor, fillColor, border) {
 * @param y - image Y coordinate
 * @param w - image width
 * @param h - image height
+* @param url - image URL on the server, if defined the image data is not used
 * 
 * @return new SVG image
 */
-function createImage(id, data, filename, x, y, w, h) {
+function createImage(id, data, filename, x, y, w, h, url) {
 	console.log("image id:" + id + " filename:" + filename + " x:" + x + " y:" + y + " w:" + w + " h:" + h);
 	var img = document.createElementNS(SVG_URL, 'image');
-	if (filename.startsWith("http")) {
+	if (url) {
+		img.setAttributeNS(XLINK_URL, 'href', url);
+	} else if (filename.startsWith("http")) {
 		img.setAttributeNS(XLINK_URL, 'href', decodeURIComponent(filename));
 	} else {
 		if(filename.endsWith(".svg")) {
@@ -0,0 +1,281 @@
+# Copyright 2026 Peppy Player peppy.player@gmail.com
+#
+# This file is part of Peppy Player.
+#
+# Peppy Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Peppy Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import logging
+
+from collections import deque
+from threading import RLock
+from tornado.websocket import WebSocketClosedError
+
+DEFAULT_QUEUE_SIZE = 16
+COMMAND = "command"
+
+# only the newest message with such command is useful for the client
+COALESCED_COMMANDS = [
+    "update_screen",
+    "patch",
+    "update_station_title",
+    "update_station_menu",
+    "update_menu",
+    "vumeter"
+]
+
+class BroadcastHub(object):
+    """ Sends messages to the web clients. The message is serialized only once for all clients.
+    Each client has the bounded queue and only one message is written to the socket at a time,
+    the next one is sent when the previous was flushed. When the client is slow the older
+    messages which were replaced by the newer ones are removed from the queue. If the queue is
+    still full the oldest coalesced message is dropped. The control messages (e.g. screensaver
+    commands) are never dropped. If the queue is full of them it's cleared and the reset listener
+    is called, it should send the whole screen to the client.
+    """
+
+    lock = RLock()
+
+    def __init__(self, queue_size=DEFAULT_QUEUE_SIZE):
+        """ Initializer
+
+        :param queue_size: the maximum number of messages in the client queue
+        """
+        self.queue_size = queue_size
+        self.clients = {}
+        self.ioloop = None
+        self.reset_listener = None
+        self.messages = 0
+
+    def set_ioloop(self, ioloop):
+        """ Set the loop which sends messages
+
+        :param ioloop: Tornado IOLoop
+        """
+        self.ioloop = ioloop
+
+    def set_reset_listener(self, listener):
+        """ Set the function which sends the whole screen to the client after its queue was cleared
+
+        :param listener: function with client argument
+        """
+        self.reset_listener = listener
+
+    def add_client(self, client):
+        """ Add web client
+
+        :param client: WebSocket handler
+        """
+        with self.lock:
+            self.clients[client] = ClientQueue()
+
+    def remove_client(self, client):
+        """ Remove web client
+
+        :param client: WebSocket handler
+        """
+        with self.lock:
+            self.clients.pop(client, None)
+
+    def broadcast(self, j):
+        """ Send Json object to all web clients
+
+        :param j: Json object
+        """
+        with self.lock:
+            if not self.clients:
+                return
+            clients = list(self.clients.keys())
+
+        data = self.encode(j)
+        if data == None:
+            return
+
+        for c in clients:
+            self.enqueue(c, j.get(COMMAND), data)
+
+    def send(self, client, j):
+        """ Send Json object to one web client
+
+        :param client: WebSocket handler
+        :param j: Json object
+        """
+        data = self.encode(j)
+        if data != None:
+            self.enqueue(client, j.get(COMMAND), data)
+
+    def encode(self, j):
+        """ Serialize Json object
+
+        :param j: Json object
+
+        :return: UTF-8 encoded message or None
+        """
+        try:
+            data = json.dumps(j).encode(encoding="utf-8")
+        except Exception as e:
+            logging.debug(e)
+            return None
+
+        with self.lock:
+            self.messages += 1
+        return data
+
+    def enqueue(self, client, command, data):
+        """ Put message into the client queue and start sending if the client is idle
+
+        :param client: WebSocket handler
+        :param command: message command
+        :param data: encoded message
+        """
+        with self.lock:
+            q = self.clients.get(client)
+            if q == None:
+                return
+
+            if command in COALESCED_COMMANDS:
+                n = len(q.messages)
+                q.messages = deque(m for m in q.messages if m[0] != command)
+                q.coalesced += n - len(q.messages)
+
+            reset = False
+            if len(q.messages) >= self.queue_size:
+                reset = not self.drop_coalesced(q)
+
+            q.messages.append((command, data))
+            q.max_depth = max(q.max_depth, len(q.messages))
+
+            schedule = not (q.sending or q.scheduled or self.ioloop == None)
+            if schedule:
+                q.scheduled = True
+
+        if schedule:
+            self.ioloop.add_callback(self.flush, client)
+
+        if reset and self.reset_listener != None:
+            try:
+                self.reset_listener(client)
+            except Exception as e:
+                logging.debug(e)
+
+    def drop_coalesced(self, q):
+        """ Remove the oldest coalesced message from the queue. If there is no such message
+        all messages are removed, the client should get the whole screen after that.
+
+        :param q: client queue
+
+        :return: True - coalesced message was dropped, False - the queue was cleared
+        """
+        for i, m in enumerate(q.messages):
+            if m[0] in COALESCED_COMMANDS:
+                del q.messages[i]
+                q.dropped += 1
+                return True
+
+        q.dropped += len(q.messages)
+        q.messages.clear()
+        q.resets += 1
+        return False
+
+    def flush(self, client):
+        """ Write the next message to the client socket. Called in the IOLoop thread.
+
+        :param client: WebSocket handler
+        """
+        with self.lock:
+            q = self.clients.get(client)
+            if q == None:
+                return
+            q.scheduled = False
+            if q.sending or not q.messages:
+                return
+            _, data = q.messages.popleft()
+            q.sending = True
+
+        try:
+            future = client.write_message(data)
+        except WebSocketClosedError:
+            self.remove_client(client)
+            return
+        except Exception as e:
+            logging.debug(e)
+            with self.lock:
+                q.sending = False
+            return
+
+        future.add_done_callback(lambda f: self.on_sent(client, f))
+
+    def on_sent(self, client, future):
+        """ Handle the end of writing
+
+        :param client: WebSocket handler
+        :param future: write future
+        """
+        with self.lock:
+            q = self.clients.get(client)
+            if q == None:
+                return
+            q.sending = False
+            if future.exception() != None:
+                logging.debug(future.exception())
+                self.clients.pop(client, None)
+                return
+            q.sent += 1
+
+        self.flush(client)
+
+    def get_statistics(self):
+        """ Get queue statistics
+
+        :return: dictionary with the number of serialized messages and the list of client statistics
+        """
+        with self.lock:
+            clients = []
+            for c, q in self.clients.items():
+                s = {"client": self.get_client_name(c)}
+                s["queue.depth"] = len(q.messages)
+                s["max.queue.depth"] = q.max_depth
+                s["sent"] = q.sent
+                s["coalesced"] = q.coalesced
+                s["dropped"] = q.dropped
+                s["resets"] = q.resets
+                clients.append(s)
+            return {"messages": self.messages, "clients": clients}
+
+    def get_client_name(self, client):
+        """ Get client address
+
+        :param client: WebSocket handler
+
+        :return: remote IP address or None
+        """
+        try:
+            return client.request.remote_ip
+        except Exception:
+            return None
+
+class ClientQueue(object):
+    """ Messages waiting for sending to one web client and the client statistics """
+
+    def __init__(self):
+        """ Initializer """
+
+        self.messages = deque()
+        self.sending = False
+        self.scheduled = False
+        self.sent = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.resets = 0
+        self.max_depth = 0
@@ -0,0 +1,206 @@
+# Copyright 2026 Peppy Player peppy.player@gmail.com
+#
+# This file is part of Peppy Player.
+#
+# Peppy Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Peppy Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
+
+from collections import OrderedDict
+from threading import RLock
+
+MAX_PENDING_PATCHES = 8
+PANEL = "panel"
+KEY_SEPARATOR = "#"
+
+class ComponentTree(object):
+    """ Versioned component tree of the web UI. Each screen update gets a new version.
+    For each web client the tree keeps the components which the client acknowledged and
+    the patches sent after that. A new patch is the difference between the current screen
+    and the acknowledged one. The components changed by the patches which are not acknowledged
+    yet are always sent again, so the patch is correct whatever patches the client applied before.
+    """
+
+    lock = RLock()
+
+    def __init__(self, max_pending=MAX_PENDING_PATCHES):
+        """ Initializer
+
+        :param max_pending: the maximum number of not acknowledged patches per client
+        """
+        self.max_pending = max_pending
+        self.version = 0
+        self.clients = {}
+
+    def add_client(self, client):
+        """ Add web client
+
+        :param client: web client
+        """
+        with self.lock:
+            self.clients[client] = ClientState()
+
+    def remove_client(self, client):
+        """ Remove web client
+
+        :param client: web client
+        """
+        with self.lock:
+            self.clients.pop(client, None)
+
+    def reset(self, client):
+        """ Forget everything the client has. The next patch will contain the whole screen.
+
+        :param client: web client
+        """
+        with self.lock:
+            state = self.clients.get(client)
+            if state != None:
+                state.reset()
+
+    def touch(self, names):
+        """ Mark components updated outside of the tree. They will be sent in the next patch.
+
+        :param names: component names
+        """
+        with self.lock:
+            for state in self.clients.values():
+                state.dirty.update(names)
+
+    def acknowledge(self, client, version):
+        """ Handle patch acknowledgement
+
+        :param client: web client
+        :param version: the version of the applied patch
+        """
+        with self.lock:
+            state = self.clients.get(client)
+            if state == None or version not in state.pending:
+                return
+            state.keys, state.components, _ = state.pending[version]
+            for v in list(state.pending.keys()):
+                if v <= version:
+                    del state.pending[v]
+
+    def get_patch(self, client, components):
+        """ Get patch which converts the client screen to the new one
+
+        :param client: web client
+        :param components: list of the new screen components
+
+        :return: patch Json object or None if nothing was changed
+        """
+        with self.lock:
+            state = self.clients.get(client)
+            if state == None:
+                return None
+
+            if len(state.pending) >= self.max_pending:
+                state.reset()
+
+            keys, snapshot = self.get_snapshot(components)
+            changed = set(state.dirty)
+            for p in state.pending.values():
+                changed.update(p[2])
+
+            acked = state.components
+            reset = not acked or self.is_changed(PANEL, snapshot, acked, changed)
+            add = []
+            update = []
+            remove = []
+
+            if reset:
+                add = [snapshot[k] for k in keys]
+            else:
+                for k in keys:
+                    c = snapshot[k]
+                    if k not in acked:
+                        add.append(c)
+                    elif self.is_changed(k, snapshot, acked, changed):
+                        update.append(c)
+                removed = [k for k in state.keys if k not in snapshot]
+                removed.extend(k for k in changed if k not in snapshot and k not in acked)
+                remove = sorted(set(removed), key=removed.index)
+
+            if not (reset or add or update or remove or keys != state.keys):
+                state.dirty.clear()
+                return None
+
+            self.version += 1
+            touched = set(c["key"] for c in add + update)
+            touched.update(remove)
+            state.pending[self.version] = (keys, snapshot, touched)
+            state.dirty.clear()
+
+            patch = {"command" : "patch", "version" : self.version, "reset" : reset}
+            patch["add"] = add
+            patch["update"] = update
+            patch["remove"] = remove
+            if reset or add or remove or changed or keys != state.keys:
+                patch["order"] = keys
+            return patch
+
+    def get_snapshot(self, components):
+        """ Convert the list of components into the dictionary. The key is the component name,
+        repeated names get the sequence number.
+
+        :param components: list of components
+
+        :return: tuple (list of keys, dictionary of components)
+        """
+        keys = []
+        snapshot = {}
+        for c in components:
+            if not c:
+                continue
+            name = c.get("name") or c.get("type")
+            key = name
+            n = 1
+            while key in snapshot:
+                n += 1
+                key = name + KEY_SEPARATOR + str(n)
+            c = dict(c)
+            c["key"] = key
+            keys.append(key)
+            snapshot[key] = c
+        return (keys, snapshot)
+
+    def is_changed(self, key, snapshot, acked, changed):
+        """ Check if the component was changed
+
+        :param key: component key
+        :param snapshot: new components
+        :param acked: acknowledged components
+        :param changed: keys and names of the components changed after acknowledgement
+
+        :return: True - changed, False - not changed
+        """
+        c = snapshot.get(key)
+        if c == None:
+            return False
+        return key in changed or c.get("name") in changed or acked.get(key) != c
+
+class ClientState(object):
+    """ Components acknowledged by the web client and the patches sent after that """
+
+    def __init__(self):
+        """ Initializer """
+
+        self.reset()
+
+    def reset(self):
+        """ Forget all components """
+
+        self.keys = []
+        self.components = {}
+        self.pending = OrderedDict()
+        self.dirty = set()
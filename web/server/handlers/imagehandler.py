@@ -0,0 +1,54 @@
+# Copyright 2026 Peppy Player peppy.player@gmail.com
+# 
+# This file is part of Peppy Player.
+# 
+# Peppy Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# 
+# Peppy Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
+from tornado.web import RequestHandler
+from web.server.imagestore import IMAGE_FORMATS, MAX_IMAGE_WIDTH, get_variant_name
+
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+class ImageHandler(RequestHandler):
+    def initialize(self, image_store):
+        self.image_store = image_store
+
+    def get(self, key):
+        self.send_image(key, CACHE_CONTROL)
+
+    def send_image(self, key, cache_control):
+        try:
+            width = self.get_argument("width", None)
+            width = int(width) if width else None
+            image_format = self.get_argument("format", None)
+            if (width != None and not 0 < width <= MAX_IMAGE_WIDTH) or (image_format and image_format not in IMAGE_FORMATS):
+                raise ValueError()
+        except ValueError:
+            self.set_status(400)
+            return self.finish()
+
+        etag = '"' + get_variant_name(key, width, image_format) + '"'
+        self.set_header("Etag", etag)
+        self.set_header("Cache-Control", cache_control)
+        if self.check_etag_header():
+            self.set_status(304)
+            return self.finish()
+
+        image = self.image_store.get_image(key, width, image_format)
+        if image == None:
+            self.clear_header("Etag")
+            self.set_status(404)
+            return self.finish()
+
+        self.set_header("Content-Type", image[1])
+        self.write(image[0])
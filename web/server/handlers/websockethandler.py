@@ -25,19 +25,27 @@ from threading import Thread
 class WebSocketHandler(tornado.websocket.WebSocketHandler):
     """ Custom WebSocket handler extends Tornado handler """
     
-    def initialize(self, redraw_web_ui, web_clients):
+    def initialize(self, redraw_web_ui, web_clients, component_tree, broadcast_hub, compression=False):
         """ Initializer
         
         :param redraw_web_ui: method to redraw the whole web UI
         :param web_clients: the list of web clients
+        :param component_tree: the component tree of web UI
+        :param broadcast_hub: the hub sending messages to web clients
+        :param compression: True - use permessage-deflate extension, False - don't compress messages
         """
         self.redraw_web_ui = redraw_web_ui
         self.web_clients = web_clients
+        self.component_tree = component_tree
+        self.broadcast_hub = broadcast_hub
+        self.compression = compression
     
     def open(self):
         """ Handle opening WebSocket connection """
         
         if self not in self.web_clients:
+            self.component_tree.add_client(self)
+            self.broadcast_hub.add_client(self)
             self.web_clients.append(self)
             logging.debug("Added web client")
       
@@ -52,8 +60,17 @@ class WebSocketHandler(tornado.websocket.WebSocketHandler):
         
         if self in self.web_clients:
             self.web_clients.remove(self)
+            self.component_tree.remove_client(self)
+            self.broadcast_hub.remove_client(self)
             logging.debug("Removed web client")
  
+    def get_compression_options(self):
+        """ Enable permessage-deflate extension if it's configured """
+        
+        if self.compression:
+            return {}
+        return None
+
     def check_origin(self, origin):
         """ Check request origin """
         
@@ -65,7 +82,10 @@ class WebSocketHandler(tornado.websocket.WebSocketHandler):
         :param d: command object
         """
         if d["command"] == "init":
+            self.component_tree.reset(self)
             self.redraw_web_ui()
+        elif d["command"] == "ack":
+            self.component_tree.acknowledge(self, d["version"])
         elif d["command"] == "mouse":
             a = {}
             a["pos"] = (d["x"], d["y"])
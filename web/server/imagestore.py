@@ -0,0 +1,321 @@
+# Copyright 2026 Peppy Player peppy.player@gmail.com
+#
+# This file is part of Peppy Player.
+#
+# Peppy Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Peppy Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import hashlib
+import logging
+import pygame
+
+from io import BytesIO
+from collections import OrderedDict
+from threading import RLock
+from PIL import Image
+from util.config import CACHE, WEB_IMAGE_CACHE_FOLDER, WEB_IMAGE_CACHE_SIZE
+from util.thumbnailcache import ThumbnailCache
+
+IMAGE_URL = "/image/"
+EXT_SVG = ".svg"
+AUDIO_EXTENSIONS = (".mp3", ".flac", ".mp4", ".m4a")
+CONTENT_TYPES = [
+    (b"\x89PNG", "image/png"),
+    (b"\xff\xd8", "image/jpeg"),
+    (b"GIF8", "image/gif"),
+    (b"RIFF", "image/webp"),
+    (b"<", "image/svg+xml")
+]
+DEFAULT_CONTENT_TYPE = "application/octet-stream"
+IMAGE_FORMATS = {"png": "PNG", "jpeg": "JPEG", "jpg": "JPEG", "webp": "WEBP"}
+MAX_IMAGE_WIDTH = 4096
+QUALITY = 85
+MAX_FILES = 1024
+
+class ImageStore(object):
+    """ Store of the images sent to the web clients. Each image is identified by the hash
+    of its content and served by the separate HTTP endpoint, so the Json objects keep only
+    the image URL. The encoded images are kept in the shared memory cache and in the disk cache,
+    the image files can be read again if their data was removed from the cache. The image can be
+    requested with another width and format, such variant is encoded only once. The images are
+    read and encoded outside of the lock. Only the most recently added files are remembered.
+    """
+
+    lock = RLock()
+
+    def __init__(self, util):
+        """ Initializer
+
+        :param util: utility object
+        """
+        self.image_util = util.image_util
+        self.images = util.memory_cache.get_namespace("web.image")
+        c = util.config[CACHE]
+        self.file_cache = ImageFileCache(c[WEB_IMAGE_CACHE_FOLDER], c[WEB_IMAGE_CACHE_SIZE])
+        self.file_hashes = OrderedDict()
+        self.sources = {}
+
+    def add_surface(self, surface):
+        """ Add Pygame surface to the store. The surface is encoded as PNG only once.
+
+        :param surface: Pygame surface
+
+        :return: image URL or None
+        """
+        if surface == None:
+            return None
+
+        try:
+            h = hashlib.sha1(pygame.image.tostring(surface, "RGBA", False))
+            h.update(str(surface.get_size()).encode())
+            key = h.hexdigest()
+        except Exception as e:
+            logging.debug(e)
+            return None
+
+        if key in self.images:
+            return self.get_url(key)
+
+        data = self.image_util.get_png_from_surface(surface)
+        if data == None:
+            return None
+
+        self.images[key] = data
+        self.file_cache.cache_data(key, data)
+        return self.get_url(key)
+
+    def add_file(self, path):
+        """ Add image file to the store. The file is read only once while it's not modified.
+
+        :param path: image path, SVG image or audio file with embedded image
+
+        :return: image URL or None
+        """
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except Exception:
+            mtime = None
+
+        with self.lock:
+            key = self.file_hashes.get(path)
+            if key != None and key[1] == mtime and key[0] in self.images:
+                self.file_hashes.move_to_end(path)
+                return self.get_url(key[0])
+
+        data = self.read_file(path)
+        if data == None:
+            return None
+        h = hashlib.sha1(data).hexdigest()
+        self.images[h] = data
+
+        with self.lock:
+            self.add_source(path, h, mtime)
+        return self.get_url(h)
+
+    def add_source(self, path, key, mtime):
+        """ Remember the file of the image. The least recently added files are forgotten.
+
+        :param path: image path
+        :param key: image hash
+        :param mtime: file modification time
+        """
+        old = self.file_hashes.pop(path, None)
+        if old != None and self.sources.get(old[0]) == path:
+            del self.sources[old[0]]
+        self.file_hashes[path] = (key, mtime)
+        self.sources[key] = path
+
+        while len(self.file_hashes) > MAX_FILES:
+            p, k = self.file_hashes.popitem(last=False)
+            if self.sources.get(k[0]) == p:
+                del self.sources[k[0]]
+
+    def read_file(self, path):
+        """ Read image data
+
+        :param path: image path
+
+        :return: image bytes or None
+        """
+        try:
+            if EXT_SVG in path:
+                svg_image = self.image_util.get_svg_source(path)
+                return svg_image.encode() if svg_image != None else None
+
+            if path.lower().endswith(AUDIO_EXTENSIONS):
+                buffer = self.image_util.get_image_from_audio_file(path, True)
+                return buffer.read() if buffer else None
+
+            with open(path, "rb") as f:
+                return f.read()
+        except Exception as e:
+            logging.debug(e)
+            return None
+
+    def get_image(self, key, width=None, image_format=None):
+        """ Get image by hash
+
+        :param key: image hash
+        :param width: image width, None - original width
+        :param image_format: image format (png, jpeg, webp), None - original format
+
+        :return: tuple (image bytes, content type) or None if the image is unknown
+        """
+        name = get_variant_name(key, width, image_format)
+        data = self.images.get(name)
+        if data == None:
+            data = self.file_cache.get_data(name)
+            if data == None:
+                if name == key:
+                    data = self.load_original(key)
+                else:
+                    data = self.encode_variant(key, width, image_format)
+                    if data != None:
+                        self.file_cache.cache_data(name, data)
+            if data == None:
+                return None
+            self.images[name] = data
+        return (data, get_content_type(data))
+
+    def load_original(self, key):
+        """ Read the image file again
+
+        :param key: image hash
+
+        :return: image bytes or None if the file is unknown or was changed
+        """
+        with self.lock:
+            path = self.sources.get(key)
+        if path == None:
+            return None
+        data = self.read_file(path)
+        if data == None or hashlib.sha1(data).hexdigest() != key:
+            return None
+        return data
+
+    def encode_variant(self, key, width, image_format):
+        """ Scale and encode the original image. The image is never enlarged.
+        SVG images are returned as is.
+
+        :param key: image hash
+        :param width: image width, None - original width
+        :param image_format: image format, None - original format
+
+        :return: image bytes or None
+        """
+        original = self.get_image(key)
+        if original == None:
+            return None
+        if original[1] == "image/svg+xml":
+            return original[0]
+
+        try:
+            img = Image.open(BytesIO(original[0]))
+            f = IMAGE_FORMATS.get(image_format, img.format or "PNG")
+            if width and width < img.width:
+                height = max(1, round(img.height * width / img.width))
+                img = img.resize((width, height), Image.LANCZOS)
+            if f == "JPEG":
+                img = img.convert("RGB")
+            elif img.mode not in ("RGB", "RGBA"):
+                img = img.convert("RGBA")
+            buffer = BytesIO()
+            img.save(buffer, f, quality=QUALITY)
+            return buffer.getvalue()
+        except Exception as e:
+            logging.debug(e)
+            return None
+
+    def get_key(self, url):
+        """ Get image hash from URL
+
+        :param url: image URL
+
+        :return: image hash
+        """
+        return url[len(IMAGE_URL):]
+
+    def get_url(self, key):
+        """ Get image URL
+
+        :param key: image hash
+
+        :return: URL
+        """
+        return IMAGE_URL + key
+
+class ImageFileCache(ThumbnailCache):
+    """ Disk cache of the encoded images. The files have the same layout and eviction as thumbnails. """
+
+    extension = ".img"
+
+    def get_data(self, name):
+        """ Get encoded image
+
+        :param name: image name
+
+        :return: image bytes or None if not in cache
+        """
+        path = self.get_thumbnail_path(name)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except Exception:
+            return None
+        self.touch(path)
+        return data
+
+    def cache_data(self, name, data):
+        """ Save encoded image
+
+        :param name: image name
+        :param data: image bytes
+        """
+        path = self.get_thumbnail_path(name)
+        tmp_path = path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logging.debug(e)
+            self.delete(tmp_path)
+            return
+        self.add_entry(path, len(data))
+
+def get_variant_name(key, width, image_format):
+    """ Get the name of image variant
+
+    :param key: image hash
+    :param width: image width
+    :param image_format: image format
+
+    :return: variant name, the hash for the original image
+    """
+    if not width and not image_format:
+        return key
+    return f"""{key}.{width or 0}.{IMAGE_FORMATS.get(image_format, "").lower()}"""
+
+def get_content_type(data):
+    """ Detect image type by the first bytes
+
+    :param data: image bytes
+
+    :return: content type
+    """
+    for signature, content_type in CONTENT_TYPES:
+        if data.startswith(signature):
+            return content_type
+    return DEFAULT_CONTENT_TYPE
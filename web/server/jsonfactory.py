@@ -29,16 +29,18 @@ from util.config import USAGE, USE_ALBUM_ART, USE_BROWSER_STREAM_PLAYER, SCREEN_
 class JsonFactory(object):
     """ Converts screen components into Json objects """
     
-    def __init__(self, util, peppy):
+    def __init__(self, util, peppy, image_store=None):
         """ Initializer
         
         :param util: utility object contains config
         :param peppy: root object
+        :param image_store: store of images referenced by URL, None - embed base64 encoded images
         """
         self.util = util
         self.config = util.config
         self.image_util = util.image_util
         self.peppy = peppy
+        self.image_store = image_store
     
     def screen_to_json(self, screen_name, screen, command=True):
         """ Convert screen object into Json object
@@ -285,11 +287,19 @@ class JsonFactory(object):
         c["h"] = img.get_height()
 
         if c["filename"].startswith(GENERATED_IMAGE):
-            c["data"] = self.image_util.get_base64_surface(img)
+            url = self.image_store.add_surface(img) if self.image_store else None
+            if url:
+                c["url"] = url
+            else:
+                c["data"] = self.image_util.get_base64_surface(img)
             return c
         
         if not c["filename"].startswith("http"):
-            c["data"] = self.image_util.load_image(c["filename"], True)
+            url = self.image_store.add_file(c["filename"]) if self.image_store else None
+            if url:
+                c["url"] = url
+            else:
+                c["data"] = self.image_util.load_image(c["filename"], True)
         
         if "_" in c["filename"] and not c["filename"].startswith("http"):
             c["filename"] = c["filename"][0 : c["filename"].find("_")]
@@ -15,13 +15,14 @@
 # You should have received a copy of the GNU General Public License
 # along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
 
-from tornado.web import RequestHandler
-from web.server.jsonfactory import JsonFactory
+from web.server.handlers.imagehandler import ImageHandler as ImageStoreHandler
 
-class ImageHandler(RequestHandler):
+NO_CACHE = "no-cache"
+
+class ImageHandler(ImageStoreHandler):
     def initialize(self, peppy):
         self.peppy = peppy
-        self.json_factory = JsonFactory(peppy.util, peppy)
+        self.image_store = peppy.web_server.image_store
 
     def get(self):
         try:
@@ -40,9 +41,13 @@ class ImageHandler(RequestHandler):
             else:
                 surface = content
             
-            img = self.peppy.util.image_util.get_png_from_surface(surface)
-            self.set_header("Content-Type", "image/png")
-            self.write(img)
+            url = self.image_store.add_surface(surface)
         except:
             self.set_status(500)
             return self.finish()
+
+        if url == None:
+            self.set_status(500)
+            return self.finish()
+
+        self.send_image(self.image_store.get_key(url), NO_CACHE)
@@ -26,6 +26,7 @@ ONLINE = "online"
 STATUS = "status"
 TYPE = "type"
 IMAGE_NAME = "image_name"
+PROGRESS = "progress"
 
 class PodcastHandler(RequestHandler):
     def initialize(self, peppy):
@@ -50,6 +51,8 @@ class PodcastHandler(RequestHandler):
                 url = resource.split("=")
                 episodes = self.podcast_util.get_episodes(url[1])
                 payload = self.convert_episodes_to_dictionaries(episodes)
+            elif resource == "downloads":
+                payload = self.podcast_util.download_manager.get_progress_list()
             self.write(json.dumps(payload))
         except:
             self.set_status(500)
@@ -86,4 +89,5 @@ class PodcastHandler(RequestHandler):
         new_dict[ONLINE] = getattr(episode, ONLINE, None)
         new_dict[STATUS] = getattr(episode, STATUS, None)
         new_dict[TYPE] = getattr(episode, TYPE, None)
+        new_dict[PROGRESS] = self.podcast_util.get_download_progress(new_dict[URL])
         return new_dict
@@ -20,13 +20,16 @@ import tornado.httpserver
 import tornado.ioloop
 import tornado.web
 import os
-import json
 import asyncio
 
 from threading import Thread, RLock
-from util.config import WEB_SERVER, HTTP_PORT, HTTPS, SCREENSAVER, NAME
+from util.config import WEB_SERVER, HTTP_PORT, HTTPS, SCREENSAVER, NAME, WEBSOCKET_COMPRESSION, \
+    WEBSOCKET_QUEUE_SIZE
 from util.keys import KEY_ABOUT
 from web.server.jsonfactory import JsonFactory
+from web.server.componenttree import ComponentTree
+from web.server.broadcasthub import BroadcastHub
+from web.server.imagestore import ImageStore
 from screensaver.screensaverdispatcher import WEB_SAVERS
 from tornado.web import StaticFileHandler, Application
 from tornado.httpserver import HTTPServer
@@ -50,6 +53,7 @@ from web.server.handlers.sharefolder import ShareFolder
 from web.server.handlers.loghandler import LogHandler
 from web.server.handlers.playlisthandler import PlaylistHandler as PlaylistDownLoader
 from web.server.handlers.yastreamshandler import YaStreamsHandler
+from web.server.handlers.imagehandler import ImageHandler as ImageStoreHandler
 # REST API
 from web.server.restapihandlers.about import AboutHandler
 from web.server.restapihandlers.newrelease import NewReleaseHandler
@@ -82,6 +86,8 @@ from web.server.restapihandlers.genres import GenresHandler
 from web.server.restapihandlers.genre import GenreHandler
 from web.server.restapihandlers.radioplayer import RadioPlayerHandler
 from web.server.restapihandlers.podcast import PodcastHandler
+from web.server.restapihandlers.webclients import WebClientsHandler
+from web.server.restapihandlers.mainloop import MainLoopHandler
 
 class WebServer(object):
     """ Starts Tornado web server in a separate thread """
@@ -99,7 +105,11 @@ class WebServer(object):
         self.peppy = peppy
         self.web_clients = []
         self.player_listeners = []
-        self.json_factory = JsonFactory(util, peppy)
+        self.image_store = ImageStore(util)
+        self.component_tree = ComponentTree()
+        self.broadcast_hub = BroadcastHub(self.config[WEB_SERVER][WEBSOCKET_QUEUE_SIZE])
+        self.broadcast_hub.set_reset_listener(self.reset_web_client)
+        self.json_factory = JsonFactory(util, peppy, self.image_store)
         self.instance = None
         thread = Thread(target=self.start_web_server)
         thread.daemon = True        
@@ -116,7 +126,14 @@ class WebServer(object):
             (r"/icon/(.*)", StaticFileHandler, {"path": root + "/icons"}),
             (r"/flag/(.*)", StaticFileHandler, {"path": root + "/languages"}),
             (r"/backgrounds/(.*)", StaticFileHandler, {"path": root + "/backgrounds"}),
-            (r"/ws", WebSocketHandler, {"redraw_web_ui": self.redraw_web_ui, "web_clients": self.web_clients}),
+            (r"/ws", WebSocketHandler, {
+                "redraw_web_ui": self.redraw_web_ui,
+                "web_clients": self.web_clients,
+                "component_tree": self.component_tree,
+                "broadcast_hub": self.broadcast_hub,
+                "compression": self.config[WEB_SERVER][WEBSOCKET_COMPRESSION]
+            }),
+            (r"/image/([0-9a-f]+)", ImageStoreHandler, {"image_store": self.image_store}),
             (r"/config/()", StaticFileHandler, {"path": root + "/web/client/config", "default_filename": "index.html"}),
             (r"/config/icon/(.*)", StaticFileHandler, {"path": root + "/languages"}),
             (r"/config/default/(.*)", StaticFileHandler, {"path": root + "/icons"}),
@@ -179,7 +196,9 @@ class WebServer(object):
             ("/api/genres", GenresHandler, {"peppy": self.peppy}),
             ("/api/genre", GenreHandler, {"peppy": self.peppy}),
             ("/api/radioplayer", RadioPlayerHandler, {"peppy": self.peppy}),
-            ("/api/podcasts/(.*)", PodcastHandler, {"peppy": self.peppy})
+            ("/api/podcasts/(.*)", PodcastHandler, {"peppy": self.peppy}),
+            ("/api/webclients", WebClientsHandler, {"peppy": self.peppy}),
+            ("/api/mainloop", MainLoopHandler, {"peppy": self.peppy})
         ])
 
         if self.config[WEB_SERVER][HTTPS]:
@@ -191,6 +210,7 @@ class WebServer(object):
         asyncio.set_event_loop(asyncio.new_event_loop())
         http_server.listen(port)
         self.instance = tornado.ioloop.IOLoop.instance()
+        self.broadcast_hub.set_ioloop(self.instance)
         logging.debug("Web Server Started")
         self.instance.start()
     
@@ -206,6 +226,7 @@ class WebServer(object):
         
         j = self.json_factory.container_to_json(state.event_origin)
         self.send_json_to_web_ui(j)
+        self.touch_components(j)
     
     def update_player_listeners(self, state=None):
         """ Update player listeners """
@@ -214,7 +235,9 @@ class WebServer(object):
             return
         
         for c in self.player_listeners:
-            self.send_json_to_web_ui(self.json_factory.container_to_json(c))
+            j = self.json_factory.container_to_json(c)
+            self.send_json_to_web_ui(j)
+            self.touch_components(j)
     
     def redraw_web_ui(self, state=None):
         """ Redraw the whole screen in web UI """
@@ -222,8 +245,25 @@ class WebServer(object):
         if len(self.web_clients) == 0:
             return
         
-        self.send_json_to_web_ui(self.screen_to_json())
+        self.send_screen_to_web_ui(self.screen_to_json())
             
+    def reset_web_client(self, client):
+        """ Send the whole screen to the web client which lost queued messages
+
+        :param client: web client
+        """
+        self.component_tree.reset(client)
+        j = self.screen_to_json()
+        if not j:
+            return
+
+        try:
+            patch = self.component_tree.get_patch(client, j["components"])
+            if patch != None:
+                self.broadcast_hub.send(client, patch)
+        except Exception as e:
+            logging.debug(e)
+
     def start_screensaver_to_json(self, state=None):
         """ Send command to web UI to start screensaver """
 
@@ -236,7 +276,7 @@ class WebServer(object):
             name = self.config[SCREENSAVER][NAME]
             screen = state.screen
             command = self.json_factory.screen_to_json(name, screen)
-            self.send_json_to_web_ui(command)
+            self.send_screen_to_web_ui(command)
     
     def start_time_control_to_json(self, state=None):
         """ Send start time control command to all web clients """
@@ -295,7 +335,7 @@ class WebServer(object):
         if len(self.web_clients) == 0:
             return
 
-        self.send_json_to_web_ui(self.screen_to_json())
+        self.send_screen_to_web_ui(self.screen_to_json())
     
     def title_to_json(self, title):
         """ Convert screen title to Json object
@@ -307,6 +347,7 @@ class WebServer(object):
 
         j = self.json_factory.title_to_json(title)
         self.send_json_to_web_ui(j)
+        self.component_tree.touch(["screen_title"])
     
     def send_json_to_web_ui(self, j):
         """ Send provided Json object to all web clients
@@ -316,12 +357,32 @@ class WebServer(object):
         if len(self.web_clients) == 0:
             return
 
+        self.broadcast_hub.broadcast(j)
+
+    def send_screen_to_web_ui(self, j):
+        """ Send the difference between the provided screen and the screen of each web client.
+        Nothing is sent to the client which already has the same screen.
+
+        :param j: Json object with screen components
+        """
+        if not j or len(self.web_clients) == 0:
+            return
+
         try:
-            for c in self.web_clients:
-                e = json.dumps(j).encode(encoding="utf-8")
-                self.instance.add_callback(c.write_message, e)
+            for c in list(self.web_clients):
+                patch = self.component_tree.get_patch(c, j["components"])
+                if patch != None:
+                    self.broadcast_hub.send(c, patch)
         except Exception as e:
-            logging.debug(e)    
+            logging.debug(e)
+
+    def touch_components(self, j):
+        """ Mark components sent outside of the component tree
+
+        :param j: Json object with components
+        """
+        names = [c["name"] for c in j.get("components", []) if c and c.get("name")]
+        self.component_tree.touch(names)
 
     def add_player_listener(self, listener):
         """ Add player web listener